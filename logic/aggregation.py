@@ -0,0 +1,173 @@
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from price_utils import AREA_BANDS, PRICE_NOISE_PATTERN, PYEONG_M2, SIMPLE_PRICE_PATTERN, parse_korean_price
+
+DEFAULT_PERCENTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+
+def parse_price_series(prices: pd.Series) -> pd.Series:
+    """
+    가격 표기 Series를 만원 단위 float Series로 변환합니다. (parse_korean_price의 벡터화 버전, 결과가 항상 같음)
+
+    매물 가격 표기는 중복이 많으므로 고유값만 파싱한 뒤 코드로 펼칩니다.
+    '13억2000', '8억 5,000', '5.5억', '5,000'처럼 억 + 숫자 하나인 표기(SIMPLE_PRICE_PATTERN)는 문자열 연산으로
+    한 번에 처리하고, '8억5천'처럼 단위가 섞이거나 형식이 다른 나머지 표기만 parse_korean_price로 개별 파싱합니다.
+    """
+    if pd.api.types.is_numeric_dtype(prices):
+        return prices.astype(float)
+
+    codes, uniques = pd.factorize(prices.astype(object))
+    values = _parse_unique_prices(pd.Series(uniques, dtype=object)).to_numpy()
+    result = np.full(len(prices), np.nan)
+    known = codes >= 0
+    result[known] = values[codes[known]]
+    return pd.Series(result, index=prices.index)
+
+
+def _parse_unique_prices(prices: pd.Series) -> pd.Series:
+    is_text = prices.map(lambda value: isinstance(value, str)).astype(bool)
+    text = prices.where(is_text).astype('string').str.replace(PRICE_NOISE_PATTERN.pattern, '', regex=True)
+    parts = text.str.extract(SIMPLE_PRICE_PATTERN.pattern)
+    simple = is_text & (text != '').fillna(False) & (parts['eok'].notna() | parts['rest'].notna())
+
+    eok = pd.to_numeric(parts['eok'], errors='coerce').fillna(0.0) * 10000
+    rest = pd.to_numeric(parts['rest'], errors='coerce').fillna(0.0)
+    result = pd.Series(np.round((eok + rest).to_numpy(dtype=float)), index=prices.index)
+    result[~simple] = np.nan
+
+    other = ~simple & prices.notna()
+    if other.any():
+        result[other] = pd.to_numeric(prices[other].map(parse_korean_price), errors='coerce').astype(float)
+    return result
+
+
+def parse_area_series(areas: pd.Series) -> pd.Series:
+    """면적 표기 Series를 ㎡ 단위 float Series로 변환 (parse_area의 벡터화 버전)"""
+    codes, uniques = pd.factorize(areas.astype(object).map(str, na_action='ignore'))
+    if not len(uniques):
+        return pd.Series(np.nan, index=areas.index)
+    values = pd.to_numeric(
+        pd.Series(uniques, dtype='string').str.extract(r'(\d+(?:\.\d+)?)', expand=False), errors='coerce'
+    ).to_numpy(dtype=float)
+    return pd.Series(np.where(codes >= 0, values[codes], np.nan), index=areas.index)
+
+
+def area_band_series(areas: pd.Series) -> pd.Series:
+    """전용면적 Series를 면적 구간 라벨 Series로 변환"""
+    bins = [0.0] + [upper for upper, _ in AREA_BANDS]
+    labels = [label for _, label in AREA_BANDS]
+    return pd.cut(areas, bins=bins, labels=labels, right=False)
+
+
+def articles_frame(data: Dict) -> pd.DataFrame:
+    """crawl_area 결과의 매물 정보를 분석용 DataFrame으로 변환"""
+    records = [
+        {
+            'complex_no': str(complex_no),
+            'article_no': article.get('articleNo'),
+            'trade_type': article.get('tradeTypeCode'),
+            'price_text': article.get('dealOrWarrantPrc'),
+            'rent_text': article.get('rentPrc'),
+            'area1': article.get('area1'),
+            'area2': article.get('area2'),
+        }
+        for complex_no, articles in data.get('articles', {}).items()
+        for article in articles
+    ]
+    columns = ['complex_no', 'article_no', 'trade_type', 'price_text', 'rent_text', 'area1', 'area2']
+    df = pd.DataFrame.from_records(records, columns=columns)
+
+    df['price'] = parse_price_series(df['price_text'])
+    df['rent_price'] = parse_price_series(df['rent_text'])
+    df['exclusive_area'] = parse_area_series(df['area2'])
+    df['supply_area'] = parse_area_series(df['area1'])
+    df['area_band'] = area_band_series(df['exclusive_area'])
+    df['price_per_pyeong'] = df['price'] * PYEONG_M2 / df['exclusive_area']
+    return df.drop(columns=['price_text', 'rent_text', 'area1', 'area2'])
+
+
+def _records(df: pd.DataFrame) -> List[Dict]:
+    """NaN을 None으로 바꾼 JSON 직렬화 가능한 레코드 목록"""
+    df = df.astype(object).where(df.notna(), None)
+    return df.to_dict(orient='records')
+
+
+def group_price_stats(df: pd.DataFrame,
+                      keys: Sequence[str],
+                      percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> pd.DataFrame:
+    """
+    그룹별 가격/평당가 통계를 계산합니다.
+
+    Returns:
+        keys별 count, price_mean/min/max, price_p{N}, per_pyeong_mean/median 컬럼을 가진 DataFrame
+    """
+    priced = df[df['price'].notna()]
+    grouped = priced.groupby(list(keys), observed=True, sort=True)
+
+    stats = grouped.agg(
+        count=('price', 'size'),
+        price_mean=('price', 'mean'),
+        price_min=('price', 'min'),
+        price_max=('price', 'max'),
+        per_pyeong_mean=('price_per_pyeong', 'mean'),
+        per_pyeong_median=('price_per_pyeong', 'median'),
+    )
+    if len(priced) and percentiles:
+        quantiles = grouped['price'].quantile(list(percentiles)).unstack()
+        quantiles.columns = [f"price_p{round(q * 100)}" for q in quantiles.columns]
+        stats = stats.join(quantiles)
+    return stats.round(1).reset_index()
+
+
+def compute_stats(data: Dict, percentiles: Sequence[float] = DEFAULT_PERCENTILES) -> Dict:
+    """
+    crawl_area 결과의 요약 통계를 계산합니다.
+
+    Returns:
+        {
+            'totals': 단지/매물 수,
+            'trade_type_counts': 거래 타입별 매물 수,
+            'by_complex': 단지 x 거래 타입별 가격/평당가 통계,
+            'by_area_band': 면적 구간 x 거래 타입별 통계,
+            'by_complex_area_band': 단지 x 면적 구간 x 거래 타입별 통계,
+            'complex_markers': 단지 마커의 매매 평당가 분포
+        }
+    """
+    df = articles_frame(data)
+    complexes = pd.DataFrame(data.get('complexes', []))
+
+    by_complex = group_price_stats(df, ['complex_no', 'trade_type'], percentiles)
+    if not complexes.empty and 'markerId' in complexes and 'complexName' in complexes:
+        names = complexes[['markerId', 'complexName']].astype({'markerId': str}).drop_duplicates('markerId')
+        by_complex = by_complex.merge(names, how='left', left_on='complex_no', right_on='markerId')
+        by_complex = by_complex.drop(columns=['markerId'])
+
+    marker_stats = {}
+    if not complexes.empty and 'medianDealUnitPrice' in complexes:
+        unit_prices = pd.to_numeric(complexes['medianDealUnitPrice'], errors='coerce')
+        unit_prices = unit_prices[unit_prices > 0]
+        if len(unit_prices):
+            marker_stats = {
+                'count': int(len(unit_prices)),
+                'unit_price_mean': round(float(unit_prices.mean()), 1),
+                **{f"unit_price_p{round(q * 100)}": round(float(value), 1)
+                   for q, value in unit_prices.quantile(list(percentiles)).items()}
+            }
+
+    return {
+        'totals': {
+            'complex_count': len(complexes),
+            'article_count': len(df),
+            'priced_article_count': int(df['price'].notna().sum())
+        },
+        'trade_type_counts': {str(k): int(v) for k, v in df['trade_type'].value_counts().items()},
+        'by_complex': _records(by_complex),
+        'by_area_band': _records(group_price_stats(df, ['area_band', 'trade_type'], percentiles)),
+        'by_complex_area_band': _records(
+            group_price_stats(df, ['complex_no', 'area_band', 'trade_type'], percentiles)
+        ),
+        'complex_markers': marker_stats
+    }
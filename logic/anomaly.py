@@ -0,0 +1,106 @@
+"""
+의심 매물 탐지
+
+크롤링 결과 전체의 매물을 한 번에 DataFrame으로 만들어 단지별 그룹 통계(중앙값, MAD, 사분위)로
+이상값을 표시합니다. 표시는 매물의 anomalyFlags 목록으로 들어가므로 내보내기와 API 응답에 그대로
+포함되고, 호가 지수(price_index)는 표시된 매물을 제외합니다.
+
+- bait_price: 같은 단지/거래 타입의 평당가 중앙값보다 크게 낮은 호가 (미끼 매물)
+- area_mismatch: 전용면적이 공급면적보다 크거나 아파트 전용면적으로 볼 수 없는 값 (면적 오기)
+- price_per_area_outlier: 같은 단지/면적 구간/거래 타입 안에서 평당가의 robust z-score 또는 IQR 범위를 벗어남
+"""
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from aggregation import articles_frame
+
+ANOMALY_FLAGS = ('bait_price', 'area_mismatch', 'price_per_area_outlier')
+
+# 가격 비교에 쓰는 거래 타입 (월세는 보증금이 월세에 따라 달라 제외)
+PRICED_TRADE_TYPES = ('A1', 'B1')
+
+# 그룹 통계를 신뢰할 최소 매물 수
+MIN_GROUP_SIZE = 5
+
+# 단지 평당가 중앙값 대비 이 비율 미만이면 미끼 매물
+BAIT_RATIO = 0.6
+
+# robust z-score 기준 (|0.6745 * (x - 중앙값) / MAD|)
+ROBUST_Z_THRESHOLD = 3.5
+
+# MAD가 0인 그룹에 쓰는 IQR 배수 (Q1 - k*IQR, Q3 + k*IQR 밖이면 이상값)
+IQR_MULTIPLIER = 3.0
+
+# 그룹 중앙값과 이 비율 이상 차이 나야 이상값 (작은 그룹에서 MAD가 작아 생기는 오탐 방지)
+MIN_RELATIVE_DEVIATION = 0.2
+
+# 전용면적으로 인정하는 범위 (㎡)
+EXCLUSIVE_AREA_RANGE = (10.0, 330.0)
+
+
+def _group_outliers(values: pd.Series, keys: list) -> pd.Series:
+    """그룹 안에서 robust z-score(MAD가 0이면 IQR 범위)를 벗어나는 값"""
+    grouped = values.groupby(keys, observed=True, sort=False)
+    size = grouped.transform('count')
+    median = grouped.transform('median')
+    deviation = (values - median).abs()
+    mad = deviation.groupby(keys, observed=True, sort=False).transform('median')
+    q1 = grouped.transform('quantile', 0.25)
+    q3 = grouped.transform('quantile', 0.75)
+    iqr = q3 - q1
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        robust_z = 0.6745 * deviation / mad
+    by_mad = (mad > 0) & (robust_z > ROBUST_Z_THRESHOLD)
+    by_iqr = (mad == 0) & (iqr > 0) & (
+        (values < q1 - IQR_MULTIPLIER * iqr) | (values > q3 + IQR_MULTIPLIER * iqr)
+    )
+    return (size >= MIN_GROUP_SIZE) & (deviation > MIN_RELATIVE_DEVIATION * median) & (by_mad | by_iqr)
+
+
+def anomaly_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    articles_frame 결과에 플래그별 bool 컬럼을 붙여 반환합니다.
+    """
+    df = df.copy()
+    area = df['exclusive_area']
+    low, high = EXCLUSIVE_AREA_RANGE
+    df['area_mismatch'] = (area < low) | (area > high) | (area > df['supply_area'])
+
+    # 면적이 잘못된 매물은 평당가 통계에서 제외
+    per_pyeong = df['price_per_pyeong'].replace([np.inf, -np.inf], np.nan)
+    per_pyeong = per_pyeong.where(df['trade_type'].isin(PRICED_TRADE_TYPES) & ~df['area_mismatch'])
+
+    complex_keys = [df['complex_no'], df['trade_type']]
+    complex_groups = per_pyeong.groupby(complex_keys, sort=False)
+    complex_median = complex_groups.transform('median')
+    complex_size = complex_groups.transform('count')
+    df['bait_price'] = (complex_size >= MIN_GROUP_SIZE) & (per_pyeong < BAIT_RATIO * complex_median)
+
+    band_keys = [df['complex_no'], df['area_band'].astype(object).fillna(''), df['trade_type']]
+    df['price_per_area_outlier'] = _group_outliers(per_pyeong, band_keys)
+    return df
+
+
+def annotate_anomalies(data: Dict) -> Dict[str, int]:
+    """
+    crawl_area 결과의 모든 매물에 anomalyFlags(해당하는 플래그 목록, 없으면 빈 목록)를 붙입니다.
+
+    Returns:
+        플래그별 매물 수
+    """
+    counts = dict.fromkeys(ANOMALY_FLAGS, 0)
+    articles = [article for group in data.get('articles', {}).values() for article in group]
+    if not articles:
+        return counts
+
+    # articles_frame은 data['articles']와 같은 순서로 행을 만듦
+    flags = anomaly_frame(articles_frame(data))[list(ANOMALY_FLAGS)].to_numpy(dtype=bool)
+    names = np.array(ANOMALY_FLAGS)
+    for article, row in zip(articles, flags):
+        article['anomalyFlags'] = names[row].tolist() if row.any() else []
+    for name, count in zip(ANOMALY_FLAGS, flags.sum(axis=0)):
+        counts[name] = int(count)
+    return counts
@@ -1,17 +1,79 @@
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel
-from typing import Optional, Dict, List, Any
+from typing import TYPE_CHECKING, Optional, Dict, List, Any, Literal
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import asyncio
+import json
 import logging
-from naver_real_estate_crawler import NaverRealEstateCrawler
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from starlette.background import BackgroundTask
+from naver_real_estate_crawler import NaverRealEstateCrawler, configure_logging
+from projection import parse_fields, project_record, project_result, required_depth
+from listing_search import DEFAULT_DB as DEFAULT_SEARCH_DB, ListingIndex
+from price_index import DEFAULT_DB as DEFAULT_PRICE_INDEX_DB, PriceIndex, WINDOWS
+from snapshot_diff import diff_snapshots
+
+if TYPE_CHECKING:
+    from profiling import CrawlProfiler
+
+try:
+    # brotli-asgi가 설치되어 있으면 br 우선, 미지원 클라이언트는 gzip으로 응답
+    from brotli_asgi import BrotliMiddleware
+except ImportError:
+    BrotliMiddleware = None
 
 # 로깅 설정
-logging.basicConfig(level=logging.INFO)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 app = FastAPI(title="네이버 부동산 크롤링 API")
 
+# 프로파일 결과 저장 위치
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "profiles")
+
+# tracemalloc과 샘플러는 프로세스 전역이므로 한 번에 하나의 요청만 프로파일링
+profile_lock = asyncio.Lock()
+
+# 내보내기용으로 보관하는 크롤링 결과 수와 보관 시간 (초)
+MAX_JOBS = int(os.environ.get("MAX_JOBS", "16"))
+JOB_TTL = int(os.environ.get("JOB_TTL", "3600"))
+crawl_jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+# 파일 직렬화는 이벤트 루프를 막지 않도록 크기가 제한된 스레드 풀에서 실행
+export_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("EXPORT_WORKERS", "2")),
+    thread_name_prefix="export"
+)
+
+# 수집한 단지/매물 검색 저장소 (/api/crawl 결과가 쌓임, 위치는 SEARCH_DB 환경 변수)
+SEARCH_DB = DEFAULT_SEARCH_DB
+listing_index: Optional[ListingIndex] = None
+
+# 지역별 평당 호가 지수 저장소 (/api/crawl 결과가 쌓임, 위치는 PRICE_INDEX_DB 환경 변수)
+PRICE_INDEX_DB = DEFAULT_PRICE_INDEX_DB
+price_index: Optional[PriceIndex] = None
+
+# /api/snapshots/diff가 읽을 수 있는 크롤링 결과(save_to_json 파일, 세그먼트 디렉토리) 위치
+SNAPSHOT_DIR = os.environ.get("SNAPSHOT_DIR", ".")
+
+ExportFormat = Literal["xlsx", "json", "csv", "parquet"]
+
+# 형식별 (저장 메서드, MIME 타입)
+EXPORT_FORMATS = {
+    "xlsx": ("save_to_excel", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "json": ("save_to_json", "application/json"),
+    "csv": ("save_to_csv", "text/csv; charset=utf-8"),
+    "parquet": ("save_to_parquet", "application/vnd.apache.parquet"),
+}
+
 # CORS 설정
 app.add_middleware(
     CORSMiddleware,
@@ -21,17 +83,99 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 응답 압축 (1KB 미만 응답은 압축하지 않음)
+if BrotliMiddleware:
+    app.add_middleware(BrotliMiddleware, minimum_size=1024, gzip_fallback=True)
+else:
+    app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+ViewName = Literal["summary", "map", "full"]
+CrawlDepth = Literal["markers", "details", "articles", "full"]
+TradeType = Literal["A1", "B1", "B2"]
+
+# 수집 단계별 누적 크롤링 횟수와 업스트림 요청 수
+depth_costs: Dict[str, Dict[str, Any]] = {}
+
 class CrawlRequest(BaseModel):
     center_lat: float
     center_lon: float
     radius: Optional[float] = 0.003
     real_estate_type: Optional[str] = "APT:ABYG:JGC:PRE"
     price_type: Optional[str] = "RETAIL"
+    dedupe: Optional[bool] = True  # 여러 중개사가 올린 동일 매물 병합
+    view: Optional[ViewName] = "full"  # 응답 레코드 범위 (summary, map, full)
+    fields: Optional[List[str]] = None  # 지정하면 모든 레코드를 이 키로 축소
+    depth: Optional[CrawlDepth] = None  # 수집 단계. 생략하면 view/fields를 채우는 가장 낮은 단계
+    trade_types: Optional[List[TradeType]] = ["A1"]  # 매물 거래 타입 (A1:매매, B1:전세, B2:월세), 단지별로 동시 수집
+    debug: Optional[bool] = False  # True이면 단계별 트레이스를 응답에 포함
+    profile: Optional[bool] = False  # True이면 CPU/메모리 프로파일을 수집하여 응답에 포함
 
 class CrawlResponse(BaseModel):
     success: bool
+    job_id: Optional[str] = None  # /api/crawl/{job_id}/export로 결과를 파일로 내려받을 때 사용
     data: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
+    trace: Optional[Dict[str, Any]] = None
+    profile: Optional[Dict[str, Any]] = None
+
+def trace_payload(crawler: NaverRealEstateCrawler, debug: bool) -> Optional[Dict[str, Any]]:
+    """debug 요청이면 크롤러의 트레이스(요약 + Chrome Trace Event)를 반환"""
+    if not debug:
+        return None
+    return {
+        "summary": crawler.tracer.summary(),
+        **crawler.tracer.to_chrome_trace()
+    }
+
+def profile_payload(profiler: Optional["CrawlProfiler"]) -> Optional[Dict[str, Any]]:
+    """종료된 프로파일을 파일로 저장한 뒤 요약을 반환"""
+    if not profiler:
+        return None
+    files = profiler.save(os.path.join(PROFILE_DIR, f"crawl_profile_{int(time.time() * 1000)}"))
+    return {**profiler.report(), "files": files}
+
+def record_cost(cost: Dict[str, Any]):
+    """crawl_area 결과의 요청 수를 수집 단계별 누적값에 더합니다."""
+    totals = depth_costs.setdefault(cost["depth"], {"crawls": 0, "requests": {}, "total": 0})
+    totals["crawls"] += 1
+    totals["total"] += cost["total"]
+    for name, count in cost["requests"].items():
+        totals["requests"][name] = totals["requests"].get(name, 0) + count
+
+def get_listing_index() -> ListingIndex:
+    global listing_index
+    if listing_index is None:
+        listing_index = ListingIndex(SEARCH_DB)
+    return listing_index
+
+def get_price_index() -> PriceIndex:
+    global price_index
+    if price_index is None:
+        price_index = PriceIndex(PRICE_INDEX_DB)
+    return price_index
+
+async def index_listings(data: Dict[str, Any]):
+    """크롤링 결과를 검색 저장소와 호가 지수에 반영. 실패해도 크롤링 응답에는 영향 없음"""
+    try:
+        counts = await asyncio.to_thread(get_listing_index().ingest, data)
+        logger.debug(f"검색 저장소 갱신: {counts}")
+    except Exception as e:
+        logger.error(f"검색 저장소 갱신 중 오류: {e}")
+    try:
+        added = await asyncio.to_thread(get_price_index().ingest, data)
+        logger.debug(f"호가 지수 갱신: 매물 {added}개")
+    except Exception as e:
+        logger.error(f"호가 지수 갱신 중 오류: {e}")
+
+def store_job(data: Dict[str, Any]) -> str:
+    """크롤링 결과를 보관하고 job_id를 반환. 오래되었거나 MAX_JOBS를 넘는 결과는 먼저 삭제"""
+    now = time.time()
+    while crawl_jobs and (len(crawl_jobs) >= MAX_JOBS or
+                          now - next(iter(crawl_jobs.values()))["created_at"] > JOB_TTL):
+        crawl_jobs.popitem(last=False)
+    job_id = uuid.uuid4().hex
+    crawl_jobs[job_id] = {"data": data, "created_at": now}
+    return job_id
 
 @app.get("/")
 async def root():
@@ -42,29 +186,198 @@ async def crawl_real_estate(request: CrawlRequest):
     """부동산 정보를 크롤링합니다."""
     crawler = NaverRealEstateCrawler()
     
+    profiler = None
+    if request.profile:
+        from profiling import CrawlProfiler
+        profiler = CrawlProfiler()
+    profiling = False  # 프로파일 락을 잡았는지 (finally에서 한 번만 종료/해제)
+    
     try:
+        if profiler:
+            await profile_lock.acquire()
+            profiling = True
+            profiler.attach(crawler.tracer)
+            profiler.start()
+        
         logger.info(f"크롤링 시작: lat={request.center_lat}, lon={request.center_lon}")
         
         # 브라우저 및 세션 초기화
         await crawler.init_browser(headless=True)
         await crawler.init_session()
         
-        # 지역 크롤링 실행
+        # 지역 크롤링 실행 (응답에 필요한 만큼만 수집)
         data = await crawler.crawl_area(
             center_lat=request.center_lat,
             center_lon=request.center_lon,
-            radius=request.radius
+            radius=request.radius,
+            dedupe=request.dedupe,
+            depth=request.depth or required_depth(request.view, request.fields),
+            trade_types=request.trade_types or ["A1"]
         )
+        record_cost(data["cost"])
         
-        logger.info("크롤링 완료")
-        return CrawlResponse(success=True, data=data)
+        logger.info(f"크롤링 완료: depth={data['cost']['depth']}, 요청 {data['cost']['total']}회")
+        job_id = store_job(data)
+        await index_listings(data)
+        with crawler.tracer.span('project_result', view=request.view):
+            data = project_result(data, request.view, request.fields)
+        response = CrawlResponse(
+            success=True,
+            job_id=job_id,
+            data=data,
+            trace=trace_payload(crawler, request.debug)
+        )
         
     except Exception as e:
         logger.error(f"크롤링 중 오류: {e}")
-        return CrawlResponse(success=False, error=str(e))
+        response = CrawlResponse(
+            success=False,
+            error=str(e),
+            trace=trace_payload(crawler, request.debug)
+        )
         
     finally:
+        if profiling:
+            profiler.stop()
+            profile_lock.release()
         await crawler.close()
+    
+    if profiling:
+        response.profile = profile_payload(profiler)
+    return response
+
+@app.get("/api/search", response_model=CrawlResponse)
+async def search_listings(
+    kind: Literal["articles", "complexes"] = "articles",
+    trade_type: Optional[TradeType] = None,
+    price_min: Optional[int] = None,
+    price_max: Optional[int] = None,
+    area_min: Optional[float] = None,
+    area_max: Optional[float] = None,
+    year_min: Optional[int] = None,
+    year_max: Optional[int] = None,
+    households_min: Optional[int] = None,
+    households_max: Optional[int] = None,
+    bbox: Optional[str] = None,
+    complex_no: Optional[str] = None,
+    sort: str = "price",
+    order: Literal["asc", "desc"] = "asc",
+    limit: int = 50,
+    offset: int = 0
+):
+    """
+    지금까지 크롤링한 단지/매물을 업스트림 요청 없이 조건 검색합니다.
+    가격은 만원, 면적은 전용면적(㎡), bbox는 'left_lon,right_lon,top_lat,bottom_lat'입니다.
+    """
+    try:
+        bounds = tuple(float(value) for value in bbox.split(",")) if bbox else None
+        if bounds is not None and len(bounds) != 4:
+            raise ValueError("bbox는 'left_lon,right_lon,top_lat,bottom_lat' 형식이어야 합니다")
+        result = await asyncio.to_thread(
+            get_listing_index().search, kind,
+            trade_type=trade_type, price_min=price_min, price_max=price_max,
+            area_min=area_min, area_max=area_max, year_min=year_min, year_max=year_max,
+            households_min=households_min, households_max=households_max,
+            bbox=bounds, complex_no=complex_no, sort=sort, order=order, limit=limit, offset=offset
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return CrawlResponse(success=True, data=result)
+
+@app.get("/api/price-index", response_model=CrawlResponse)
+async def get_price_index_rows(
+    district: str,
+    window: int = 30,
+    trade_type: Literal["A1", "B1"] = "A1",
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    area_band: str = "*"
+):
+    """
+    법정동의 평당 호가 지수(만원/평)를 조회합니다.
+    기본은 ingest 때 미리 계산한 최근 window일 지수(면적 구간별 + 전체 '*')이며,
+    since/until('YYYY-MM-DD')을 주면 해당 기간의 날짜별 요약을 병합해 계산합니다.
+    """
+    if since or until:
+        if not (since and until):
+            raise HTTPException(status_code=400, detail="since와 until을 함께 지정해야 합니다")
+        data = await asyncio.to_thread(get_price_index().query, district, since, until, area_band, trade_type)
+        return CrawlResponse(success=True, data=data)
+    if window not in WINDOWS:
+        raise HTTPException(status_code=400, detail=f"window는 {', '.join(map(str, WINDOWS))} 중 하나여야 합니다")
+    rows = await asyncio.to_thread(get_price_index().rolling, district, window, trade_type)
+    return CrawlResponse(success=True, data={"district": district, "window": window,
+                                             "trade_type": trade_type, "bands": rows})
+
+def resolve_snapshot(name: str) -> str:
+    """SNAPSHOT_DIR 안의 결과 경로. 디렉토리 밖을 가리키거나 없으면 404"""
+    root = os.path.realpath(SNAPSHOT_DIR)
+    path = os.path.realpath(os.path.join(root, name))
+    if not path.startswith(root + os.sep) or not os.path.exists(path):
+        raise HTTPException(status_code=404, detail=f"크롤링 결과를 찾을 수 없습니다: {name}")
+    return path
+
+@app.get("/api/snapshots/diff")
+async def diff_crawl_snapshots(
+    old: str,
+    new: str,
+    kind: Optional[Literal["complex", "article"]] = None,
+    change: Optional[Literal["added", "removed", "changed"]] = None
+):
+    """
+    SNAPSHOT_DIR 안의 두 크롤링 결과를 비교해 추가/삭제/가격 변경을 JSON Lines로 스트리밍합니다.
+    단지는 markerId, 매물은 articleNo로 맞춰보며, 큰 결과는 디스크 파티션으로 나눠 비교합니다.
+    """
+    old_path, new_path = resolve_snapshot(old), resolve_snapshot(new)
+
+    def lines():
+        for event in diff_snapshots(old_path, new_path):
+            if (kind and event["kind"] != kind) or (change and event["change"] != change):
+                continue
+            yield json.dumps(event, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+@app.get("/api/costs")
+async def get_costs():
+    """서버 시작 이후 수집 단계별 크롤링 횟수와 업스트림 요청 수"""
+    return {
+        depth: {**totals, "avg_requests": round(totals["total"] / totals["crawls"], 2)}
+        for depth, totals in depth_costs.items()
+    }
+
+@app.get("/api/crawl/{job_id}/export")
+async def export_crawl(job_id: str, format: ExportFormat = "xlsx"):
+    """크롤링 결과를 파일로 내려받습니다. 직렬화는 스레드 풀에서 실행됩니다."""
+    job = crawl_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="크롤링 결과를 찾을 수 없습니다")
+    
+    method_name, media_type = EXPORT_FORMATS[format]
+    temp_dir = tempfile.mkdtemp(prefix="naver_export_")
+    filename = os.path.join(temp_dir, f"naver_real_estate_{job_id}.{format}")
+    
+    # 저장 메서드만 사용하므로 브라우저는 초기화하지 않음
+    exporter = NaverRealEstateCrawler()
+    save = getattr(exporter, method_name)
+    
+    try:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(export_executor, save, job["data"], filename)
+    except ImportError as e:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        raise HTTPException(status_code=501, detail=f"{format} 내보내기에 필요한 패키지가 없습니다: {e}")
+    except Exception as e:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        logger.error(f"내보내기 중 오류: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return FileResponse(
+        filename,
+        media_type=media_type,
+        filename=os.path.basename(filename),
+        background=BackgroundTask(shutil.rmtree, temp_dir, ignore_errors=True)
+    )
 
 @app.post("/api/complexes", response_model=CrawlResponse)
 async def get_complexes(request: CrawlRequest):
@@ -91,22 +404,55 @@ async def get_complexes(request: CrawlRequest):
             price_type=request.price_type
         )
         
-        data = {
-            "complexes": complexes,
-            "count": len(complexes)
-        }
+        data = project_result({"complexes": complexes}, request.view, request.fields)
+        data["count"] = len(complexes)
         
-        return CrawlResponse(success=True, data=data)
+        return CrawlResponse(success=True, data=data, trace=trace_payload(crawler, request.debug))
         
     except Exception as e:
         logger.error(f"단지 정보 수집 중 오류: {e}")
-        return CrawlResponse(success=False, error=str(e))
+        return CrawlResponse(success=False, error=str(e), trace=trace_payload(crawler, request.debug))
+        
+    finally:
+        await crawler.close()
+
+@app.post("/api/stats", response_model=CrawlResponse)
+async def get_stats(request: CrawlRequest):
+    """지역을 크롤링하고 원본 매물 대신 요약 통계만 반환합니다."""
+    from aggregation import compute_stats
+    
+    crawler = NaverRealEstateCrawler()
+    
+    try:
+        await crawler.init_browser(headless=True)
+        await crawler.init_session()
+        
+        data = await crawler.crawl_area(
+            center_lat=request.center_lat,
+            center_lon=request.center_lon,
+            radius=request.radius,
+            dedupe=request.dedupe,
+            depth=request.depth or "articles",  # 통계에는 단지 마커와 매물만 사용
+            trade_types=request.trade_types or ["A1"]
+        )
+        record_cost(data["cost"])
+        
+        with crawler.tracer.span('compute_stats'):
+            stats = await asyncio.to_thread(compute_stats, data)
+        stats['area_info'] = data['area_info']
+        stats['cost'] = data['cost']
+        
+        return CrawlResponse(success=True, data=stats, trace=trace_payload(crawler, request.debug))
+        
+    except Exception as e:
+        logger.error(f"통계 계산 중 오류: {e}")
+        return CrawlResponse(success=False, error=str(e), trace=trace_payload(crawler, request.debug))
         
     finally:
         await crawler.close()
 
 @app.get("/api/complex/{complex_no}", response_model=CrawlResponse)
-async def get_complex_detail(complex_no: str):
+async def get_complex_detail(complex_no: str, debug: bool = False, fields: Optional[str] = None):
     """특정 단지의 상세 정보를 가져옵니다."""
     crawler = NaverRealEstateCrawler()
     
@@ -117,19 +463,25 @@ async def get_complex_detail(complex_no: str):
         detail = await crawler.get_complex_detail(complex_no)
         
         if detail:
-            return CrawlResponse(success=True, data=detail)
+            if parse_fields(fields):
+                detail = project_record(detail, parse_fields(fields))
+            return CrawlResponse(success=True, data=detail, trace=trace_payload(crawler, debug))
         else:
-            return CrawlResponse(success=False, error="단지 정보를 찾을 수 없습니다")
+            return CrawlResponse(success=False, error="단지 정보를 찾을 수 없습니다", trace=trace_payload(crawler, debug))
             
     except Exception as e:
         logger.error(f"단지 상세 정보 수집 중 오류: {e}")
-        return CrawlResponse(success=False, error=str(e))
+        return CrawlResponse(success=False, error=str(e), trace=trace_payload(crawler, debug))
         
     finally:
         await crawler.close()
 
 @app.get("/api/complex/{complex_no}/articles", response_model=CrawlResponse)
-async def get_complex_articles(complex_no: str, trade_type: str = "A1"):
+async def get_complex_articles(complex_no: str,
+                               trade_type: str = "A1",
+                               debug: bool = False,
+                               view: ViewName = "full",
+                               fields: Optional[str] = None):
     """특정 단지의 매물 정보를 가져옵니다."""
     crawler = NaverRealEstateCrawler()
     
@@ -139,18 +491,19 @@ async def get_complex_articles(complex_no: str, trade_type: str = "A1"):
         
         articles = await crawler.get_complex_articles(complex_no, trade_type)
         
+        projected = project_result({"articles": {complex_no: articles}}, view, parse_fields(fields))
         data = {
-            "articles": articles,
+            "articles": projected["articles"][complex_no],
             "count": len(articles),
             "complex_no": complex_no,
             "trade_type": trade_type
         }
         
-        return CrawlResponse(success=True, data=data)
+        return CrawlResponse(success=True, data=data, trace=trace_payload(crawler, debug))
         
     except Exception as e:
         logger.error(f"매물 정보 수집 중 오류: {e}")
-        return CrawlResponse(success=False, error=str(e))
+        return CrawlResponse(success=False, error=str(e), trace=trace_payload(crawler, debug))
         
     finally:
         await crawler.close()
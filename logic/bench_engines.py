@@ -0,0 +1,120 @@
+"""
+직접 HTTP 엔진(crawl_area)과 캡처 엔진(capture_area)의 처리량 비교
+
+같은 영역을 두 엔진으로 번갈아 수집하고 엔진별 소요 시간, 수집 레코드 수(단지 + 상세 + 매물 + 개발계획),
+초당 레코드 수, 요청(캡처는 페이지/응답) 수를 보여줍니다. 브라우저 기동과 세션 준비 시간은 따로 잽니다.
+
+    python bench_engines.py                                  # 기본 좌표, 각 엔진 1회
+    python bench_engines.py --radius 0.005 --repeat 3 --trade-types A1 B1
+    python bench_engines.py --engines capture --history engine_bench.jsonl   # 측정 결과 누적 기록
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Dict, List
+
+from naver_real_estate_crawler import TRADE_TYPES, NaverRealEstateCrawler, configure_logging
+
+ENGINES = ['direct', 'capture']
+
+
+def count_records(data: Dict) -> Dict[str, int]:
+    """결과의 섹션별 레코드 수"""
+    return {
+        'complexes': len(data.get('complexes', [])),
+        'complex_details': len(data.get('complex_details', {})),
+        'articles': sum(len(articles) for articles in data.get('articles', {}).values()),
+        'development_plans': sum(len(plans) for plans in data.get('development_plans', {}).values()),
+    }
+
+
+async def run_engine(engine: str, args) -> Dict:
+    """엔진 하나로 영역을 한 번 수집하고 측정값을 반환"""
+    crawler = NaverRealEstateCrawler()
+    try:
+        started = time.perf_counter()
+        await crawler.init_browser(headless=True)
+        if engine == 'direct':
+            await crawler.init_session()
+        setup_s = time.perf_counter() - started
+
+        started = time.perf_counter()
+        if engine == 'direct':
+            data = await crawler.crawl_area(args.lat, args.lon, args.radius, trade_types=args.trade_types)
+            requests = {'requests': data['cost']['total']}
+        else:
+            data = await crawler.capture_area(args.lat, args.lon, args.radius, trade_types=args.trade_types,
+                                              open_complexes=args.open_complexes, settle=args.settle)
+            requests = {'pages': data['capture']['pages'], 'responses': sum(data['capture']['responses'].values())}
+        crawl_s = time.perf_counter() - started
+    finally:
+        await crawler.close()
+
+    records = count_records(data)
+    total = sum(records.values())
+    return {
+        'engine': engine,
+        'setup_s': round(setup_s, 3),
+        'crawl_s': round(crawl_s, 3),
+        'records': records,
+        'total_records': total,
+        'records_per_s': round(total / crawl_s, 2) if crawl_s > 0 else None,
+        **requests,
+    }
+
+
+def summarize(runs: List[Dict]) -> Dict[str, Dict]:
+    """엔진별 중앙값"""
+    summary = {}
+    for engine in ENGINES:
+        engine_runs = [run for run in runs if run['engine'] == engine]
+        if not engine_runs:
+            continue
+        summary[engine] = {
+            key: statistics.median(run[key] for run in engine_runs)
+            for key in ('setup_s', 'crawl_s', 'total_records', 'records_per_s')
+            if all(run[key] is not None for run in engine_runs)
+        }
+    return summary
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="직접 HTTP 엔진과 캡처 엔진의 처리량 비교")
+    parser.add_argument('--lat', type=float, default=37.3642443)
+    parser.add_argument('--lon', type=float, default=127.1084674)
+    parser.add_argument('--radius', type=float, default=0.003)
+    parser.add_argument('--trade-types', nargs='+', default=['A1'], choices=list(TRADE_TYPES))
+    parser.add_argument('--engines', nargs='+', default=ENGINES, choices=ENGINES)
+    parser.add_argument('--repeat', type=int, default=1, help="엔진별 반복 횟수 (엔진을 번갈아 실행)")
+    parser.add_argument('--open-complexes', type=int, default=5, help="캡처 엔진이 열어볼 단지 수")
+    parser.add_argument('--settle', type=float, default=1.0, help="캡처 엔진의 페이지별 추가 대기 (초)")
+    parser.add_argument('--history', help="측정 결과를 JSON Lines로 누적 기록할 파일")
+    args = parser.parse_args()
+
+    configure_logging()
+    runs = []
+    for _ in range(args.repeat):
+        for engine in args.engines:
+            run = await run_engine(engine, args)
+            runs.append(run)
+            requests = (f"요청 {run['requests']}회" if engine == 'direct'
+                        else f"페이지 {run['pages']}개, 응답 {run['responses']}개")
+            print(f"{engine:<8} 준비 {run['setup_s']:>6.2f}s  수집 {run['crawl_s']:>7.2f}s  "
+                  f"레코드 {run['total_records']:>6}  {run['records_per_s'] or 0:>8.2f}/s  ({requests})")
+
+    summary = summarize(runs)
+    print("\n=== 엔진별 중앙값 ===")
+    for engine, values in summary.items():
+        print(f"{engine:<8} " + "  ".join(f"{key} {value}" for key, value in values.items()))
+
+    if args.history:
+        with open(args.history, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'timestamp': int(time.time()), 'area': [args.lat, args.lon, args.radius],
+                                'trade_types': args.trade_types, 'runs': runs, 'summary': summary},
+                               ensure_ascii=False) + '\n')
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,111 @@
+"""
+모듈 import 시간 측정
+
+새 인터프리터에서 모듈을 가져오는 시간을 여러 번 측정하고(인터프리터 기동 시간 제외),
+-X importtime으로 가장 오래 걸리는 하위 모듈을 보여줍니다.
+
+    python bench_import.py                          # 크롤러, API 서버, 스케줄러
+    python bench_import.py naver_real_estate_crawler --max-ms 150   # 예산 초과 시 종료 코드 1
+    python bench_import.py --history import_times.jsonl              # 측정 결과 누적 기록
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+DEFAULT_MODULES = ['naver_real_estate_crawler', 'api_server', 'scheduler']
+HEAVY_MODULES = ['pandas', 'playwright', 'aiohttp']
+LOGIC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _run(code: str, *flags: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *flags, '-c', code], cwd=LOGIC_DIR,
+                          capture_output=True, text=True, check=True)
+
+
+def wall_time_ms(code: str, repeat: int) -> List[float]:
+    """새 인터프리터에서 code를 실행하는 데 걸린 시간(ms) 목록"""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        _run(code)
+        times.append((time.perf_counter() - started) * 1000)
+    return times
+
+
+def import_breakdown(module: str, top: int) -> List[Dict]:
+    """-X importtime 출력에서 module이 직접 가져온 하위 모듈을 누적 시간 순으로 반환"""
+    stderr = _run(f"import {module}", '-X', 'importtime').stderr
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line.split(':', 1)[1].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), depth, int(cumulative_us) / 1000))
+
+    # 출력은 하위 모듈이 먼저 나오는 후위 순서이므로, module 줄 바로 앞의 더 깊은 줄들이 하위 트리
+    index = max((i for i, entry in enumerate(entries) if entry[0] == module), default=None)
+    if index is None:
+        return []
+    depth = entries[index][1]
+    children = []
+    for name, child_depth, cumulative_ms in reversed(entries[:index]):
+        if child_depth <= depth:
+            break
+        if child_depth == depth + 1:
+            children.append({'module': name, 'cumulative_ms': round(cumulative_ms, 1)})
+    children.sort(key=lambda entry: -entry['cumulative_ms'])
+    return children[:top]
+
+
+def loaded_heavy_modules(module: str) -> List[str]:
+    """import 직후 이미 로드된 무거운 의존성"""
+    code = f"import sys, {module}; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    return [name for name in _run(code).stdout.strip().split(',') if name]
+
+
+def bench(modules: List[str], repeat: int, top: int) -> Dict:
+    baseline = statistics.median(wall_time_ms("pass", repeat))
+    results = {}
+    for module in modules:
+        times = [t - baseline for t in wall_time_ms(f"import {module}", repeat)]
+        results[module] = {
+            'median_ms': round(statistics.median(times), 1),
+            'min_ms': round(min(times), 1),
+            'heavy_loaded': loaded_heavy_modules(module),
+            'top_imports': import_breakdown(module, top),
+        }
+    return {'python': sys.version.split()[0], 'baseline_ms': round(baseline, 1), 'modules': results}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="모듈 import 시간 측정")
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES)
+    parser.add_argument('--repeat', type=int, default=7, help="측정 반복 횟수")
+    parser.add_argument('--top', type=int, default=5, help="출력할 하위 모듈 수")
+    parser.add_argument('--max-ms', type=float, help="중앙값이 이 값을 넘으면 종료 코드 1")
+    parser.add_argument('--history', help="측정 결과를 한 줄씩 추가할 JSONL 파일")
+    args = parser.parse_args()
+
+    report = bench(args.modules, args.repeat, args.top)
+    print(f"Python {report['python']}, 인터프리터 기동 {report['baseline_ms']}ms (제외)")
+    for module, result in report['modules'].items():
+        heavy = ', '.join(result['heavy_loaded']) or '없음'
+        print(f"\n{module}: 중앙값 {result['median_ms']}ms, 최소 {result['min_ms']}ms (import 시 로드된 무거운 의존성: {heavy})")
+        for entry in result['top_imports']:
+            print(f"  {entry['module']:<40} {entry['cumulative_ms']:>8.1f}ms")
+
+    if args.history:
+        with open(args.history, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'timestamp': int(time.time()), **report}, ensure_ascii=False) + '\n')
+
+    if args.max_ms is not None:
+        over = [m for m, r in report['modules'].items() if r['median_ms'] > args.max_ms]
+        if over:
+            print(f"\n예산 {args.max_ms}ms 초과: {', '.join(over)}")
+            sys.exit(1)
@@ -0,0 +1,170 @@
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def region_key(center_lat: float, center_lon: float, radius: float) -> str:
+    """지역(타일)을 체크포인트에서 식별하는 키"""
+    return f"{center_lat:.7f},{center_lon:.7f},{radius:g}"
+
+
+class CrawlCheckpoint:
+    """
+    크롤링 진행 상황을 기록하는 추가 전용(JSONL) 체크포인트
+
+    남은 작업 목록(frontier)과 완료된 작업 단위의 결과를 한 줄씩 기록합니다. 기록은 바로 파일에 쓰이므로
+    프로세스가 중간에 종료되어도 유지되고, 디스크 동기화(fsync)는 백그라운드 스레드가 그동안 쌓인 기록을
+    묶어 한 번에 수행하므로 기록하는 쪽(이벤트 루프)을 막지 않습니다. 다시 열면 파일을 재생해 상태를
+    복원하며, 쓰다 끊긴 마지막 줄은 잘라냅니다.
+
+    메모리에는 작업 단위 이름과 결과가 기록된 줄의 위치(오프셋, 길이)만 두고, 결과는 payload()에서
+    파일을 다시 읽습니다.
+
+    작업 단위 이름 예: 'region:<키>', 'markers:<키>', 'detail:<단지번호>', 'articles:<단지번호>:A1',
+    'plans:<키>:road'
+    """
+
+    def __init__(self, path: str, fsync: bool = True):
+        """
+        Args:
+            path: 체크포인트 파일 경로 (없으면 생성)
+            fsync: 백그라운드 디스크 동기화 여부
+        """
+        self.path = path
+        self.fsync = fsync
+        self.frontier: Dict[str, None] = {}  # 삽입 순서를 유지하는 집합
+        self.completed: Dict[str, Optional[Tuple[int, int]]] = {}  # 단위 -> 결과 줄의 (오프셋, 길이)
+        self._size = 0
+        self._replay()
+        flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+        self._fd = os.open(path, flags, 0o644)
+        self._reader = open(path, 'rb')
+        self._read_lock = threading.Lock()
+
+        self._sync_cond = threading.Condition()
+        self._written = self._synced = 0  # 기록한 줄 수, 동기화를 마친 줄 수
+        self._closing = False
+        self._syncer = None
+        if fsync:
+            self._syncer = threading.Thread(target=self._sync_loop, name="checkpoint-fsync", daemon=True)
+            self._syncer.start()
+
+    def _replay(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                self._apply(entry, self._size, len(line))
+                self._size += len(line)
+        if self._size < os.path.getsize(self.path):
+            logger.warning(f"체크포인트 {self.path}의 끊긴 마지막 기록을 제거합니다")
+            with open(self.path, 'r+b') as f:
+                f.truncate(self._size)
+        if self.completed:
+            logger.info(f"체크포인트 복원: 완료 {len(self.completed)}개, 남은 작업 {len(self.pending())}개")
+
+    def _apply(self, entry: Dict, offset: int, length: int):
+        if entry['type'] == 'frontier':
+            for unit in entry['units']:
+                self.frontier.setdefault(unit, None)
+        elif entry['type'] == 'done':
+            self.completed[entry['unit']] = (offset, length) if entry.get('payload') is not None else None
+
+    def _append(self, entry: Dict):
+        """한 줄을 한 번의 write로 추가하고 동기화 스레드에 알림"""
+        data = (json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+        offset = self._size
+        remaining = data
+        while remaining:
+            written = os.write(self._fd, remaining)
+            remaining = remaining[written:]
+        self._size += len(data)
+        self._apply(entry, offset, len(data))
+        if self._syncer:
+            with self._sync_cond:
+                self._written += 1
+                self._sync_cond.notify_all()
+
+    def _sync_loop(self):
+        """기록이 생기면 그때까지의 기록을 한 번의 fsync로 동기화 (동기화 중에 쌓인 기록은 다음 번에 묶음)"""
+        while True:
+            with self._sync_cond:
+                while self._synced == self._written and not self._closing:
+                    self._sync_cond.wait()
+                if self._synced == self._written:
+                    return
+                target = self._written
+            os.fsync(self._fd)
+            with self._sync_cond:
+                self._synced = target
+                self._sync_cond.notify_all()
+
+    def flush(self):
+        """지금까지의 기록이 디스크에 동기화될 때까지 대기"""
+        if not self._syncer:
+            return
+        with self._sync_cond:
+            target = self._written
+            while self._synced < target and self._syncer.is_alive():
+                self._sync_cond.wait()
+
+    def add_frontier(self, units: Iterable[str]):
+        """처리할 작업 단위를 기록 (이미 기록된 단위는 무시)"""
+        new_units = [unit for unit in units if unit not in self.frontier]
+        if new_units:
+            self._append({'type': 'frontier', 'units': new_units})
+
+    def complete(self, unit: str, payload: Any = None):
+        """작업 단위 완료와 그 결과를 기록"""
+        self._append({'type': 'done', 'unit': unit, 'payload': payload})
+
+    def is_done(self, unit: str) -> bool:
+        return unit in self.completed
+
+    def payload(self, unit: str) -> Any:
+        """완료된 작업 단위의 결과 (파일에서 해당 줄을 읽음)"""
+        ref = self.completed.get(unit)
+        if ref is None:
+            return None
+        offset, length = ref
+        with self._read_lock:
+            self._reader.seek(offset)
+            line = self._reader.read(length)
+        return json.loads(line)['payload']
+
+    def units(self, prefix: str) -> List[str]:
+        """prefix로 시작하는 frontier 작업 단위 (기록 순서)"""
+        return [unit for unit in self.frontier if unit.startswith(prefix)]
+
+    def pending(self) -> List[str]:
+        """아직 완료되지 않은 frontier 작업 단위"""
+        return [unit for unit in self.frontier if unit not in self.completed]
+
+    def close(self):
+        """남은 기록을 동기화하고 파일을 닫음"""
+        if self._fd is None:
+            return
+        if self._syncer:
+            with self._sync_cond:
+                self._closing = True
+                self._sync_cond.notify_all()
+            self._syncer.join()
+        os.close(self._fd)
+        self._fd = None
+        self._reader.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
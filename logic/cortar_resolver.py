@@ -0,0 +1,288 @@
+import json
+import logging
+import math
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CORTAR_NO = '4113510300'  # 경계 데이터가 없을 때 사용하는 지역코드 (성남시 분당구 정자동)
+DEFAULT_BOUNDARY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cortar_boundaries.json')
+DEFAULT_CELL_SIZE = 0.01  # 공간 인덱스 격자 크기 (도 단위, 약 1km)
+
+Ring = List[Tuple[float, float]]  # [(lon, lat), ...]
+BBox = Tuple[float, float, float, float]  # (min_lon, min_lat, max_lon, max_lat)
+
+
+def _ring_bbox(rings: Sequence[Ring]) -> BBox:
+    lons = [lon for ring in rings for lon, _ in ring]
+    lats = [lat for ring in rings for _, lat in ring]
+    return min(lons), min(lats), max(lons), max(lats)
+
+
+def _point_in_rings(lon: float, lat: float, rings: Sequence[Ring]) -> bool:
+    """짝홀 규칙(ray casting)으로 점이 다각형 안에 있는지 판정합니다. 구멍이 있는 다각형도 처리합니다."""
+    inside = False
+    for ring in rings:
+        j = len(ring) - 1
+        for i in range(len(ring)):
+            xi, yi = ring[i]
+            xj, yj = ring[j]
+            if (yi > lat) != (yj > lat) and lon < (xj - xi) * (lat - yi) / (yj - yi) + xi:
+                inside = not inside
+            j = i
+    return inside
+
+
+def _segments_cross(p1, p2, q1, q2) -> bool:
+    def orient(a, b, c):
+        return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+    d1, d2 = orient(q1, q2, p1), orient(q1, q2, p2)
+    d3, d4 = orient(p1, p2, q1), orient(p1, p2, q2)
+    return (d1 > 0) != (d2 > 0) and (d3 > 0) != (d4 > 0)
+
+
+def _rings_intersect_bbox(rings: Sequence[Ring], bbox: BBox) -> bool:
+    """다각형과 사각형 영역이 겹치는지 판정합니다."""
+    min_lon, min_lat, max_lon, max_lat = bbox
+    corners = [(min_lon, min_lat), (max_lon, min_lat), (max_lon, max_lat), (min_lon, max_lat)]
+    if any(_point_in_rings(lon, lat, rings) for lon, lat in corners):
+        return True
+    for ring in rings:
+        for k, (lon, lat) in enumerate(ring):
+            if min_lon <= lon <= max_lon and min_lat <= lat <= max_lat:
+                return True
+            next_point = ring[(k + 1) % len(ring)]
+            for c in range(4):
+                if _segments_cross((lon, lat), next_point, corners[c], corners[(c + 1) % 4]):
+                    return True
+    return False
+
+
+class CortarResolver:
+    """
+    좌표 또는 영역을 법정동 코드(cortarNo)로 변환하는 로컬 조회기
+
+    법정동 경계 다각형을 격자 공간 인덱스로 묶어 두고, 격자 칸의 후보 법정동에 대해서만
+    bbox 검사와 다각형 포함 검사를 수행하므로 네트워크 요청 없이 즉시 조회됩니다.
+    """
+
+    def __init__(self, districts: List[Dict], cell_size: float = DEFAULT_CELL_SIZE):
+        """
+        Args:
+            districts: [{'cortarNo', 'cortarName', 'rings': [[[lon, lat], ...], ...]}, ...]
+            cell_size: 격자 크기 (도 단위)
+        """
+        self.cell_size = cell_size
+        self.districts = []
+        self.grid: Dict[Tuple[int, int], List[int]] = {}
+
+        for district in districts:
+            rings = [[(float(lon), float(lat)) for lon, lat in ring] for ring in district['rings'] if len(ring) >= 3]
+            if not rings:
+                continue
+            bbox = _ring_bbox(rings)
+            index = len(self.districts)
+            self.districts.append({
+                'cortarNo': str(district['cortarNo']),
+                'cortarName': district.get('cortarName'),
+                'rings': rings,
+                'bbox': bbox,
+            })
+            for cell in self._cells(bbox):
+                self.grid.setdefault(cell, []).append(index)
+
+    def _cell(self, lon: float, lat: float) -> Tuple[int, int]:
+        return math.floor(lon / self.cell_size), math.floor(lat / self.cell_size)
+
+    def _cells(self, bbox: BBox):
+        min_x, min_y = self._cell(bbox[0], bbox[1])
+        max_x, max_y = self._cell(bbox[2], bbox[3])
+        for x in range(min_x, max_x + 1):
+            for y in range(min_y, max_y + 1):
+                yield x, y
+
+    @classmethod
+    def load(cls, filename: str = DEFAULT_BOUNDARY_FILE) -> 'CortarResolver':
+        """build_boundaries로 만든 경계 파일을 읽습니다."""
+        with open(filename, encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data['districts'], data.get('cell_size', DEFAULT_CELL_SIZE))
+
+    def resolve_point(self, lat: float, lon: float) -> Optional[str]:
+        """좌표가 속한 법정동 코드 (경계 밖이면 None)"""
+        for index in self.grid.get(self._cell(lon, lat), ()):
+            district = self.districts[index]
+            min_lon, min_lat, max_lon, max_lat = district['bbox']
+            if min_lon <= lon <= max_lon and min_lat <= lat <= max_lat and _point_in_rings(lon, lat, district['rings']):
+                return district['cortarNo']
+        return None
+
+    def resolve_bbox(self, left_lon: float, right_lon: float, top_lat: float, bottom_lat: float) -> List[str]:
+        """
+        영역과 겹치는 법정동 코드 목록
+
+        영역 중심을 포함하는 법정동이 첫 번째이고 나머지는 코드 순서입니다.
+        """
+        bbox = (left_lon, bottom_lat, right_lon, top_lat)
+        candidates = set()
+        for cell in self._cells(bbox):
+            candidates.update(self.grid.get(cell, ()))
+
+        matched = []
+        for index in sorted(candidates):
+            district = self.districts[index]
+            d_min_lon, d_min_lat, d_max_lon, d_max_lat = district['bbox']
+            if d_max_lon < left_lon or d_min_lon > right_lon or d_max_lat < bottom_lat or d_min_lat > top_lat:
+                continue
+            if _rings_intersect_bbox(district['rings'], bbox):
+                matched.append(district['cortarNo'])
+
+        center = self.resolve_point((top_lat + bottom_lat) / 2, (left_lon + right_lon) / 2)
+        matched.sort(key=lambda cortar_no: (cortar_no != center, cortar_no))
+        return matched
+
+
+_default_resolver: Optional[CortarResolver] = None
+_default_loaded = False
+
+
+def get_default_resolver() -> Optional[CortarResolver]:
+    """기본 경계 파일의 조회기 (파일이 없으면 None). 프로세스당 한 번만 읽습니다."""
+    global _default_resolver, _default_loaded
+    if not _default_loaded:
+        _default_loaded = True
+        if os.path.exists(DEFAULT_BOUNDARY_FILE):
+            _default_resolver = CortarResolver.load(DEFAULT_BOUNDARY_FILE)
+            logger.debug(f"법정동 경계 {len(_default_resolver.districts)}개 로드")
+        else:
+            logger.debug(f"법정동 경계 파일 없음: {DEFAULT_BOUNDARY_FILE}")
+    return _default_resolver
+
+
+def resolve_cortar_no(left_lon: float, right_lon: float, top_lat: float, bottom_lat: float) -> str:
+    """영역의 대표 법정동 코드. 경계 데이터가 없거나 영역 밖이면 DEFAULT_CORTAR_NO."""
+    resolver = get_default_resolver()
+    if resolver:
+        cortar_nos = resolver.resolve_bbox(left_lon, right_lon, top_lat, bottom_lat)
+        if cortar_nos:
+            return cortar_nos[0]
+    return DEFAULT_CORTAR_NO
+
+
+def _normalize_vertices(vertex_lists) -> List[Ring]:
+    """/api/cortars의 cortarVertexLists([[[lat, lon], ...]])를 [(lon, lat), ...] 목록으로 변환"""
+    rings = []
+    for ring in vertex_lists or []:
+        points = [(float(b), float(a)) if abs(a) <= 90 and abs(b) > 90 else (float(a), float(b)) for a, b in ring]
+        if len(points) >= 3:
+            rings.append(points)
+    return rings
+
+
+async def build_boundaries(crawler,
+                           left_lon: float,
+                           right_lon: float,
+                           top_lat: float,
+                           bottom_lat: float,
+                           step: float = 0.01,
+                           delay: float = 0.3) -> List[Dict]:
+    """
+    /api/cortars를 격자 좌표로 조회해 영역 안의 법정동 경계를 수집합니다.
+
+    이미 수집한 경계 안에 있는 격자 좌표는 건너뛰므로 요청 수는 대략 법정동 수에 비례합니다.
+
+    Args:
+        crawler: init_session을 마친 NaverRealEstateCrawler
+        step: 격자 간격 (도 단위)
+        delay: 요청 간 대기 시간 (초)
+    """
+    import asyncio
+
+    url = f"{crawler.base_url}/api/cortars"
+    districts: Dict[str, Dict] = {}
+    resolver = CortarResolver([])
+
+    lat = bottom_lat
+    while lat <= top_lat:
+        lon = left_lon
+        while lon <= right_lon:
+            if resolver.resolve_point(lat, lon) is None:
+                status, data = await crawler._get_json(url, {'zoom': '16', 'centerLat': str(lat), 'centerLon': str(lon)})
+                if status == 200 and data and data.get('cortarNo'):
+                    rings = _normalize_vertices(data.get('cortarVertexLists'))
+                    if rings and data['cortarNo'] not in districts:
+                        districts[data['cortarNo']] = {
+                            'cortarNo': data['cortarNo'],
+                            'cortarName': data.get('cortarName'),
+                            'rings': rings,
+                        }
+                        resolver = CortarResolver(list(districts.values()))
+                        logger.info(f"법정동 {data['cortarNo']} {data.get('cortarName')} 수집 ({len(districts)}개)")
+                else:
+                    logger.warning(f"행정구역 조회 실패 ({lat:.4f}, {lon:.4f}): {status}")
+                await asyncio.sleep(delay)
+            lon += step
+        lat += step
+    return list(districts.values())
+
+
+def save_boundaries(districts: List[Dict], filename: str = DEFAULT_BOUNDARY_FILE,
+                    cell_size: float = DEFAULT_CELL_SIZE, precision: int = 6):
+    """경계 파일 저장. 좌표는 precision 자리로 반올림해 파일 크기를 줄입니다."""
+    compact = [
+        {
+            'cortarNo': district['cortarNo'],
+            'cortarName': district.get('cortarName'),
+            'rings': [[[round(lon, precision), round(lat, precision)] for lon, lat in ring]
+                      for ring in district['rings']],
+        }
+        for district in sorted(districts, key=lambda d: d['cortarNo'])
+    ]
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump({'cell_size': cell_size, 'districts': compact}, f, ensure_ascii=False, separators=(',', ':'))
+
+
+if __name__ == "__main__":
+    import argparse
+    import asyncio
+
+    parser = argparse.ArgumentParser(description="법정동 경계 파일 생성/조회")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help="/api/cortars로 영역의 경계 수집")
+    build_parser.add_argument('left_lon', type=float)
+    build_parser.add_argument('bottom_lat', type=float)
+    build_parser.add_argument('right_lon', type=float)
+    build_parser.add_argument('top_lat', type=float)
+    build_parser.add_argument('--step', type=float, default=0.01, help="격자 간격 (도)")
+    build_parser.add_argument('--output', default=DEFAULT_BOUNDARY_FILE)
+
+    lookup_parser = subparsers.add_parser('lookup', help="좌표의 법정동 코드 조회")
+    lookup_parser.add_argument('lat', type=float)
+    lookup_parser.add_argument('lon', type=float)
+    lookup_parser.add_argument('--boundaries', default=DEFAULT_BOUNDARY_FILE)
+
+    args = parser.parse_args()
+    if args.command == 'build':
+        from naver_real_estate_crawler import NaverRealEstateCrawler, configure_logging
+
+        configure_logging()
+
+        async def build():
+            crawler = NaverRealEstateCrawler()
+            try:
+                await crawler.init_browser(headless=True)
+                await crawler.init_session()
+                districts = await build_boundaries(
+                    crawler, args.left_lon, args.right_lon, args.top_lat, args.bottom_lat, args.step
+                )
+            finally:
+                await crawler.close()
+            save_boundaries(districts, args.output)
+            print(f"법정동 {len(districts)}개를 {args.output}에 저장")
+
+        asyncio.run(build())
+    else:
+        resolver = CortarResolver.load(args.boundaries)
+        print(resolver.resolve_point(args.lat, args.lon) or "경계 밖")
@@ -1,5 +1,5 @@
 import asyncio
-from naver_real_estate_crawler import NaverRealEstateCrawler
+from naver_real_estate_crawler import NaverRealEstateCrawler, configure_logging
 
 async def debug_api_call():
     """API 호출 디버깅"""
@@ -61,4 +61,5 @@ async def debug_api_call():
         await crawler.close()
 
 if __name__ == "__main__":
+    configure_logging()
     asyncio.run(debug_api_call())
@@ -0,0 +1,74 @@
+from typing import Dict, List, Optional, Tuple
+
+from price_utils import parse_area, parse_korean_price
+
+
+def article_fingerprint(complex_no: str, article: Dict) -> Tuple:
+    """
+    동일 매물 판별용 지문
+
+    여러 중개사가 같은 세대를 올린 매물은 단지, 동, 층, 전용면적, 거래 타입, 가격이 같습니다.
+    """
+    floor_info = article.get('floorInfo') or ''
+    exclusive_area = parse_area(article.get('area2'))
+    return (
+        str(complex_no),
+        article.get('buildingName'),
+        floor_info.split('/')[0],
+        round(exclusive_area, 2) if exclusive_area is not None else None,
+        article.get('tradeTypeCode'),
+        parse_korean_price(article.get('dealOrWarrantPrc')),
+        parse_korean_price(article.get('rentPrc')),
+    )
+
+
+def _confirm_key(article: Dict) -> str:
+    return str(article.get('articleConfirmYmd') or '').replace('.', '')
+
+
+def collapse_duplicates(complex_no: str, articles: List[Dict]) -> List[Dict]:
+    """
+    한 단지의 중복 매물을 하나로 합칩니다.
+
+    지문이 같은 매물 중 가장 최근에 확인된 매물을 대표로 남기고, 나머지 매물 번호는
+    대표 매물의 duplicateArticleNos에 기록합니다. 원본 dict는 수정하지 않습니다.
+
+    Args:
+        complex_no: 단지 번호
+        articles: get_complex_articles 결과
+    """
+    groups: Dict[Tuple, List[Dict]] = {}
+    for article in articles:
+        groups.setdefault(article_fingerprint(complex_no, article), []).append(article)
+
+    result = []
+    for group in groups.values():
+        if len(group) == 1:
+            result.append(group[0])
+            continue
+        representative = max(group, key=_confirm_key)
+        result.append({
+            **representative,
+            'duplicateArticleNos': [
+                article.get('articleNo') for article in group if article is not representative
+            ]
+        })
+    return result
+
+
+def dedupe_articles(articles_by_complex: Dict[str, List[Dict]],
+                    stats: Optional[Dict[str, int]] = None) -> Dict[str, List[Dict]]:
+    """
+    crawl_area 결과의 articles 전체에 중복 제거를 적용합니다.
+
+    Args:
+        articles_by_complex: {단지번호: 매물 목록}
+        stats: 전달하면 before/after 매물 수를 누적 기록
+    """
+    deduped = {}
+    for complex_no, articles in articles_by_complex.items():
+        deduped[complex_no] = collapse_duplicates(complex_no, articles)
+        if stats is not None:
+            stats['before'] = stats.get('before', 0) + len(articles)
+            stats['after'] = stats.get('after', 0) + len(deduped[complex_no])
+    return deduped
@@ -1,6 +1,6 @@
 import asyncio
 import json
-from naver_real_estate_crawler import NaverRealEstateCrawler
+from naver_real_estate_crawler import NaverRealEstateCrawler, configure_logging
 
 async def simple_example():
     """간단한 사용 예제"""
@@ -67,4 +67,5 @@ async def simple_example():
         await crawler.close()
 
 if __name__ == "__main__":
+    configure_logging()
     asyncio.run(simple_example())
@@ -0,0 +1,240 @@
+import json
+import re
+from typing import Any, Iterator, List, Optional, Tuple
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_ITEM_SEPARATOR = re.compile(r'[ \t\n\r]*,[ \t\n\r]*')
+_SKIP_TOKEN = re.compile(r'["{}\[\]]')
+_VALUE_TERMINATORS = ' \t\n\r,]}'
+_decoder = json.JSONDecoder()
+
+# 파서 상태
+_VALUE = 'value'                  # 값 시작 대기
+_ARRAY_FIRST = 'array_first'      # '[' 직후 (값 또는 ']')
+_OBJECT_FIRST = 'object_first'    # '{' 직후 (키 또는 '}')
+_KEY = 'key'                      # ',' 이후 객체 키 대기
+_COLON = 'colon'                  # 키 이후 ':' 대기
+_AFTER_VALUE = 'after_value'      # 값 이후 ',' 또는 닫는 괄호 대기
+_SKIP = 'skip'                    # 관심 없는 컨테이너 건너뛰기
+_DONE = 'done'
+
+Path = Tuple[str, ...]
+
+
+class JsonItemParser:
+    """
+    JSON 문서를 조각 단위로 받아 지정한 경로의 값이 완성될 때마다 돌려주는 증분 파서
+
+    경로는 ijson과 같은 점 표기법을 사용합니다. 배열 원소는 'item', 임의의 객체 키는 '*'입니다.
+    예: 'item'(최상위 배열의 원소), 'articleList.item', 'articles.*.item'
+
+    일치하는 값은 json.JSONDecoder.raw_decode로 한 번에 디코딩하고, 경로 밖의 컨테이너는
+    괄호 깊이만 세며 건너뛰므로 버퍼에는 아직 완성되지 않은 값 하나 분량만 남습니다.
+    """
+
+    def __init__(self, *patterns: str):
+        if not patterns:
+            raise ValueError("최소 하나의 경로가 필요합니다")
+        self.patterns = [tuple(pattern.split('.')) for pattern in patterns]
+        self.buf = ''
+        self.pos = 0
+        self.stack: List[list] = []  # [컨테이너 종류('{' 또는 '['), 현재 키]
+        self.state = _VALUE
+        self.skip_depth = 0
+        self._match_cache = {}
+
+    def _path(self) -> Path:
+        return tuple(frame[1] if frame[0] == '{' else 'item' for frame in self.stack)
+
+    def _match(self, path: Path) -> Tuple[bool, bool]:
+        """(경로 완전 일치 여부, 하위에 일치 가능한 값이 있는지 여부)"""
+        if path in self._match_cache:
+            return self._match_cache[path]
+        full = prefix = False
+        for pattern in self.patterns:
+            if len(path) > len(pattern):
+                continue
+            if all(p == '*' or p == c for p, c in zip(pattern, path)):
+                if len(path) == len(pattern):
+                    full = True
+                else:
+                    prefix = True
+        self._match_cache[path] = (full, prefix)
+        return full, prefix
+
+    def _skip_whitespace(self):
+        self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+
+    def _decode_at(self, final: bool) -> Optional[Tuple[Any, int]]:
+        """현재 위치의 값 하나를 디코딩합니다. 값이 아직 완성되지 않았으면 None."""
+        try:
+            value, end = _decoder.raw_decode(self.buf, self.pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return None
+        if not final:
+            # 숫자/리터럴은 다음 조각에서 이어질 수 있음 ('3' + '.5')
+            if end == len(self.buf):
+                return None
+            if isinstance(value, (int, float)) and self.buf[end] not in _VALUE_TERMINATORS:
+                return None
+        return value, end
+
+    def _find_string_end(self, start: int) -> int:
+        """start 위치의 '"'로 시작하는 문자열의 닫는 '"' 위치 (없으면 -1)"""
+        i = start
+        while True:
+            i = self.buf.find('"', i + 1)
+            if i < 0:
+                return -1
+            backslashes = 0
+            j = i - 1
+            while self.buf[j] == '\\':
+                backslashes += 1
+                j -= 1
+            if backslashes % 2 == 0:
+                return i
+
+    def _skip_container(self) -> bool:
+        """건너뛰는 컨테이너의 끝까지 진행합니다. 끝에 도달하면 True."""
+        while self.skip_depth:
+            match = _SKIP_TOKEN.search(self.buf, self.pos)
+            if not match:
+                self.pos = len(self.buf)
+                return False
+            token = match.group()
+            if token == '"':
+                end = self._find_string_end(match.start())
+                if end < 0:
+                    self.pos = match.start()
+                    return False
+                self.pos = end + 1
+            else:
+                self.skip_depth += 1 if token in '{[' else -1
+                self.pos = match.end()
+        return True
+
+    def _decode_items(self, path: Path, items: list, final: bool) -> bool:
+        """
+        일치하는 값을 디코딩합니다. 배열 안이면 이어지는 원소를 연속으로 디코딩합니다.
+        값이 아직 완성되지 않아 더 많은 입력이 필요하면 False.
+        """
+        in_array = bool(self.stack) and self.stack[-1][0] == '['
+        while True:
+            decoded = self._decode_at(final)
+            if decoded is None:
+                self.state = _VALUE
+                return False
+            value, self.pos = decoded
+            items.append((path, value))
+            if in_array:
+                separator = _ITEM_SEPARATOR.match(self.buf, self.pos)
+                if separator and separator.end() < len(self.buf):
+                    self.pos = separator.end()
+                    continue
+            self._end_value()
+            return True
+
+    def _end_value(self):
+        self.state = _AFTER_VALUE if self.stack else _DONE
+
+    def feed(self, text: str, final: bool = False) -> List[Tuple[Path, Any]]:
+        """
+        문서 조각을 추가하고 새로 완성된 (경로, 값) 목록을 반환합니다.
+
+        Args:
+            text: 이어지는 JSON 텍스트
+            final: 마지막 조각 여부
+        """
+        self.buf = self.buf[self.pos:] + text
+        self.pos = 0
+        items = []
+
+        while True:
+            if self.state == _SKIP:
+                if not self._skip_container():
+                    break
+                self._end_value()
+                continue
+
+            self._skip_whitespace()
+            if self.pos >= len(self.buf):
+                break
+            char = self.buf[self.pos]
+
+            if self.state == _DONE:
+                raise ValueError(f"JSON 문서 뒤에 추가 데이터가 있습니다: {char!r}")
+
+            if self.state in (_ARRAY_FIRST, _OBJECT_FIRST) and char in ']}':
+                self.pos += 1
+                self.stack.pop()
+                self._end_value()
+                continue
+
+            if self.state in (_OBJECT_FIRST, _KEY):
+                if char != '"':
+                    raise ValueError(f"객체 키가 필요합니다: {char!r}")
+                decoded = self._decode_at(final=True) if self._find_string_end(self.pos) >= 0 else None
+                if decoded is None:
+                    break
+                self.stack[-1][1], self.pos = decoded
+                self.state = _COLON
+                continue
+
+            if self.state == _COLON:
+                if char != ':':
+                    raise ValueError(f"':'가 필요합니다: {char!r}")
+                self.pos += 1
+                self.state = _VALUE
+                continue
+
+            if self.state == _AFTER_VALUE:
+                kind = self.stack[-1][0]
+                if char == ',':
+                    self.pos += 1
+                    self.state = _KEY if kind == '{' else _VALUE
+                elif char == ('}' if kind == '{' else ']'):
+                    self.pos += 1
+                    self.stack.pop()
+                    self._end_value()
+                else:
+                    raise ValueError(f"',' 또는 닫는 괄호가 필요합니다: {char!r}")
+                continue
+
+            # 값 시작 (_VALUE, _ARRAY_FIRST)
+            path = self._path()
+            full, prefix = self._match(path)
+            if full:
+                if not self._decode_items(path, items, final):
+                    break
+            elif char in '{[':
+                self.pos += 1
+                if prefix:
+                    self.stack.append([char, None])
+                    self.state = _OBJECT_FIRST if char == '{' else _ARRAY_FIRST
+                else:
+                    self.skip_depth = 1
+                    self.state = _SKIP
+            else:
+                decoded = self._decode_at(final)
+                if decoded is None:
+                    break
+                self.pos = decoded[1]
+                self._end_value()
+
+        if final and self.state != _DONE:
+            raise ValueError("JSON 문서가 완결되지 않았습니다")
+        return items
+
+
+def iter_json_file_items(filename: str, *patterns: str, chunk_size: int = 1 << 20) -> Iterator[Tuple[Path, Any]]:
+    """JSON 파일에서 경로에 일치하는 값을 메모리에 전체를 올리지 않고 순서대로 읽습니다."""
+    parser = JsonItemParser(*patterns)
+    with open(filename, encoding='utf-8') as f:
+        while True:
+            text = f.read(chunk_size)
+            if not text:
+                break
+            yield from parser.feed(text)
+    yield from parser.feed('', final=True)
@@ -0,0 +1,544 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import segment_sink
+from price_utils import area_band, parse_area, parse_korean_price
+
+# 검색 저장소 기본 위치 (API 서버와 CLI가 함께 사용, SEARCH_DB 환경 변수로 변경)
+DEFAULT_DB = os.environ.get("SEARCH_DB", "naver_listings.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS listing_complexes (
+    row_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    complex_no TEXT NOT NULL UNIQUE,
+    complex_name TEXT,
+    latitude REAL,
+    longitude REAL,
+    real_estate_type TEXT,
+    completion_year INTEGER,
+    household_count INTEGER,
+    min_area REAL,
+    max_area REAL,
+    min_deal_price INTEGER,
+    max_deal_price INTEGER,
+    median_deal_unit_price INTEGER,
+    deal_count INTEGER,
+    lease_count INTEGER,
+    rent_count INTEGER,
+    address TEXT,
+    updated_at INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS listing_articles (
+    row_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    article_no TEXT NOT NULL UNIQUE,
+    complex_no TEXT NOT NULL,
+    trade_type TEXT,
+    price INTEGER,
+    rent_price INTEGER,
+    exclusive_area REAL,
+    supply_area REAL,
+    area_band TEXT,
+    floor_info TEXT,
+    direction TEXT,
+    building_name TEXT,
+    confirmed_ymd TEXT,
+    complex_name TEXT,
+    latitude REAL,
+    longitude REAL,
+    completion_year INTEGER,
+    household_count INTEGER,
+    updated_at INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_listing_articles_complex ON listing_articles (complex_no, trade_type);
+"""
+
+TABLES = {'articles': 'listing_articles', 'complexes': 'listing_complexes'}
+
+COMPLEX_COLUMNS = (
+    'complex_no', 'complex_name', 'latitude', 'longitude', 'real_estate_type', 'completion_year',
+    'household_count', 'min_area', 'max_area', 'min_deal_price', 'max_deal_price', 'median_deal_unit_price',
+    'deal_count', 'lease_count', 'rent_count', 'address', 'updated_at',
+)
+ARTICLE_COLUMNS = (
+    'article_no', 'complex_no', 'trade_type', 'price', 'rent_price', 'exclusive_area', 'supply_area',
+    'area_band', 'floor_info', 'direction', 'building_name', 'confirmed_ymd', 'complex_name', 'latitude',
+    'longitude', 'completion_year', 'household_count', 'updated_at',
+)
+
+TRADE_TYPE_CODES = {'A1': 1, 'B1': 2, 'B2': 3}
+
+# 검색 대상별 메모리 컬럼 (이름 -> SQL 식). 조건 검색과 정렬은 이 배열로 처리
+INDEX_COLUMNS = {
+    'articles': {
+        'trade_type': "CASE trade_type WHEN 'A1' THEN 1 WHEN 'B1' THEN 2 WHEN 'B2' THEN 3 END",
+        'complex_no': "CAST(complex_no AS INTEGER)",
+        'price': "price",
+        'rent_price': "rent_price",
+        'exclusive_area': "exclusive_area",
+        'confirmed': "CAST(REPLACE(confirmed_ymd, '.', '') AS INTEGER)",
+        'latitude': "latitude",
+        'longitude': "longitude",
+        'completion_year': "completion_year",
+        'household_count': "household_count",
+    },
+    'complexes': {
+        'min_deal_price': "min_deal_price",
+        'max_deal_price': "max_deal_price",
+        'median_deal_unit_price': "median_deal_unit_price",
+        'min_area': "min_area",
+        'max_area': "max_area",
+        'deal_count': "deal_count",
+        'lease_count': "lease_count",
+        'rent_count': "rent_count",
+        'latitude': "latitude",
+        'longitude': "longitude",
+        'completion_year': "completion_year",
+        'household_count': "household_count",
+    },
+}
+
+# 정렬 키 -> 메모리 컬럼
+SORT_COLUMNS = {
+    'articles': {
+        'price': 'price',
+        'rent_price': 'rent_price',
+        'area': 'exclusive_area',
+        'confirmed': 'confirmed',
+        'completion_year': 'completion_year',
+        'households': 'household_count',
+    },
+    'complexes': {
+        'price': 'min_deal_price',
+        'unit_price': 'median_deal_unit_price',
+        'completion_year': 'completion_year',
+        'households': 'household_count',
+        'deal_count': 'deal_count',
+    },
+}
+
+# 단지 검색에서 거래 타입 필터에 사용하는 매물 수 컬럼
+TRADE_TYPE_COUNT_COLUMNS = {'A1': 'deal_count', 'B1': 'lease_count', 'B2': 'rent_count'}
+
+MAX_PAGE_SIZE = 200
+
+
+def _to_int(value) -> Optional[int]:
+    try:
+        return int(value) if value is not None and value != '' else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _year(*values) -> Optional[int]:
+    """'201412', '2014.12.10' 같은 준공/사용승인 일자에서 연도 추출"""
+    for value in values:
+        match = re.match(r'\s*(\d{4})', str(value or ''))
+        if match:
+            return int(match.group(1))
+    return None
+
+
+def _sections(data: Dict) -> Tuple[Iterable[Dict], Dict[str, Dict], Iterable[Tuple[str, List[Dict]]]]:
+    """crawl_area 결과(또는 세그먼트 매니페스트)에서 (단지, 단지 상세, 단지별 매물)"""
+    if segment_sink.is_manifest(data):
+        details = dict(segment_sink.iter_section(data, 'complex_details'))
+        return (segment_sink.iter_section(data, 'complexes'), details,
+                segment_sink.iter_grouped(data, 'articles'))
+    return data.get('complexes', []), data.get('complex_details', {}), data.get('articles', {}).items()
+
+
+class ColumnIndex:
+    """
+    검색 대상 하나의 메모리 컬럼 배열과 정렬 키별 정렬 순서(정렬된 위치 배열)
+
+    값이 없는 칸은 NaN이며 모든 비교에서 거짓이므로 SQL의 NULL처럼 조건에서 빠집니다.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, kind: str):
+        self.kind = kind
+        self.rowids, self.columns = self._load(conn, kind, 0)
+        self._orders: Dict[str, Any] = {}
+
+    @staticmethod
+    def _load(conn: sqlite3.Connection, kind: str, after_rowid: int):
+        import numpy as np
+
+        columns = INDEX_COLUMNS[kind]
+        rows = conn.execute(
+            f"SELECT row_id, {', '.join(columns.values())} FROM {TABLES[kind]} WHERE row_id > ? ORDER BY row_id",
+            (after_rowid,)
+        ).fetchall()
+        matrix = np.array(rows, dtype=float).reshape(len(rows), len(columns) + 1)
+        return (matrix[:, 0].astype(np.int64),
+                {name: np.ascontiguousarray(matrix[:, i + 1]) for i, name in enumerate(columns)})
+
+    def __len__(self) -> int:
+        return len(self.rowids)
+
+    def apply(self, conn: sqlite3.Connection, deleted_rowids: List[int]):
+        """
+        삭제된 행을 빼고 새로 추가된 행(row_id가 기존 최댓값보다 큰 행)을 붙입니다.
+
+        row_id는 AUTOINCREMENT이므로 갱신된 행은 항상 새 row_id로 추가됩니다.
+        정렬 순서는 다음 검색에서 다시 만듭니다.
+        """
+        import numpy as np
+
+        last_rowid = int(self.rowids[-1]) if len(self.rowids) else 0
+        keep = ~np.isin(self.rowids, np.array(deleted_rowids, dtype=np.int64)) if deleted_rowids else None
+        new_rowids, new_columns = self._load(conn, self.kind, last_rowid)
+        if keep is None and not len(new_rowids):
+            return
+        if keep is not None:
+            self.rowids = self.rowids[keep]
+            self.columns = {name: values[keep] for name, values in self.columns.items()}
+        self.rowids = np.concatenate([self.rowids, new_rowids])
+        self.columns = {name: np.concatenate([values, new_columns[name]]) for name, values in self.columns.items()}
+        self._orders.clear()
+
+    def order(self, column: str):
+        """column 값 오름차순 위치 (NaN은 끝). 처음 요청할 때 만들어 보관"""
+        import numpy as np
+
+        if column not in self._orders:
+            self._orders[column] = np.argsort(self.columns[column], kind='stable')
+        return self._orders[column]
+
+    def select(self, conditions: List[Tuple[str, str, float]], sort_column: str, descending: bool,
+               offset: int, limit: int) -> Tuple[int, List[int]]:
+        """
+        조건을 모두 만족하는 행을 sort_column 순서로 정렬해 (전체 수, 현재 페이지 rowid 목록)을 반환
+
+        Args:
+            conditions: [(컬럼, '>=' | '<=' | '==' | '>', 값), ...]
+        """
+        import numpy as np
+
+        mask = ~np.isnan(self.columns[sort_column])
+        for column, op, value in conditions:
+            values = self.columns[column]
+            if op == '>=':
+                mask &= values >= value
+            elif op == '<=':
+                mask &= values <= value
+            elif op == '>':
+                mask &= values > value
+            else:
+                mask &= values == value
+        order = self.order(sort_column)
+        hits = order[mask[order]]
+        if descending:
+            hits = hits[::-1]
+        return len(hits), self.rowids[hits[offset:offset + limit]].tolist()
+
+
+class ListingIndex:
+    """
+    수집한 단지/매물의 최신 상태를 보관하는 SQLite 검색 저장소
+
+    크롤링 결과를 넣을 때마다 단지와 매물을 번호 기준으로 갱신합니다. 검색은 가격/면적/준공연도/세대수/좌표
+    컬럼을 메모리 배열(ColumnIndex)로 읽어 조건을 걸고, 정렬 키별로 미리 정렬한 위치 배열 순서대로 현재 페이지의
+    rowid만 골라 SQLite에서 해당 행을 읽습니다. 매물에는 단지의 좌표, 준공연도, 세대수를 함께 저장하므로
+    조인이 필요 없습니다. 메모리 배열은 첫 검색에서 만들고, ingest에서 바뀐 행만 반영합니다.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._indexes: Dict[str, ColumnIndex] = {}
+        self._deleted: Dict[str, List[int]] = {'complexes': [], 'articles': []}
+        self._lock = threading.Lock()  # 연결과 메모리 배열을 API 스레드 사이에서 공유
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def ingest(self, data: Dict, updated_at: Optional[int] = None) -> Dict[str, int]:
+        """
+        crawl_area 결과 하나로 최신 상태를 갱신합니다.
+
+        매물을 수집한 단지는 해당 거래 타입의 기존 매물을 지우고 새 목록으로 바꾸므로
+        내려간 매물은 검색에서 빠집니다.
+
+        Returns:
+            {'complexes': 갱신한 단지 수, 'articles': 갱신한 매물 수}
+        """
+        updated_at = updated_at or int(time.time())
+        area_info = data.get('area_info', {})
+        trade_types = area_info.get('trade_types') or ['A1']
+        depth = (data.get('cost') or {}).get('depth', 'full')
+        complexes, details, articles_by_complex = _sections(data)
+
+        counts = {'complexes': 0, 'articles': 0}
+        with self._lock:
+            with self.conn:
+                self._ingest(complexes, details, articles_by_complex, trade_types, depth, updated_at, counts)
+            for kind, index in self._indexes.items():
+                index.apply(self.conn, self._deleted[kind])
+            self._deleted = {'complexes': [], 'articles': []}
+        return counts
+
+    def _delete(self, kind: str, condition: str, params: List):
+        """행을 지우고 지운 row_id를 메모리 배열 갱신용으로 기록"""
+        self._deleted[kind].extend(
+            row[0] for row in self.conn.execute(f"DELETE FROM {TABLES[kind]} WHERE {condition} RETURNING row_id", params)
+        )
+
+    def _ingest(self, complexes, details, articles_by_complex, trade_types, depth, updated_at, counts):
+        complex_info: Dict[str, Tuple] = {}
+        for complex_data in complexes:
+            complex_no = complex_data.get('markerId') or complex_data.get('complexNo')
+            if not complex_no:
+                continue
+            row = self._complex_row(str(complex_no), complex_data, details.get(complex_no), updated_at)
+            self._delete('complexes', "complex_no = ?", [row[0]])
+            self.conn.execute(
+                f"INSERT INTO listing_complexes ({', '.join(COMPLEX_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(COMPLEX_COLUMNS))})", row
+            )
+            complex_info[str(complex_no)] = (row[1], row[2], row[3], row[5], row[6])
+            counts['complexes'] += 1
+
+        # 매물 단계까지 수집했다면 상세를 받은 단지는 매물이 0개여도 기존 매물을 비움
+        refreshed = set(details) if depth in ('articles', 'full') else set()
+        trade_type_marks = ','.join('?' * len(trade_types))
+        for complex_no, articles in articles_by_complex:
+            complex_no = str(complex_no)
+            refreshed.discard(complex_no)
+            self._delete('articles', f"complex_no = ? AND trade_type IN ({trade_type_marks})", [complex_no, *trade_types])
+            info = complex_info.get(complex_no) or self._stored_complex_info(complex_no)
+            rows = {row[0]: row for row in (self._article_row(complex_no, article, info, updated_at)
+                                            for article in articles) if row}
+            # 다른 단지나 거래 타입으로 저장되어 있던 같은 매물 번호
+            for start in range(0, len(rows), 500):
+                numbers = list(rows)[start:start + 500]
+                self._delete('articles', f"article_no IN ({','.join('?' * len(numbers))})", numbers)
+            self.conn.executemany(
+                f"INSERT INTO listing_articles ({', '.join(ARTICLE_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(ARTICLE_COLUMNS))})", rows.values()
+            )
+            counts['articles'] += len(rows)
+        for complex_no in refreshed:
+            self._delete('articles', f"complex_no = ? AND trade_type IN ({trade_type_marks})",
+                         [str(complex_no), *trade_types])
+
+    def _stored_complex_info(self, complex_no: str) -> Tuple:
+        row = self.conn.execute(
+            "SELECT complex_name, latitude, longitude, completion_year, household_count "
+            "FROM listing_complexes WHERE complex_no = ?", (complex_no,)
+        ).fetchone()
+        return tuple(row) if row else (None,) * 5
+
+    @staticmethod
+    def _complex_row(complex_no: str, complex_data: Dict, detail: Optional[Dict], updated_at: int) -> tuple:
+        detail = detail or {}
+        return (
+            complex_no,
+            complex_data.get('complexName') or detail.get('complexName'),
+            complex_data.get('latitude'),
+            complex_data.get('longitude'),
+            complex_data.get('realEstateTypeCode'),
+            _year(complex_data.get('completionYearMonth'), detail.get('useApproveYmd')),
+            _to_int(complex_data.get('totalHouseholdCount') or detail.get('totalHouseholdCount')),
+            parse_area(complex_data.get('minArea')),
+            parse_area(complex_data.get('maxArea')),
+            _to_int(complex_data.get('minDealPrice')),
+            _to_int(complex_data.get('maxDealPrice')),
+            _to_int(complex_data.get('medianDealUnitPrice')),
+            _to_int(complex_data.get('dealCount')),
+            _to_int(complex_data.get('leaseCount')),
+            _to_int(complex_data.get('rentCount')),
+            detail.get('address'),
+            updated_at,
+        )
+
+    @staticmethod
+    def _article_row(complex_no: str, article: Dict, info: Tuple, updated_at: int) -> Optional[tuple]:
+        article_no = article.get('articleNo')
+        if not article_no:
+            return None
+        exclusive_area = parse_area(article.get('area2'))
+        complex_name, latitude, longitude, completion_year, household_count = info
+        return (
+            str(article_no),
+            complex_no,
+            article.get('tradeTypeCode'),
+            parse_korean_price(article.get('dealOrWarrantPrc')),
+            parse_korean_price(article.get('rentPrc')),
+            exclusive_area,
+            parse_area(article.get('area1')),
+            area_band(exclusive_area),
+            article.get('floorInfo'),
+            article.get('direction'),
+            article.get('buildingName'),
+            article.get('articleConfirmYmd'),
+            complex_name,
+            latitude,
+            longitude,
+            completion_year,
+            household_count,
+            updated_at,
+        )
+
+    def ingest_file(self, filename: str) -> Dict[str, int]:
+        """save_to_json 결과 파일 또는 세그먼트 디렉터리(manifest.json)를 넣습니다."""
+        if os.path.isdir(filename):
+            return self.ingest(segment_sink.load_manifest(filename), int(os.path.getmtime(filename)))
+        with open(filename, encoding='utf-8') as f:
+            data = json.load(f)
+        return self.ingest(data, int(os.path.getmtime(filename)))
+
+    def search(self,
+               kind: str = "articles",
+               trade_type: Optional[str] = None,
+               price_min: Optional[int] = None,
+               price_max: Optional[int] = None,
+               area_min: Optional[float] = None,
+               area_max: Optional[float] = None,
+               year_min: Optional[int] = None,
+               year_max: Optional[int] = None,
+               households_min: Optional[int] = None,
+               households_max: Optional[int] = None,
+               bbox: Optional[Tuple[float, float, float, float]] = None,
+               complex_no: Optional[str] = None,
+               sort: str = "price",
+               order: str = "asc",
+               limit: int = 50,
+               offset: int = 0) -> Dict[str, Any]:
+        """
+        조건에 맞는 매물 또는 단지를 검색합니다.
+
+        Args:
+            kind: articles(매물) 또는 complexes(단지)
+            trade_type: 거래 타입 (A1:매매, B1:전세, B2:월세). 단지는 해당 거래 매물이 있는 단지만
+            price_min, price_max: 가격 범위 (만원). 매물은 매매가/보증금, 단지는 매매가 범위가 겹치는 단지
+            area_min, area_max: 전용면적 범위 (㎡). 단지는 면적 범위가 겹치는 단지
+            year_min, year_max: 준공연도 범위
+            households_min, households_max: 세대수 범위
+            bbox: (left_lon, right_lon, top_lat, bottom_lat)
+            complex_no: 단지 번호 (매물 검색)
+            sort: SORT_COLUMNS[kind]의 키 (정렬 컬럼 값이 없는 레코드는 결과에서 제외)
+            order: asc, desc
+            limit: 페이지 크기 (최대 MAX_PAGE_SIZE)
+            offset: 건너뛸 결과 수
+
+        Returns:
+            {'total': 전체 결과 수, 'items': 현재 페이지 레코드, 'limit', 'offset', 'took_ms'}
+        """
+        if kind not in SORT_COLUMNS:
+            raise ValueError(f"지원하지 않는 검색 대상: {kind}")
+        if sort not in SORT_COLUMNS[kind]:
+            raise ValueError(f"지원하지 않는 정렬 키: {sort} (가능: {', '.join(SORT_COLUMNS[kind])})")
+        if order not in ('asc', 'desc'):
+            raise ValueError(f"지원하지 않는 정렬 방향: {order}")
+        if trade_type is not None and trade_type not in TRADE_TYPE_CODES:
+            raise ValueError(f"지원하지 않는 거래 타입: {trade_type}")
+        started = time.perf_counter()
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        offset = max(0, offset)
+
+        conditions: List[Tuple[str, str, float]] = []
+
+        def overlap(low_column: str, high_column: str, low, high):
+            """[low_column, high_column] 범위가 [low, high]와 겹치는 행"""
+            if low is not None:
+                conditions.append((high_column, '>=', low))
+            if high is not None:
+                conditions.append((low_column, '<=', high))
+
+        if kind == 'articles':
+            if trade_type:
+                conditions.append(('trade_type', '==', TRADE_TYPE_CODES[trade_type]))
+            if complex_no:
+                conditions.append(('complex_no', '==', int(complex_no)))
+            overlap('price', 'price', price_min, price_max)
+            overlap('exclusive_area', 'exclusive_area', area_min, area_max)
+        else:
+            if trade_type:
+                conditions.append((TRADE_TYPE_COUNT_COLUMNS[trade_type], '>', 0))
+            overlap('min_deal_price', 'max_deal_price', price_min, price_max)
+            overlap('min_area', 'max_area', area_min, area_max)
+        overlap('completion_year', 'completion_year', year_min, year_max)
+        overlap('household_count', 'household_count', households_min, households_max)
+        if bbox:
+            left_lon, right_lon, top_lat, bottom_lat = bbox
+            overlap('latitude', 'latitude', bottom_lat, top_lat)
+            overlap('longitude', 'longitude', left_lon, right_lon)
+
+        with self._lock:
+            if kind not in self._indexes:
+                self._indexes[kind] = ColumnIndex(self.conn, kind)
+            total, rowids = self._indexes[kind].select(
+                conditions, SORT_COLUMNS[kind][sort], order == 'desc', offset, limit
+            )
+            rows = self.conn.execute(
+                f"SELECT * FROM {TABLES[kind]} WHERE row_id IN ({','.join('?' * len(rowids))})",
+                rowids
+            ).fetchall() if rowids else []
+        by_rowid = {row['row_id']: {key: row[key] for key in row.keys() if key != 'row_id'} for row in rows}
+        return {
+            'total': total,
+            'items': [by_rowid[rowid] for rowid in rowids if rowid in by_rowid],
+            'limit': limit,
+            'offset': offset,
+            'took_ms': round((time.perf_counter() - started) * 1000, 2),
+        }
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'complexes': self.conn.execute("SELECT COUNT(*) FROM listing_complexes").fetchone()[0],
+                'articles': self.conn.execute("SELECT COUNT(*) FROM listing_articles").fetchone()[0],
+            }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="수집한 단지/매물 검색 저장소")
+    parser.add_argument('--db', default=DEFAULT_DB, help="SQLite 파일 경로 (기본 SEARCH_DB 환경 변수)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    ingest_parser = subparsers.add_parser('ingest', help="save_to_json 결과 파일 또는 세그먼트 디렉터리 저장")
+    ingest_parser.add_argument('files', nargs='+')
+
+    search_parser = subparsers.add_parser('search', help="조건 검색")
+    search_parser.add_argument('--kind', default="articles", choices=list(SORT_COLUMNS))
+    search_parser.add_argument('--trade-type')
+    search_parser.add_argument('--price-min', type=int)
+    search_parser.add_argument('--price-max', type=int)
+    search_parser.add_argument('--area-min', type=float)
+    search_parser.add_argument('--area-max', type=float)
+    search_parser.add_argument('--sort', default="price")
+    search_parser.add_argument('--order', default="asc", choices=['asc', 'desc'])
+    search_parser.add_argument('--limit', type=int, default=20)
+
+    args = parser.parse_args()
+    with ListingIndex(args.db) as index:
+        if args.command == 'ingest':
+            for filename in args.files:
+                print(f"{filename}: {index.ingest_file(filename)}")
+            print(f"전체: {index.counts()}")
+        else:
+            result = index.search(args.kind, trade_type=args.trade_type, price_min=args.price_min,
+                                  price_max=args.price_max, area_min=args.area_min, area_max=args.area_max,
+                                  sort=args.sort, order=args.order, limit=args.limit)
+            for item in result['items']:
+                print(item)
+            print(f"{result['total']}개 중 {len(result['items'])}개, {result['took_ms']}ms")
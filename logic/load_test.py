@@ -0,0 +1,436 @@
+"""
+api_server 부하 테스트
+
+네이버 부동산 대신 지연 시간을 설정할 수 있는 모의 크롤러로 api_server를 별도 프로세스에서 실행하고,
+여러 동시 클라이언트가 실제 사용 패턴(지도 이동, 단지 상세 조회, 전체 크롤링)을 섞어 요청합니다.
+
+    python load_test.py run --concurrency 50 --duration 60 --browser-latency 1.5
+    python load_test.py run --url http://localhost:8000 --server-pid 1234   # 이미 실행 중인 서버
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_MIX = "complexes=70,detail=25,crawl=5"
+BASE_LAT, BASE_LON = 37.3642443, 127.1084674
+
+
+# ---------------------------------------------------------------------------
+# 모의 크롤러 (서버 프로세스)
+# ---------------------------------------------------------------------------
+
+def make_mock_crawler(browser_latency: float, session_latency: float, api_latency: float,
+                      markers_per_view: int, articles_per_complex: int, crawl_delays: bool):
+    """브라우저/업스트림 호출을 지연 시간으로 대신하는 NaverRealEstateCrawler 하위 클래스"""
+    import naver_real_estate_crawler
+    from naver_real_estate_crawler import NaverRealEstateCrawler
+
+    def markers(params: Dict) -> List[Dict]:
+        # 같은 화면 영역은 같은 단지를 반환하도록 좌표 격자로 시드 고정
+        cell = (round(float(params['leftLon']), 2), round(float(params['bottomLat']), 2))
+        rng = random.Random(hash(cell))
+        left, right = float(params['leftLon']), float(params['rightLon'])
+        bottom, top = float(params['bottomLat']), float(params['topLat'])
+        return [
+            {
+                'markerId': str(rng.randrange(10000, 99999)),
+                'markerType': 'COMPLEX',
+                'latitude': rng.uniform(bottom, top),
+                'longitude': rng.uniform(left, right),
+                'complexName': f"모의단지{i}",
+                'realEstateTypeCode': 'APT',
+                'minDealPrice': 50000,
+                'maxDealPrice': 150000,
+                'totalHouseholdCount': rng.randrange(100, 3000),
+            }
+            for i in range(markers_per_view)
+        ]
+
+    def articles(complex_no: str, trade_type: str) -> List[Dict]:
+        rng = random.Random(f"{complex_no}:{trade_type}")
+        return [
+            {
+                'articleNo': f"{complex_no}{trade_type}{i:04d}",
+                'tradeTypeCode': trade_type,
+                'tradeTypeName': naver_real_estate_crawler.TRADE_TYPES[trade_type],
+                'dealOrWarrantPrc': f"{rng.randrange(5, 20)}억 {rng.randrange(0, 10) * 1000:,}",
+                'area1': 112,
+                'area2': rng.choice([59, 84, 114]),
+                'floorInfo': f"{rng.randrange(1, 25)}/25",
+                'buildingName': f"{rng.randrange(101, 110)}동",
+                'articleConfirmYmd': '20250101',
+            }
+            for i in range(articles_per_complex)
+        ]
+
+    class MockCrawler(NaverRealEstateCrawler):
+        async def init_browser(self, headless: bool = True):
+            with self.tracer.span('browser_launch', headless=headless):
+                await asyncio.sleep(browser_latency)
+            self.browser = True
+
+        async def init_session(self):
+            with self.tracer.span('cookie_harvest'):
+                await asyncio.sleep(session_latency)
+            self.session = True
+
+        async def close(self):
+            self.browser = self.session = None
+
+        async def _pause(self, seconds: float):
+            # crawl_delays가 아니면 crawl_area의 요청 간격 대기(단지당 1초, 개발계획당 0.5초)를 생략
+            if crawl_delays:
+                await super()._pause(seconds)
+
+        async def _pace(self):
+            # 전역 요청 속도 제한도 crawl_delays일 때만 적용
+            if crawl_delays:
+                await super()._pace()
+
+        async def _get_json(self, url: str, params: Optional[Dict] = None):
+            endpoint = url[len(self.base_url):]
+            self._count_request(endpoint)
+            async with self._request_slots:
+                await self._pace()
+                with self.tracer.span('http_get', endpoint=endpoint, status=200):
+                    await asyncio.sleep(api_latency)
+            if '/detail/' in endpoint:
+                complex_no = endpoint.rsplit('/', 1)[-1]
+                return 200, {'complexNo': complex_no, 'complexName': f"모의단지{complex_no}", 'cortarNo': '4113510300'}
+            if '/developmentplan/' in endpoint:
+                plan_type = endpoint.split('/')[3]
+                return 200, [{'planName': f"모의{plan_type}계획", 'planType': plan_type}]
+            return 404, None
+
+        async def _iter_json(self, url: str, params: Optional[Dict], *patterns: str):
+            endpoint = url[len(self.base_url):]
+            self._count_request(endpoint)
+            async with self._request_slots:
+                await self._pace()
+                with self.tracer.span('http_get', endpoint=endpoint, stream=True, status=200):
+                    await asyncio.sleep(api_latency)
+            if 'single-markers' in endpoint:
+                records = markers(params)
+            else:
+                records = articles(endpoint.rsplit('/', 1)[-1], params['tradeType'])
+            for record in records:
+                yield record
+
+    return MockCrawler
+
+
+def serve(args):
+    """
+    모의 크롤러로 api_server 실행
+
+    검색/호가 지수 저장소는 --store-dir(생략하면 새 임시 디렉토리)에 만들어 실제 저장소와 섞이지 않게 합니다.
+    uvicorn은 SIGTERM을 받으면 프로세스를 바로 끝내므로 디렉토리 정리는 run처럼 디렉토리를 넘긴 쪽이 맡습니다.
+    """
+    import uvicorn
+    import api_server
+
+    api_server.NaverRealEstateCrawler = make_mock_crawler(
+        args.browser_latency, args.session_latency, args.api_latency,
+        args.markers, args.articles, args.crawl_delays
+    )
+    store_dir = args.store_dir or tempfile.mkdtemp(prefix="load_test_")
+    api_server.SEARCH_DB = os.path.join(store_dir, "listings.db")
+    api_server.PRICE_INDEX_DB = os.path.join(store_dir, "price_index.db")
+    print(f"저장소 위치: {store_dir}")
+    uvicorn.run(api_server.app, host=args.host, port=args.port, log_level="warning")
+
+
+# ---------------------------------------------------------------------------
+# 부하 생성 (클라이언트 프로세스)
+# ---------------------------------------------------------------------------
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(','):
+        name, _, weight = part.partition('=')
+        if name.strip() not in ('complexes', 'detail', 'crawl'):
+            raise ValueError(f"알 수 없는 요청 종류: {name}")
+        weights[name.strip()] = float(weight or 1)
+    return weights
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(q * (len(values) - 1))))
+    return values[index]
+
+
+def self_time_ms(events: List[Dict]) -> Dict[str, float]:
+    """
+    Chrome Trace Event 목록에서 span 이름별 자기 시간(ms)
+
+    span마다 그 구간을 감싸는 가장 안쪽 span(같은 트랙을 우선, 다른 태스크의 span이면 예: crawl_area 안의
+    http_get)을 부모로 보고, 자식 span들이 덮는 구간을 부모의 길이에서 뺍니다. 중첩된 span의 길이를 그대로
+    더하면 단계별 비중의 합이 100%를 넘습니다.
+    """
+    # 시작이 같으면 긴 span(바깥쪽)이 먼저 오도록 정렬
+    spans = sorted(((event['ts'], event['ts'] + event['dur'], event['name'], event.get('tid')) for event in events),
+                   key=lambda span: (span[0], -span[1]))
+    children: Dict[int, List[Tuple[float, float]]] = {}
+    for j, (start, end, _, tid) in enumerate(spans):
+        parents = [i for i in range(j) if spans[i][1] >= end]
+        if parents:
+            parent = min(parents, key=lambda i: (spans[i][3] != tid, spans[i][1] - spans[i][0]))
+            children.setdefault(parent, []).append((start, end))
+
+    result: Dict[str, float] = {}
+    for i, (start, end, name, _) in enumerate(spans):
+        covered, cursor = 0.0, start
+        for child_start, child_end in children.get(i, []):  # 시작 순서
+            if child_end > cursor:
+                covered += child_end - max(child_start, cursor)
+                cursor = child_end
+        result[name] = result.get(name, 0.0) + (end - start - covered) / 1000
+    return result
+
+
+def read_rss_mb(pid: Optional[int]) -> Optional[float]:
+    """/proc에서 프로세스 상주 메모리(MB)를 읽습니다. (Linux 전용)"""
+    if not pid:
+        return None
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+
+class LoadGenerator:
+    """가중치에 따라 요청 종류를 고르는 동시 클라이언트 묶음"""
+
+    def __init__(self, url: str, concurrency: int, duration: float, mix: Dict[str, float],
+                 server_pid: Optional[int] = None, sample_interval: float = 1.0, timeout: float = 120.0):
+        self.url = url.rstrip('/')
+        self.concurrency = concurrency
+        self.duration = duration
+        self.mix = mix
+        self.server_pid = server_pid
+        self.sample_interval = sample_interval
+        self.timeout = timeout
+        self.results: List[Dict] = []  # {'kind', 'start', 'latency', 'ok', 'status'}
+        self.timeline: List[Dict] = []
+        self.phase_ms: Dict[str, float] = {}
+        self.known_complexes: List[str] = []
+
+    def _next_request(self, rng: random.Random, position: List[float]):
+        kind = rng.choices(list(self.mix), weights=list(self.mix.values()))[0]
+        # 지도 이동: 현재 위치에서 조금씩 이동
+        position[0] += rng.uniform(-0.003, 0.003)
+        position[1] += rng.uniform(-0.003, 0.003)
+        body = {'center_lat': position[0], 'center_lon': position[1], 'debug': True}
+        if kind == 'complexes':
+            return kind, 'POST', '/api/complexes', {**body, 'view': 'map'}
+        if kind == 'crawl':
+            return kind, 'POST', '/api/crawl', {**body, 'view': 'summary'}
+        complex_no = rng.choice(self.known_complexes) if self.known_complexes else str(rng.randrange(10000, 99999))
+        return kind, 'GET', f'/api/complex/{complex_no}?debug=true', None
+
+    def _record_trace(self, payload: Dict):
+        trace = payload.get('trace') or {}
+        for name, ms in self_time_ms(trace.get('traceEvents') or []).items():
+            self.phase_ms[name] = self.phase_ms.get(name, 0.0) + ms
+
+    async def _worker(self, session, worker_id: int, deadline: float):
+        import aiohttp
+
+        rng = random.Random(worker_id)
+        position = [BASE_LAT + rng.uniform(-0.02, 0.02), BASE_LON + rng.uniform(-0.02, 0.02)]
+        while time.monotonic() < deadline:
+            kind, method, path, body = self._next_request(rng, position)
+            started = time.monotonic()
+            status, ok = None, False
+            try:
+                async with session.request(method, self.url + path, json=body) as response:
+                    status = response.status
+                    payload = await response.json(content_type=None)
+                ok = status == 200 and payload.get('success', False)
+                self._record_trace(payload)
+                if kind == 'complexes' and ok:
+                    markers = payload['data'].get('complexes', [])
+                    self.known_complexes.extend(c['markerId'] for c in markers[:5] if 'markerId' in c)
+                    del self.known_complexes[:-500]
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+                pass
+            self.results.append({
+                'kind': kind, 'start': started, 'latency': time.monotonic() - started, 'ok': ok, 'status': status
+            })
+
+    async def _sampler(self, started: float, deadline: float):
+        last_count = 0
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.sample_interval)
+            count = len(self.results)
+            self.timeline.append({
+                't': round(time.monotonic() - started, 1),
+                'rps': round((count - last_count) / self.sample_interval, 1),
+                'completed': count,
+                'errors': sum(1 for r in self.results if not r['ok']),
+                'server_rss_mb': read_rss_mb(self.server_pid),
+            })
+            last_count = count
+
+    async def run(self) -> Dict:
+        import aiohttp
+
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        started = time.monotonic()
+        deadline = started + self.duration
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            await asyncio.gather(
+                self._sampler(started, deadline),
+                *(self._worker(session, i, deadline) for i in range(self.concurrency))
+            )
+        return self.report(time.monotonic() - started)
+
+    def report(self, elapsed: float) -> Dict:
+        def stats(results):
+            latencies = [r['latency'] * 1000 for r in results]
+            return {
+                'requests': len(results),
+                'rps': round(len(results) / elapsed, 2),
+                'error_rate': round(sum(1 for r in results if not r['ok']) / len(results), 4) if results else 0.0,
+                'p50_ms': round(percentile(latencies, 0.5) or 0, 1),
+                'p95_ms': round(percentile(latencies, 0.95) or 0, 1),
+                'p99_ms': round(percentile(latencies, 0.99) or 0, 1),
+                'max_ms': round(max(latencies, default=0), 1),
+            }
+
+        total_phase = sum(self.phase_ms.values()) or 1.0
+        rss = [sample['server_rss_mb'] for sample in self.timeline if sample['server_rss_mb'] is not None]
+        return {
+            'config': {'url': self.url, 'concurrency': self.concurrency, 'duration': self.duration, 'mix': self.mix},
+            'elapsed_s': round(elapsed, 1),
+            'overall': stats(self.results),
+            'by_endpoint': {kind: stats([r for r in self.results if r['kind'] == kind]) for kind in self.mix},
+            # 서버 쪽 단계별 자기 시간 비중 (브라우저 실행이 병목인지 확인용, 합계 100%)
+            'server_phase_share': {
+                name: round(ms / total_phase, 3)
+                for name, ms in sorted(self.phase_ms.items(), key=lambda item: -item[1])
+            },
+            'server_rss_mb': {
+                'start': rss[0] if rss else None,
+                'peak': max(rss) if rss else None,
+                'end': rss[-1] if rss else None,
+            },
+            'timeline': self.timeline,
+        }
+
+
+def print_report(report: Dict):
+    print(f"\n=== 부하 테스트 결과 ({report['elapsed_s']}초, 동시 {report['config']['concurrency']}) ===")
+    print(f"{'종류':<10} {'요청':>7} {'RPS':>8} {'오류율':>7} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for kind, s in [('전체', report['overall'])] + list(report['by_endpoint'].items()):
+        print(f"{kind:<10} {s['requests']:>7} {s['rps']:>8} {s['error_rate']:>7.2%} "
+              f"{s['p50_ms']:>7.0f}ms {s['p95_ms']:>7.0f}ms {s['p99_ms']:>7.0f}ms")
+    if report['server_phase_share']:
+        print("\n서버 단계별 자기 시간 비중:")
+        for name, share in list(report['server_phase_share'].items())[:6]:
+            print(f"  {name:<20} {share:>6.1%}")
+    rss = report['server_rss_mb']
+    if rss['peak'] is not None:
+        print(f"\n서버 메모리(RSS): 시작 {rss['start']:.0f}MB, 최대 {rss['peak']:.0f}MB, 종료 {rss['end']:.0f}MB")
+
+
+async def wait_for_server(url: str, timeout: float = 30.0):
+    import aiohttp
+
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            try:
+                async with session.get(url + '/') as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"서버가 {timeout}초 안에 시작되지 않았습니다: {url}")
+
+
+def run(args):
+    server = None
+    store_dir = None
+    url, server_pid = args.url, args.server_pid
+    if not url:
+        # 모의 크롤러 서버를 별도 프로세스로 실행 (저장소는 끝나면 지우는 임시 디렉토리)
+        url = f"http://127.0.0.1:{args.port}"
+        store_dir = tempfile.TemporaryDirectory(prefix="load_test_")
+        command = [
+            sys.executable, os.path.abspath(__file__), 'serve', '--port', str(args.port), '--store-dir', store_dir.name,
+            '--browser-latency', str(args.browser_latency), '--session-latency', str(args.session_latency),
+            '--api-latency', str(args.api_latency), '--markers', str(args.markers), '--articles', str(args.articles),
+        ] + (['--crawl-delays'] if args.crawl_delays else [])
+        server = subprocess.Popen(command, cwd=os.path.dirname(os.path.abspath(__file__)))
+        server_pid = server.pid
+
+    try:
+        asyncio.run(wait_for_server(url))
+        generator = LoadGenerator(url, args.concurrency, args.duration, parse_mix(args.mix),
+                                  server_pid, args.sample_interval)
+        report = asyncio.run(generator.run())
+    finally:
+        if server:
+            server.terminate()
+            server.wait(timeout=10)
+        if store_dir:
+            store_dir.cleanup()
+
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n결과를 {args.output}에 저장했습니다.")
+
+
+def add_mock_arguments(parser):
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--browser-latency', type=float, default=1.5, help="모의 브라우저 실행 시간 (초)")
+    parser.add_argument('--session-latency', type=float, default=2.5, help="모의 세션(쿠키) 준비 시간 (초)")
+    parser.add_argument('--api-latency', type=float, default=0.05, help="모의 업스트림 응답 시간 (초)")
+    parser.add_argument('--markers', type=int, default=40, help="화면당 단지 마커 수")
+    parser.add_argument('--articles', type=int, default=30, help="단지당 매물 수")
+    parser.add_argument('--crawl-delays', action='store_true', help="crawl_area의 요청 간격 대기와 전역 요청 속도 제한 유지")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="api_server 부하 테스트")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = subparsers.add_parser('serve', help="모의 크롤러로 api_server 실행")
+    serve_parser.add_argument('--host', default="127.0.0.1")
+    serve_parser.add_argument('--store-dir', help="검색/호가 지수 저장소 디렉토리 (생략하면 새 임시 디렉토리)")
+    add_mock_arguments(serve_parser)
+
+    run_parser = subparsers.add_parser('run', help="부하 생성")
+    add_mock_arguments(run_parser)
+    run_parser.add_argument('--url', help="이미 실행 중인 서버 주소 (생략하면 모의 서버를 직접 실행)")
+    run_parser.add_argument('--server-pid', type=int, help="--url 사용 시 메모리를 측정할 서버 PID")
+    run_parser.add_argument('--concurrency', type=int, default=20, help="동시 클라이언트 수")
+    run_parser.add_argument('--duration', type=float, default=30, help="실행 시간 (초)")
+    run_parser.add_argument('--mix', default=DEFAULT_MIX, help=f"요청 비율 (기본 {DEFAULT_MIX})")
+    run_parser.add_argument('--sample-interval', type=float, default=1.0, help="RPS/메모리 기록 간격 (초)")
+    run_parser.add_argument('--output', help="결과 JSON 파일")
+
+    args = parser.parse_args()
+    if args.command == 'serve':
+        serve(args)
+    else:
+        run(args)
@@ -1,8 +1,9 @@
+import argparse
 import asyncio
-from naver_real_estate_crawler import NaverRealEstateCrawler
+from naver_real_estate_crawler import NaverRealEstateCrawler, configure_logging
 import time
 
-async def main():
+async def main(profile: bool = False):
     """메인 실행 함수"""
     print("=== 네이버 부동산 크롤러 ===")
     print("이 프로그램은 네이버 부동산에서 부동산 정보를 수집합니다.")
@@ -20,6 +21,15 @@ async def main():
         radius = 0.005
     
     crawler = NaverRealEstateCrawler()
+    timestamp = int(time.time())
+    
+    # --profile 지정 시 CPU/메모리 프로파일링
+    profiler = None
+    if profile:
+        from profiling import CrawlProfiler
+        profiler = CrawlProfiler()
+        profiler.attach(crawler.tracer)
+        profiler.start()
     
     try:
         print(f"\n크롤링 시작: 중심좌표 ({center_lat}, {center_lon}), 반경 {radius}")
@@ -32,7 +42,6 @@ async def main():
         data = await crawler.crawl_area(center_lat, center_lon, radius)
         
         # 결과 저장
-        timestamp = int(time.time())
         json_filename = f'naver_real_estate_data_{timestamp}.json'
         
         crawler.save_to_json(data, json_filename)
@@ -73,6 +82,16 @@ async def main():
         traceback.print_exc()
     finally:
         await crawler.close()
+        if profiler:
+            profiler.stop()
+            files = profiler.save(f'naver_real_estate_profile_{timestamp}')
+            print(profiler.summary())
+            print(f"프로파일 저장: {', '.join(files)}")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="네이버 부동산 크롤러 (대화형 실행)")
+    parser.add_argument('--profile', action='store_true', help="CPU/메모리 프로파일을 수집합니다")
+    args = parser.parse_args()
+    
+    configure_logging()
+    asyncio.run(main(profile=args.profile))
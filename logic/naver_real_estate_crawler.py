@@ -1,34 +1,132 @@
 import asyncio
+import codecs
 import json
+import math
 import time
-from typing import List, Dict, Optional
-from urllib.parse import urlencode
-import aiohttp
-import pandas as pd
-from playwright.async_api import async_playwright, Page, Browser
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, List, Dict, Optional, Sequence, Tuple
 import logging
+from tracing import Tracer
+from dedup import collapse_duplicates
+from json_stream import JsonItemParser
+from cortar_resolver import resolve_cortar_no
+import segment_sink
+from checkpoint import region_key
+from pipeline import Pipeline
+
+# pandas, Playwright, aiohttp는 가져오는 데 시간이 오래 걸리므로 처음 사용할 때 가져옴
+if TYPE_CHECKING:
+    import pandas as pd
 
-# 로깅 설정
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+def configure_logging(level: int = logging.INFO):
+    """
+    실행 스크립트용 로깅 설정
+    
+    모듈을 가져올 때는 로깅을 설정하지 않으므로, 라이브러리로 사용하는 쪽의 설정이 유지됩니다.
+    """
+    logging.basicConfig(level=level, format=LOG_FORMAT)
+
+# crawl_area 수집 단계 (뒤로 갈수록 요청이 많음)
+# markers: 단지 마커만 (요청 1회), details: + 단지 상세, articles: + 매물, full: + 개발계획
+CRAWL_DEPTHS = ['markers', 'details', 'articles', 'full']
+
+# 요청 수 집계용 엔드포인트 분류
+ENDPOINT_CLASSES = [
+    ('/api/complexes/single-markers', 'markers'),
+    ('/api/complexes/detail/', 'details'),
+    ('/api/articles/complex/', 'articles'),
+    ('/api/developmentplan/', 'plans'),
+    ('/api/cortars', 'cortars'),
+]
+
+# 매물 거래 타입
+TRADE_TYPES = {'A1': '매매', 'B1': '전세', 'B2': '월세'}
+
+def endpoint_class(url: str) -> str:
+    for prefix, name in ENDPOINT_CLASSES:
+        if prefix in url:
+            return name
+    return 'other'
+
+class UpstreamStatusError(Exception):
+    """네이버 부동산 API가 200이 아닌 상태 코드를 반환한 경우"""
+    
+    def __init__(self, status: int):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+
+class RequestPacer:
+    """
+    업스트림 요청 시작 간격 제한 (크롤러의 모든 단계가 공유)
+
+    요청마다 다음 시작 시각을 예약하므로(GCRA) 여러 단계에서 동시에 기다리는 요청도 1/rate 간격으로
+    차례로 시작합니다. burst개까지는 간격 없이 바로 시작할 수 있습니다.
+    """
+    
+    def __init__(self, requests_per_second: float, burst: int = 1):
+        if requests_per_second <= 0:
+            raise ValueError("requests_per_second는 0보다 커야 합니다")
+        self.interval = 1.0 / requests_per_second
+        self.burst = max(1, burst)
+        self._theoretical = time.monotonic()  # 다음 요청이 간격을 지켜 시작할 시각
+        
+    def reserve(self) -> float:
+        """요청 하나의 시작 시각을 예약하고 그때까지 기다릴 시간(초)을 반환"""
+        now = time.monotonic()
+        start = max(self._theoretical, now)
+        self._theoretical = start + self.interval
+        return max(0.0, start - (self.burst - 1) * self.interval - now)
+        
+    async def acquire(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
 class NaverRealEstateCrawler:
     """네이버 부동산 크롤러"""
     
-    def __init__(self):
+    def __init__(self, max_concurrency: int = 4, requests_per_second: Optional[float] = 2.0, burst: int = 2):
+        """
+        Args:
+            max_concurrency: 동시에 진행하는 업스트림 요청 수 상한 (생성 후 속성으로 바꿔도 다음 요청부터 적용)
+            requests_per_second: 모든 단계를 합친 업스트림 요청 시작 속도 상한 (None이면 제한 없음)
+            burst: 간격 없이 바로 시작할 수 있는 요청 수
+        """
         self.base_url = "https://new.land.naver.com"
         self.session = None
         self.browser = None
         self.page = None
+        self.tracer = Tracer()
+        self.request_counts: Dict[str, int] = {}  # 엔드포인트 분류별 업스트림 요청 수
+        self.stream_chunk_size = 64 * 1024  # 스트리밍 디코딩 시 읽기 단위 (바이트)
+        self.max_concurrency = max_concurrency
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_size = 0
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self._pacer: Optional[RequestPacer] = None
+        self.stage_concurrency = {'details': 1, 'articles': 1, 'normalize': 1}  # crawl_area 단계별 작업자 수
+        self.stage_queue_size = 64  # crawl_area 단계 사이 큐 크기 (싱크 큐는 16배)
+        self.pipeline_stats: Dict[str, Dict] = {}  # 마지막 crawl_area의 단계별 통계
+        self.archive = None  # raw_archive.RawArchive. 설정하면 업스트림 응답 본문을 보관
+        self.offline = False  # True이면 업스트림 대신 archive에서만 응답을 읽음
+        self.offline_as_of: Optional[float] = None  # 오프라인 모드에서 이 시각 이전 응답만 사용
+        self.detect_anomalies = True  # crawl_area 결과 매물에 anomalyFlags를 붙일지 여부 (anomaly.py)
         
     async def init_browser(self, headless: bool = True):
         """브라우저 초기화"""
-        playwright = await async_playwright().start()
-        self.browser = await playwright.chromium.launch(headless=headless)
-        context = await self.browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        )
-        self.page = await context.new_page()
+        from playwright.async_api import async_playwright
+        
+        with self.tracer.span('browser_launch', headless=headless):
+            playwright = await async_playwright().start()
+            self.browser = await playwright.chromium.launch(headless=headless)
+            context = await self.browser.new_context(
+                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+            )
+            self.page = await context.new_page()
         
     async def init_session(self):
         """HTTP 세션 초기화 - 브라우저를 통해 쿠키와 헤더 설정"""
@@ -37,15 +135,18 @@ class NaverRealEstateCrawler:
             await self.init_browser(headless=True)
             
         # 네이버 부동산 사이트 방문
-        await self.page.goto("https://new.land.naver.com/complexes?ms=37.3642443,127.1084674,16&a=APT:ABYG:JGC:PRE&e=RETAIL")
-        await self.page.wait_for_load_state("networkidle")
-        await asyncio.sleep(2)  # 페이지 완전 로드 대기
+        with self.tracer.span('page_navigation'):
+            await self.page.goto("https://new.land.naver.com/complexes?ms=37.3642443,127.1084674,16&a=APT:ABYG:JGC:PRE&e=RETAIL")
+            await self.page.wait_for_load_state("networkidle")
+            await asyncio.sleep(2)  # 페이지 완전 로드 대기
         
         # 쿠키 및 User-Agent 가져오기
-        context = self.page.context
-        cookies = await context.cookies()
-        cookie_dict = {cookie['name']: cookie['value'] for cookie in cookies}
-        user_agent = await self.page.evaluate("navigator.userAgent")
+        with self.tracer.span('cookie_harvest') as span:
+            context = self.page.context
+            cookies = await context.cookies()
+            cookie_dict = {cookie['name']: cookie['value'] for cookie in cookies}
+            user_agent = await self.page.evaluate("navigator.userAgent")
+            span.set('cookie_count', len(cookies))
         
         # HTTP 세션 생성
         headers = {
@@ -60,6 +161,8 @@ class NaverRealEstateCrawler:
             'Sec-Fetch-Site': 'same-origin'
         }
         
+        import aiohttp
+        
         connector = aiohttp.TCPConnector(ssl=False)
         timeout = aiohttp.ClientTimeout(total=30)
         
@@ -72,14 +175,163 @@ class NaverRealEstateCrawler:
         
         logger.info(f"세션 초기화 완료 (쿠키: {len(cookies)}개)")
         
+    @property
+    def _request_slots(self) -> asyncio.Semaphore:
+        """
+        업스트림 요청 동시 실행 제한
+
+        처음 요청할 때 만들고, max_concurrency가 바뀌면 새 크기로 다시 만듭니다 (진행 중인 요청은 이전 제한을 유지).
+        """
+        if self._slots is None or self._slots_size != self.max_concurrency:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+            self._slots_size = self.max_concurrency
+        return self._slots
+        
+    async def _pace(self):
+        """전역 요청 간격 제한 (requests_per_second나 burst가 바뀌면 새 설정으로 다시 만듦)"""
+        if not self.requests_per_second:
+            return
+        if (self._pacer is None or self._pacer.interval != 1.0 / self.requests_per_second
+                or self._pacer.burst != max(1, self.burst)):
+            self._pacer = RequestPacer(self.requests_per_second, self.burst)
+        await self._pacer.acquire()
+        
+    def _count_request(self, url: str):
+        name = endpoint_class(url)
+        self.request_counts[name] = self.request_counts.get(name, 0) + 1
+        
+    def _archived(self, endpoint: str, params: Optional[Dict]) -> Optional[str]:
+        """오프라인 모드에서 요청에 해당하는 보관소 본문의 해시"""
+        if self.archive is None:
+            raise RuntimeError("오프라인 모드에는 archive(raw_archive.RawArchive)가 필요합니다")
+        return self.archive.lookup(endpoint, params, self.offline_as_of)
         
+    async def _pause(self, seconds: float):
+        """요청 간격 조절 (오프라인 재처리에서는 대기하지 않음)"""
+        if not self.offline:
+            await asyncio.sleep(seconds)
+        
+    async def _get_json(self, url: str, params: Optional[Dict] = None):
+        """
+        GET 요청 후 JSON 응답을 디코딩합니다.
+        
+        응답 크기와 JSON 디코딩 시간을 span으로 기록하며, (상태 코드, 데이터)를 반환합니다.
+        상태 코드가 200이 아니면 데이터는 None입니다. archive가 설정되어 있으면 본문을 보관소에 저장하고,
+        오프라인 모드에서는 보관소에서 읽습니다 (보관된 응답이 없으면 404).
+        """
+        endpoint = url[len(self.base_url):] if url.startswith(self.base_url) else url
+        if self.offline:
+            digest = self._archived(endpoint, params)
+            if digest is None:
+                return 404, None
+            with self.tracer.span('archive_read', endpoint=endpoint) as span:
+                body = self.archive.get(digest)
+                span.set('response_bytes', len(body))
+                with self.tracer.span('json_decode', bytes=len(body)):
+                    return 200, json.loads(body)
+                    
+        self._count_request(endpoint)
+        async with self._request_slots:
+            await self._pace()
+            with self.tracer.span('http_get', endpoint=endpoint) as span:
+                async with self.session.get(url, params=params) as response:
+                    span.set('status', response.status)
+                    if response.status != 200:
+                        return response.status, None
+                    body = await response.read()
+                span.set('response_bytes', len(body))
+                if self.archive is not None:
+                    await self.archive.put_async(endpoint, params, body)
+                with self.tracer.span('json_decode', bytes=len(body)) as decode_span:
+                    data = json.loads(body)
+                span.set('json_decode_ms', round(decode_span.duration_ms, 3))
+        return response.status, data
+        
+    async def _iter_json(self, url: str, params: Optional[Dict], *patterns: str) -> AsyncIterator[Dict]:
+        """
+        GET 응답 본문을 조각 단위로 파싱하여 경로에 일치하는 레코드를 완성되는 대로 돌려줍니다.
+        
+        전체 본문을 버퍼링하지 않으므로 큰 응답에서도 메모리 사용량이 레코드 하나 분량으로 유지됩니다.
+        상태 코드가 200이 아니면 UpstreamStatusError를 발생시킵니다. archive가 설정되어 있으면 받은 조각을
+        그대로 보관소에 압축 기록하고, 오프라인 모드에서는 보관소 본문을 조각 단위로 읽습니다.
+        
+        Args:
+            url: 요청 URL
+            params: 쿼리 파라미터
+            *patterns: 추출할 JSON 경로 (예: 'item', 'articleList.item')
+        """
+        endpoint = url[len(self.base_url):] if url.startswith(self.base_url) else url
+        if self.offline:
+            digest = self._archived(endpoint, params)
+            if digest is None:
+                raise UpstreamStatusError(404)
+            with self.tracer.span('archive_read', endpoint=endpoint, stream=True) as span:
+                async for item in self._parse_chunks(self._archive_chunks(digest), patterns, span):
+                    yield item
+            return
+            
+        self._count_request(endpoint)
+        async with self._request_slots:
+            await self._pace()
+            with self.tracer.span('http_get', endpoint=endpoint, stream=True) as span:
+                async with self.session.get(url, params=params) as response:
+                    span.set('status', response.status)
+                    if response.status != 200:
+                        raise UpstreamStatusError(response.status)
+                    
+                    writer = await self.archive.async_writer() if self.archive is not None else None
+                    try:
+                        chunks = response.content.iter_chunked(self.stream_chunk_size)
+                        async for item in self._parse_chunks(chunks, patterns, span, writer):
+                            yield item
+                    except BaseException:
+                        if writer:
+                            writer.discard()
+                        raise
+                    if writer:
+                        await writer.commit(endpoint, params)
+                        
+    async def _archive_chunks(self, digest: str) -> AsyncIterator[bytes]:
+        for chunk in self.archive.iter_chunks(digest, self.stream_chunk_size):
+            yield chunk
+            
+    async def _parse_chunks(self, chunks: AsyncIterator[bytes], patterns: Tuple[str, ...], span,
+                            writer=None) -> AsyncIterator[Dict]:
+        """본문 조각을 증분 파싱하여 레코드를 돌려주고 수신 크기/디코딩 시간을 span에 기록"""
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        parser = JsonItemParser(*patterns)
+        received = records = decode_ns = 0
+        while True:
+            chunk = await anext(chunks, None)
+            final = chunk is None
+            chunk = chunk or b''
+            received += len(chunk)
+            if writer and chunk:
+                await writer.write(chunk)
+            
+            started = time.perf_counter_ns()
+            items = parser.feed(decoder.decode(chunk, final=final), final=final)
+            decode_ns += time.perf_counter_ns() - started
+            
+            for _, item in items:
+                if not records:
+                    span.set('first_record_ms', round(span.duration_ms, 3))
+                records += 1
+                yield item
+            if final:
+                break
+        span.set('response_bytes', received)
+        span.set('records', records)
+        span.set('json_decode_ms', round(decode_ns / 1_000_000, 3))
+            
     async def get_complexes_data(self, 
                                left_lon: float, 
                                right_lon: float, 
                                top_lat: float, 
                                bottom_lat: float,
                                real_estate_type: str = "APT:ABYG:JGC:PRE",
-                               price_type: str = "RETAIL") -> List[Dict]:
+                               price_type: str = "RETAIL",
+                               cortar_no: Optional[str] = None) -> List[Dict]:
         """
         부동산 단지 정보를 가져옵니다.
         
@@ -90,10 +342,36 @@ class NaverRealEstateCrawler:
             bottom_lat: 아래쪽 위도
             real_estate_type: 부동산 타입 (APT:아파트, ABYG:아파트분양권, JGC:재건축, PRE:분양권)
             price_type: 가격 타입 (RETAIL:매매, RENT:전세, MONTHLY:월세)
+            cortar_no: 법정동 코드 (생략하면 영역 중심의 법정동을 로컬 경계 데이터에서 조회)
         """
+        try:
+            data = [complex_data async for complex_data in self.iter_complexes_data(
+                left_lon, right_lon, top_lat, bottom_lat, real_estate_type, price_type, cortar_no
+            )]
+            logger.debug(f"단지 정보 {len(data)}개 수집 완료")
+            return data
+        except UpstreamStatusError as e:
+            logger.error(f"API 요청 실패: {e.status}")
+            return []
+        except Exception as e:
+            logger.error(f"단지 정보 수집 중 오류: {e}")
+            return []
+            
+    async def iter_complexes_data(self,
+                                  left_lon: float,
+                                  right_lon: float,
+                                  top_lat: float,
+                                  bottom_lat: float,
+                                  real_estate_type: str = "APT:ABYG:JGC:PRE",
+                                  price_type: str = "RETAIL",
+                                  cortar_no: Optional[str] = None) -> AsyncIterator[Dict]:
+        """
+        부동산 단지 정보를 응답이 도착하는 대로 하나씩 돌려줍니다.
         
+        인자는 get_complexes_data와 같습니다. 오류는 호출자에게 그대로 전달됩니다.
+        """
         params = {
-            'cortarNo': '4113510300',  # 지역코드 (강남구)
+            'cortarNo': cortar_no or resolve_cortar_no(left_lon, right_lon, top_lat, bottom_lat),
             'zoom': '16',
             'priceType': price_type,
             'markerId': '',
@@ -128,18 +406,8 @@ class NaverRealEstateCrawler:
         
         url = f"{self.base_url}/api/complexes/single-markers/2.0"
         
-        try:
-            async with self.session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    logger.info(f"단지 정보 {len(data)}개 수집 완료")
-                    return data
-                else:
-                    logger.error(f"API 요청 실패: {response.status}")
-                    return []
-        except Exception as e:
-            logger.error(f"단지 정보 수집 중 오류: {e}")
-            return []
+        async for complex_data in self._iter_json(url, params, 'item'):
+            yield complex_data
             
     async def get_complex_detail(self, complex_no: str) -> Optional[Dict]:
         """
@@ -151,14 +419,13 @@ class NaverRealEstateCrawler:
         url = f"{self.base_url}/api/complexes/detail/{complex_no}"
         
         try:
-            async with self.session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    logger.info(f"단지 {complex_no} 상세 정보 수집 완료")
-                    return data
-                else:
-                    logger.error(f"단지 상세 정보 요청 실패: {response.status}")
-                    return None
+            status, data = await self._get_json(url)
+            if status == 200:
+                logger.debug(f"단지 {complex_no} 상세 정보 수집 완료")
+                return data
+            else:
+                logger.error(f"단지 상세 정보 요청 실패: {status}")
+                return None
         except Exception as e:
             logger.error(f"단지 상세 정보 수집 중 오류: {e}")
             return None
@@ -171,6 +438,23 @@ class NaverRealEstateCrawler:
             complex_no: 단지 번호
             trade_type: 거래 타입 (A1:매매, B1:전세, B2:월세)
         """
+        try:
+            articles = [article async for article in self.iter_complex_articles(complex_no, trade_type)]
+            logger.debug(f"단지 {complex_no} 매물 정보 {len(articles)}개 수집 완료")
+            return articles
+        except UpstreamStatusError as e:
+            logger.error(f"매물 정보 요청 실패: {e.status}")
+            return []
+        except Exception as e:
+            logger.error(f"매물 정보 수집 중 오류: {e}")
+            return []
+            
+    async def iter_complex_articles(self, complex_no: str, trade_type: str = "A1") -> AsyncIterator[Dict]:
+        """
+        단지의 매물 정보를 응답이 도착하는 대로 하나씩 돌려줍니다.
+        
+        인자는 get_complex_articles와 같습니다. 오류는 호출자에게 그대로 전달됩니다.
+        """
         params = {
             'complexNo': complex_no,
             'tradeType': trade_type,
@@ -180,20 +464,8 @@ class NaverRealEstateCrawler:
         
         url = f"{self.base_url}/api/articles/complex/{complex_no}"
         
-        try:
-            async with self.session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    logger.info(data)  # 디버깅용
-                    articles = data.get('articleList', [])
-                    logger.info(f"단지 {complex_no} 매물 정보 {len(articles)}개 수집 완료")
-                    return articles
-                else:
-                    logger.error(f"매물 정보 요청 실패: {response.status}")
-                    return []
-        except Exception as e:
-            logger.error(f"매물 정보 수집 중 오류: {e}")
-            return []
+        async for article in self._iter_json(url, params, 'articleList.item'):
+            yield article
             
     async def get_development_plans(self, 
                                   left_lon: float, 
@@ -222,14 +494,13 @@ class NaverRealEstateCrawler:
         url = f"{self.base_url}/api/developmentplan/{plan_type}/list"
         
         try:
-            async with self.session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    logger.info(f"{plan_type} 개발계획 정보 {len(data)}개 수집 완료")
-                    return data
-                else:
-                    logger.error(f"개발계획 정보 요청 실패: {response.status}")
-                    return []
+            status, data = await self._get_json(url, params)
+            if status == 200:
+                logger.debug(f"{plan_type} 개발계획 정보 {len(data)}개 수집 완료")
+                return data
+            else:
+                logger.error(f"개발계획 정보 요청 실패: {status}")
+                return []
         except Exception as e:
             logger.error(f"개발계획 정보 수집 중 오류: {e}")
             return []
@@ -237,7 +508,12 @@ class NaverRealEstateCrawler:
     async def crawl_area(self, 
                         center_lat: float, 
                         center_lon: float, 
-                        radius: float = 0.01) -> Dict:
+                        radius: float = 0.01,
+                        dedupe: bool = True,
+                        sink=None,
+                        checkpoint=None,
+                        depth: str = "full",
+                        trade_types: Sequence[str] = ("A1",)) -> Dict:
         """
         특정 지역의 부동산 정보를 종합적으로 크롤링합니다.
         
@@ -245,100 +521,495 @@ class NaverRealEstateCrawler:
             center_lat: 중심 위도
             center_lon: 중심 경도
             radius: 반경 (도 단위)
+            dedupe: 여러 중개사가 올린 동일 매물을 하나로 합칠지 여부
+            sink: 레코드를 받을 싱크. segment_sink.SegmentSink를 전달하면 레코드를 디스크 세그먼트에
+                  바로 기록하고 결과 대신 매니페스트를 반환합니다. 생략하면 결과를 메모리에 모아 반환합니다.
+            checkpoint: checkpoint.CrawlCheckpoint. 전달하면 완료된 작업 단위(마커, 상세, 매물, 개발계획)를
+                        기록하고, 이미 완료된 단위는 요청 없이 기록된 결과를 사용합니다.
+            depth: 수집 단계 (CRAWL_DEPTHS). markers는 단지 마커만, details는 단지 상세까지,
+                   articles는 매물까지, full은 개발계획까지 수집합니다.
+            trade_types: 수집할 매물 거래 타입 (TRADE_TYPES). 단지마다 상세 정보와 모든 거래 타입의
+                         매물을 동시에 요청하며(동시 요청 수는 max_concurrency로 제한), 매물은 거래 타입
+                         (tradeTypeCode)을 표시하여 단지별 목록 하나로 합칩니다.
+                   
+        결과의 'cost'에는 수집 단계와 엔드포인트 분류별 실제 업스트림 요청 수가 기록됩니다.
+        메모리 싱크 결과의 매물에는 의심 매물 표시(anomalyFlags)가 붙고 'anomalies'에 플래그별 매물 수가
+        기록됩니다 (detect_anomalies=False로 끌 수 있음).
         """
-        logger.info(f"지역 크롤링 시작: ({center_lat}, {center_lon})")
+        if depth not in CRAWL_DEPTHS:
+            raise ValueError(f"지원하지 않는 수집 단계: {depth}")
+        unknown = [trade_type for trade_type in trade_types if trade_type not in TRADE_TYPES]
+        if unknown:
+            raise ValueError(f"지원하지 않는 거래 타입: {', '.join(unknown)}")
+        level = CRAWL_DEPTHS.index(depth)
+        with_details, with_articles, with_plans = level >= 1, level >= 2, level >= 3
+        
+        if sink is None:
+            sink = segment_sink.MemorySink()
+        counts_before = dict(self.request_counts)
+            
+        with self.tracer.span('crawl_area', center_lat=center_lat, center_lon=center_lon, radius=radius, depth=depth):
+            logger.info(f"지역 크롤링 시작: ({center_lat}, {center_lon})")
         
-        # 좌표 범위 계산
-        left_lon = center_lon - radius
-        right_lon = center_lon + radius
-        top_lat = center_lat + radius
-        bottom_lat = center_lat - radius
+            # 좌표 범위 계산
+            left_lon = center_lon - radius
+            right_lon = center_lon + radius
+            top_lat = center_lat + radius
+            bottom_lat = center_lat - radius
         
-        result = {
-            'area_info': {
+            cortar_no = resolve_cortar_no(left_lon, right_lon, top_lat, bottom_lat)
+        
+            sink.area_info = {
                 'center_lat': center_lat,
                 'center_lon': center_lon,
+                'cortar_no': cortar_no,
+                'trade_types': list(trade_types),
                 'bounds': {
                     'left_lon': left_lon,
                     'right_lon': right_lon,
                     'top_lat': top_lat,
                     'bottom_lat': bottom_lat
                 }
-            },
-            'complexes': [],
-            'complex_details': {},
-            'articles': {},
-            'development_plans': {
-                'road': [],
-                'rail': [],
-                'jigu': []
             }
-        }
-        
-        # 1. 단지 정보 수집
-        complexes = await self.get_complexes_data(left_lon, right_lon, top_lat, bottom_lat)
-        result['complexes'] = complexes
         
-        # 2. 각 단지의 상세 정보 및 매물 정보 수집 (최대 5개)
-        for i, complex_data in enumerate(complexes[:5]):  # 처리량 제한
-            if 'markerId' in complex_data:
-                complex_no = complex_data['markerId']
-                
-                # 단지 상세 정보
-                detail = await self.get_complex_detail(complex_no)
+            key = region_key(center_lat, center_lon, radius)
+            markers_unit = f"markers:{key}"
+            plan_types = ['road', 'rail', 'jigu'] if with_plans else []
+            if checkpoint and plan_types:
+                checkpoint.add_frontier(f"plans:{key}:{plan_type}" for plan_type in plan_types)
+            
+            pipe = Pipeline()
+            
+            async def dispatch(complex_no: str):
+                """상세/매물 수집 대상 단지를 체크포인트에 기록하고 다음 단계로 넘김"""
+                if checkpoint:
+                    checkpoint.add_frontier(
+                        [f"detail:{complex_no}"]
+                        + [f"articles:{complex_no}:{trade_type}" for trade_type in trade_types if with_articles]
+                    )
+                await pipe.put('details', complex_no)
+                if with_articles:
+                    await pipe.put('articles', complex_no)
+            
+            # 1. 단지 정보 수집 (도착하는 대로 싱크로 넘기고 상세 수집 대상 번호만 다음 단계로 전달)
+            async def discover_markers(_):
+                if checkpoint and checkpoint.is_done(markers_unit):
+                    markers = checkpoint.payload(markers_unit)
+                    for complex_data in markers['complexes']:
+                        await pipe.put('sink', ('complexes', complex_data, None))
+                    for complex_no in markers['complex_nos'] if with_details else []:
+                        await dispatch(complex_no)
+                    return
+                    
+                complexes = [] if checkpoint else None
+                complex_nos = []
+                try:
+                    async for complex_data in self.iter_complexes_data(
+                        left_lon, right_lon, top_lat, bottom_lat, cortar_no=cortar_no
+                    ):
+                        await pipe.put('sink', ('complexes', complex_data, None))
+                        if complexes is not None:
+                            complexes.append(complex_data)
+                        if 'markerId' in complex_data and len(complex_nos) < 5:  # 처리량 제한 (최대 5개)
+                            complex_nos.append(complex_data['markerId'])
+                            if with_details:
+                                await dispatch(complex_data['markerId'])
+                    if checkpoint:
+                        checkpoint.complete(markers_unit, {'complexes': complexes, 'complex_nos': complex_nos})
+                except UpstreamStatusError as e:
+                    logger.error(f"API 요청 실패: {e.status}")
+                except Exception as e:
+                    logger.error(f"단지 정보 수집 중 오류: {e}")
+                        
+            # 2. 단지 상세 정보 수집
+            async def fetch_detail(complex_no: str):
+                detail, fetched = await self._run_unit(
+                    checkpoint, f"detail:{complex_no}", lambda: self.get_complex_detail(complex_no)
+                )
                 if detail:
-                    result['complex_details'][complex_no] = detail
-                
-                # 매물 정보 (매매)
-                articles = await self.get_complex_articles(complex_no, "A1")
+                    await pipe.put('sink', ('complex_details', detail, complex_no))
+                if fetched:
+                    await self._pause(1)  # 요청 간격 조절 (체크포인트에서 복원한 단지는 대기하지 않음)
+                    
+            # 3. 매물 정보 수집 (단지 안에서는 거래 타입별로 동시에 요청)
+            async def fetch_articles(complex_no: str):
+                results = await asyncio.gather(*(
+                    self._run_unit(checkpoint, f"articles:{complex_no}:{trade_type}",
+                                   lambda trade_type=trade_type: self.get_complex_articles(complex_no, trade_type))
+                    for trade_type in trade_types
+                ))
+                await pipe.put('normalize', (complex_no, [articles for articles, _ in results]))
+                if any(fetched for _, fetched in results):
+                    await self._pause(1)
+                    
+            # 4. 매물 정리: 거래 타입 표시 후 거래 타입 순서대로 합치고 중복 매물 병합
+            async def normalize_articles(item):
+                complex_no, results = item
+                articles = [
+                    {**article, 'tradeTypeCode': article.get('tradeTypeCode') or trade_type}
+                    for trade_type, trade_articles in zip(trade_types, results)
+                    for article in trade_articles or []
+                ]
+                if articles and dedupe:
+                    collapsed = collapse_duplicates(complex_no, articles)
+                    logger.debug(f"단지 {complex_no} 중복 매물 {len(articles) - len(collapsed)}개 병합")
+                    articles = collapsed
                 if articles:
-                    result['articles'][complex_no] = articles
+                    await pipe.put('sink', ('articles', articles, complex_no))
+                    
+            # 개발계획 정보 수집
+            async def fetch_plans(plan_type: str):
+                plans, fetched = await self._run_unit(
+                    checkpoint, f"plans:{key}:{plan_type}",
+                    lambda: self.get_development_plans(left_lon, right_lon, top_lat, bottom_lat, plan_type)
+                )
+                await pipe.put('sink', (f'development_plans.{plan_type}', plans or [], None))
+                if fetched:
+                    await self._pause(0.5)
                     
-                # 요청 간격 조절
-                await asyncio.sleep(1)  # 더 긴 대기 시간
+            # 5. 싱크 기록 (메모리 싱크가 아니면 이벤트 루프를 막지 않도록 스레드에서 기록)
+            def write_batch(batch):
+                for section, value, record_key in batch:
+                    if section == 'complexes' or section == 'complex_details':
+                        sink.write(section, value, key=record_key)
+                    else:
+                        sink.write_many(section, value, key=record_key)
+                        
+            async def write_sink(batch):
+                if isinstance(sink, segment_sink.MemorySink):
+                    write_batch(batch)
+                else:
+                    await asyncio.to_thread(write_batch, batch)
+            
+            concurrency = self.stage_concurrency
+            queue_size = self.stage_queue_size
+            pipe.stage('markers', discover_markers)
+            pipe.stage('plans', fetch_plans, queue_size=queue_size)
+            pipe.stage('details', fetch_detail, concurrency=concurrency['details'], queue_size=queue_size)
+            pipe.stage('articles', fetch_articles, concurrency=concurrency['articles'], queue_size=queue_size)
+            pipe.stage('normalize', normalize_articles, concurrency=concurrency['normalize'], queue_size=queue_size)
+            pipe.stage('sink', write_sink, concurrency=1, queue_size=queue_size * 16, batch=256)
+            self.pipeline_stats = await pipe.run({'markers': [None], 'plans': plan_types})
+            
+            logger.info("지역 크롤링 완료")
+            
+        result = sink.close()
+        requests = {name: count - counts_before.get(name, 0) for name, count in self.request_counts.items()
+                    if count > counts_before.get(name, 0)}
+        result['cost'] = {'depth': depth, 'requests': requests, 'total': sum(requests.values())}
+        result['pipeline'] = self.pipeline_stats
+        await self._annotate_anomalies(result)
+        return result
+        
+    async def _annotate_anomalies(self, result: Dict):
+        """메모리 결과의 매물에 anomalyFlags를 붙이고 result['anomalies']에 플래그별 매물 수를 기록"""
+        if self.detect_anomalies and not segment_sink.is_manifest(result) and result.get('articles'):
+            # 결과 전체의 단지별 통계로 판단하므로 수집이 끝난 뒤 한 번에 계산 (pandas는 이때 가져옴)
+            from anomaly import annotate_anomalies
+            with self.tracer.span('detect_anomalies'):
+                result['anomalies'] = await asyncio.to_thread(annotate_anomalies, result)
+        
+    async def crawl_regions(self,
+                            regions: List[Dict],
+                            dedupe: bool = True,
+                            checkpoint=None,
+                            depth: str = "full",
+                            trade_types: Sequence[str] = ("A1",)) -> Dict[str, Dict]:
+        """
+        여러 지역을 순서대로 크롤링합니다.
+        
+        checkpoint를 전달하면 전체 지역 목록을 먼저 기록하고 지역별 작업 단위를 이어서 기록하므로,
+        중단 후 같은 체크포인트로 다시 실행하면 완료된 단위는 건너뛰고 남은 작업만 요청합니다.
+        
+        Args:
+            regions: [{'center_lat': ..., 'center_lon': ..., 'radius': ...}, ...]
+            dedupe: 여러 중개사가 올린 동일 매물을 하나로 합칠지 여부
+            checkpoint: checkpoint.CrawlCheckpoint
+            depth: 수집 단계 (CRAWL_DEPTHS)
+            trade_types: 수집할 매물 거래 타입 (TRADE_TYPES)
+            
+        Returns:
+            {지역 키: crawl_area 결과}
+        """
+        keys = [region_key(r['center_lat'], r['center_lon'], r.get('radius', 0.01)) for r in regions]
+        if checkpoint:
+            checkpoint.add_frontier(f"region:{key}" for key in keys)
+            
+        results = {}
+        for key, region in zip(keys, regions):
+            results[key] = await self.crawl_area(
+                region['center_lat'], region['center_lon'], region.get('radius', 0.01),
+                dedupe=dedupe, checkpoint=checkpoint, depth=depth,
+                trade_types=trade_types
+            )
+            if checkpoint and not checkpoint.is_done(f"region:{key}"):
+                checkpoint.complete(f"region:{key}")
+        return results
+        
+    async def capture_area(self,
+                           center_lat: float,
+                           center_lon: float,
+                           radius: float = 0.01,
+                           dedupe: bool = True,
+                           trade_types: Sequence[str] = ("A1",),
+                           zoom: int = 16,
+                           tile_span: float = 0.01,
+                           open_complexes: int = 5,
+                           settle: float = 1.0) -> Dict:
+        """
+        지도 페이지를 직접 조작하며 앱이 스스로 보내는 API 응답을 수집합니다. (캡처 모드)
+        
+        영역을 tile_span 간격의 격자로 나눠 각 칸으로 지도를 이동하고, 발견한 단지 중 open_complexes개는
+        단지 페이지를 열어 상세/매물 응답까지 받습니다. page.on("response")로 new.land.naver.com의
+        /api/ JSON 응답을 모두 받아 분류하므로 화면 하나를 열 때마다 마커, 개발계획, 상세, 매물이 함께
+        수집되며, 직접 API 호출이 차단되는 상황에서도 브라우저가 보내는 요청이라 그대로 동작합니다.
+        aiohttp 세션(init_session)은 필요 없고 init_browser만 호출하면 됩니다.
+        
+        Args:
+            center_lat, center_lon, radius, dedupe, trade_types: crawl_area와 같음
+            zoom: 지도 확대 수준
+            tile_span: 지도를 이동할 격자 간격 (도 단위, zoom 16 화면 하나 정도)
+            open_complexes: 상세/매물을 받기 위해 열어볼 단지 수
+            settle: 페이지 로드 후 늦게 도착하는 응답을 기다리는 시간 (초)
+            
+        Returns:
+            crawl_area와 같은 구조의 결과. 'capture'에 방문한 페이지 수, 분류별 응답 수/바이트, 소요 시간이 기록됩니다.
+        """
+        from urllib.parse import parse_qsl, urlsplit
+        
+        unknown = [trade_type for trade_type in trade_types if trade_type not in TRADE_TYPES]
+        if unknown:
+            raise ValueError(f"지원하지 않는 거래 타입: {', '.join(unknown)}")
+        if not self.page:
+            await self.init_browser(headless=True)
+            
+        left_lon, right_lon = center_lon - radius, center_lon + radius
+        top_lat, bottom_lat = center_lat + radius, center_lat - radius
+        host = urlsplit(self.base_url).netloc
+        captured: List[Tuple[str, str, Any]] = []  # (분류, 경로, 데이터)
+        pending: List[asyncio.Future] = []
+        responses: Dict[str, int] = {}
+        response_bytes: Dict[str, int] = {}
+        
+        async def harvest(response):
+            url = urlsplit(response.url)
+            endpoint = url.path + (f"?{url.query}" if url.query else '')
+            name = endpoint_class(url.path)
+            try:
+                body = await response.body()
+                data = json.loads(body)
+            except Exception as e:
+                logger.debug(f"응답 수집 실패 {url.path}: {e}")
+                return
+            responses[name] = responses.get(name, 0) + 1
+            response_bytes[name] = response_bytes.get(name, 0) + len(body)
+            if self.archive is not None:
+                await self.archive.put_async(url.path, dict(parse_qsl(url.query)) or None, body)
+            captured.append((name, url.path, data))
+            
+        def on_response(response):
+            url = urlsplit(response.url)
+            if url.netloc == host and url.path.startswith('/api/') and response.ok:
+                pending.append(asyncio.ensure_future(harvest(response)))
                 
-        # 3. 개발계획 정보 수집
-        for plan_type in ['road', 'rail', 'jigu']:
-            plans = await self.get_development_plans(left_lon, right_lon, top_lat, bottom_lat, plan_type)
-            result['development_plans'][plan_type] = plans
-            await asyncio.sleep(0.5)
+        filters = "a=APT:ABYG:JGC:PRE&e=RETAIL&b=" + ":".join(trade_types)
+        
+        async def visit(path: str, lat: float, lon: float):
+            await self._pace()  # 페이지 이동도 전역 요청 간격 제한을 따름
+            with self.tracer.span('capture_page', path=path):
+                await self.page.goto(f"{self.base_url}{path}?ms={lat},{lon},{zoom}&{filters}")
+                await self.page.wait_for_load_state("networkidle")
+                await asyncio.sleep(settle)
+                
+        steps_lat = max(1, math.ceil(2 * radius / tile_span))
+        steps_lon = max(1, math.ceil(2 * radius / tile_span))
+        tiles = [
+            (bottom_lat + (i + 0.5) * 2 * radius / steps_lat, left_lon + (j + 0.5) * 2 * radius / steps_lon)
+            for i in range(steps_lat) for j in range(steps_lon)
+        ]
+        
+        started = time.perf_counter()
+        pages = 0
+        self.page.on("response", on_response)
+        try:
+            with self.tracer.span('capture_area', center_lat=center_lat, center_lon=center_lon, radius=radius):
+                logger.info(f"캡처 모드 크롤링 시작: ({center_lat}, {center_lon}), 지도 {len(tiles)}칸")
+                for lat, lon in tiles:
+                    await visit("/complexes", lat, lon)
+                    pages += 1
+                    
+                await asyncio.gather(*pending)
+                opened = []
+                for name, _, data in list(captured):
+                    if name != 'markers' or not isinstance(data, list):
+                        continue
+                    for marker in data:
+                        complex_no = marker.get('markerId')
+                        if complex_no and complex_no not in opened and len(opened) < open_complexes:
+                            opened.append(complex_no)
+                            await visit(f"/complexes/{complex_no}", marker.get('latitude', center_lat),
+                                        marker.get('longitude', center_lon))
+                            pages += 1
+                await asyncio.gather(*pending)
+        finally:
+            self.page.remove_listener("response", on_response)
             
-        logger.info("지역 크롤링 완료")
+        # 분류별로 crawl_area 결과 구조로 조립 (같은 응답을 여러 번 받은 경우 키 기준으로 한 번만 사용)
+        complexes: Dict[str, Dict] = {}
+        details: Dict[str, Dict] = {}
+        articles: Dict[str, Dict[str, Dict]] = {}
+        plans: Dict[str, Dict[str, Dict]] = {'road': {}, 'rail': {}, 'jigu': {}}
+        for name, path, data in captured:
+            if name == 'markers' and isinstance(data, list):
+                for marker in data:
+                    in_area = (bottom_lat <= marker.get('latitude', center_lat) <= top_lat
+                               and left_lon <= marker.get('longitude', center_lon) <= right_lon)
+                    if marker.get('markerId') and in_area:
+                        complexes[str(marker['markerId'])] = marker
+            elif name == 'details' and isinstance(data, dict):
+                details[path.rstrip('/').rsplit('/', 1)[-1]] = data
+            elif name == 'articles' and isinstance(data, dict):
+                complex_articles = articles.setdefault(path.rstrip('/').rsplit('/', 1)[-1], {})
+                for article in data.get('articleList') or []:
+                    if article.get('tradeTypeCode') in trade_types:
+                        complex_articles[str(article.get('articleNo'))] = article
+            elif name == 'plans' and isinstance(data, list):
+                plan_type = path.split('/')[3] if path.count('/') >= 3 else None
+                if plan_type in plans:
+                    for plan in data:
+                        plans[plan_type][json.dumps(plan, sort_keys=True, ensure_ascii=False)] = plan
+                        
+        result = {
+            'area_info': {
+                'center_lat': center_lat,
+                'center_lon': center_lon,
+                'cortar_no': resolve_cortar_no(left_lon, right_lon, top_lat, bottom_lat),
+                'trade_types': list(trade_types),
+                'bounds': {'left_lon': left_lon, 'right_lon': right_lon, 'top_lat': top_lat, 'bottom_lat': bottom_lat},
+            },
+            'complexes': list(complexes.values()),
+            'complex_details': details,
+            'articles': {},
+            'development_plans': {plan_type: list(values.values()) for plan_type, values in plans.items()},
+        }
+        for complex_no, by_no in articles.items():
+            complex_articles = list(by_no.values())
+            if complex_articles and dedupe:
+                complex_articles = collapse_duplicates(complex_no, complex_articles)
+            if complex_articles:
+                result['articles'][complex_no] = complex_articles
+                
+        result['capture'] = {
+            'pages': pages,
+            'responses': responses,
+            'response_bytes': response_bytes,
+            'elapsed_s': round(time.perf_counter() - started, 3),
+        }
+        logger.info(f"캡처 모드 크롤링 완료: 페이지 {pages}개, 응답 {sum(responses.values())}개")
+        await self._annotate_anomalies(result)
         return result
         
+    @staticmethod
+    async def _run_unit(checkpoint, unit: str, fetch: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        체크포인트에 완료된 작업 단위면 기록된 결과를, 아니면 fetch 결과를 반환합니다.
+        결과가 비어 있으면(요청 실패 포함) 완료로 기록하지 않아 재시작 시 다시 요청합니다.
+        
+        Returns:
+            (결과, 실제 요청 여부)
+        """
+        if checkpoint and checkpoint.is_done(unit):
+            return checkpoint.payload(unit), False
+        value = await fetch()
+        if checkpoint and value:
+            checkpoint.complete(unit, value)
+        return value, True
+        
     def save_to_json(self, data: Dict, filename: str):
         """데이터를 JSON 파일로 저장"""
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        with self.tracer.span('save_to_json', filename=filename):
+            if segment_sink.is_manifest(data):
+                segment_sink.write_json(data, filename)
+            else:
+                with open(filename, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
         logger.info(f"데이터를 {filename}에 저장 완료")
         
     def save_to_excel(self, data: Dict, filename: str):
         """데이터를 Excel 파일로 저장"""
-        with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-            # 단지 정보
-            if data['complexes']:
-                df_complexes = pd.DataFrame(data['complexes'])
-                df_complexes.to_excel(writer, sheet_name='단지정보', index=False)
+        with self.tracer.span('save_to_excel', filename=filename):
+            if segment_sink.is_manifest(data):
+                segment_sink.write_excel(data, filename)
+                logger.info(f"데이터를 {filename}에 저장 완료")
+                return
+            import pandas as pd
+            
+            with pd.ExcelWriter(filename, engine='openpyxl') as writer:
+                # 단지 정보
+                if data['complexes']:
+                    df_complexes = pd.DataFrame(data['complexes'])
+                    df_complexes.to_excel(writer, sheet_name='단지정보', index=False)
                 
-            # 매물 정보
-            all_articles = []
-            for complex_no, articles in data['articles'].items():
-                for article in articles:
-                    article['complex_no'] = complex_no
-                    all_articles.append(article)
-                    
-            if all_articles:
-                df_articles = pd.DataFrame(all_articles)
-                df_articles.to_excel(writer, sheet_name='매물정보', index=False)
+                # 매물 정보
+                df_articles = self._articles_frame(data)
+                if not df_articles.empty:
+                    df_articles.to_excel(writer, sheet_name='매물정보', index=False)
                 
-            # 개발계획 정보
-            for plan_type, plans in data['development_plans'].items():
-                if plans:
-                    df_plans = pd.DataFrame(plans)
-                    df_plans.to_excel(writer, sheet_name=f'{plan_type}_개발계획', index=False)
+                # 개발계획 정보
+                for plan_type, plans in data['development_plans'].items():
+                    if plans:
+                        df_plans = pd.DataFrame(plans)
+                        df_plans.to_excel(writer, sheet_name=f'{plan_type}_개발계획', index=False)
                     
         logger.info(f"데이터를 {filename}에 저장 완료")
         
+    def save_to_csv(self, data: Dict, filename: str):
+        """매물 정보를 CSV 파일로 저장 (Excel에서 바로 열 수 있도록 UTF-8 BOM 포함)"""
+        with self.tracer.span('save_to_csv', filename=filename):
+            if segment_sink.is_manifest(data):
+                segment_sink.write_csv(data, filename)
+            else:
+                self._articles_frame(data).to_csv(filename, index=False, encoding='utf-8-sig')
+        logger.info(f"데이터를 {filename}에 저장 완료")
+        
+    def save_to_parquet(self, data: Dict, filename: str):
+        """매물 정보를 Parquet 파일로 저장 (pyarrow 필요)"""
+        with self.tracer.span('save_to_parquet', filename=filename):
+            if segment_sink.is_manifest(data):
+                segment_sink.write_parquet(data, filename)
+                logger.info(f"데이터를 {filename}에 저장 완료")
+                return
+            df_articles = self._articles_frame(data)
+            # 목록/객체 값이 섞인 컬럼은 JSON 문자열로 저장
+            for column in df_articles.columns:
+                if df_articles[column].map(lambda value: isinstance(value, (list, dict))).any():
+                    df_articles[column] = df_articles[column].map(
+                        lambda value: json.dumps(value, ensure_ascii=False) if isinstance(value, (list, dict)) else value
+                    )
+            df_articles.to_parquet(filename, index=False)
+        logger.info(f"데이터를 {filename}에 저장 완료")
+        
+    @staticmethod
+    def _articles_frame(data: Dict) -> 'pd.DataFrame':
+        """단지별 매물 목록을 complex_no 컬럼을 가진 하나의 DataFrame으로 변환 (원본 dict는 수정하지 않음)"""
+        import pandas as pd
+        
+        all_articles = [
+            {**article, 'complex_no': complex_no}
+            for complex_no, articles in data['articles'].items()
+            for article in articles
+        ]
+        return pd.DataFrame(all_articles)
+        
+    def save_to_history(self, data: Dict, db_path: str = "naver_real_estate_history.db"):
+        """데이터를 SQLite 가격 이력 저장소에 누적 저장"""
+        from price_history import PriceHistoryStore
+        
+        with self.tracer.span('save_to_history', db_path=db_path):
+            with PriceHistoryStore(db_path) as store:
+                store.ingest(data)
+        logger.info(f"데이터를 {db_path}에 누적 저장 완료")
+        
     async def close(self):
         """리소스 정리"""
         if self.session:
@@ -346,9 +1017,18 @@ class NaverRealEstateCrawler:
         if self.browser:
             await self.browser.close()
 
-async def main():
+async def main(profile: bool = False):
     """메인 실행 함수"""
     crawler = NaverRealEstateCrawler()
+    timestamp = int(time.time())
+    
+    # --profile 지정 시 CPU/메모리 프로파일링
+    profiler = None
+    if profile:
+        from profiling import CrawlProfiler
+        profiler = CrawlProfiler()
+        profiler.attach(crawler.tracer)
+        profiler.start()
     
     try:
         # 브라우저 및 세션 초기화
@@ -363,7 +1043,6 @@ async def main():
         data = await crawler.crawl_area(center_lat, center_lon, radius=0.003)  # 더 작은 반경
         
         # 결과 저장
-        timestamp = int(time.time())
         crawler.save_to_json(data, f'naver_real_estate_data_{timestamp}.json')
         
         try:
@@ -371,6 +1050,9 @@ async def main():
         except Exception as e:
             logger.warning(f"Excel 저장 실패: {e}")
         
+        # 단계별 트레이스 저장 (chrome://tracing 또는 Perfetto에서 열람)
+        crawler.tracer.export_chrome_trace(f'naver_real_estate_trace_{timestamp}.json')
+        
         # 요약 정보 출력
         print("\n=== 크롤링 결과 요약 ===")
         print(f"수집된 단지 수: {len(data['complexes'])}")
@@ -388,6 +1070,18 @@ async def main():
         traceback.print_exc()
     finally:
         await crawler.close()
+        if profiler:
+            profiler.stop()
+            files = profiler.save(f'naver_real_estate_profile_{timestamp}')
+            print(profiler.summary())
+            print(f"프로파일 저장: {', '.join(files)}")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="네이버 부동산 크롤러")
+    parser.add_argument('--profile', action='store_true', help="CPU/메모리 프로파일을 수집합니다")
+    args = parser.parse_args()
+    
+    configure_logging()
+    asyncio.run(main(profile=args.profile))
@@ -0,0 +1,167 @@
+import asyncio
+import contextvars
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 현재 작업자가 속한 단계 (하류 큐가 가득 차 기다린 시간을 이 단계에 기록)
+_current_stage: contextvars.ContextVar[Optional['Stage']] = contextvars.ContextVar('pipeline_stage', default=None)
+
+
+class Stage:
+    """
+    파이프라인의 한 단계
+
+    크기가 제한된 입력 큐와 concurrency개의 작업자로 구성됩니다. 작업자는 큐에서 항목을 꺼내
+    handler를 호출하며, handler는 Pipeline.put으로 다음 단계에 항목을 넘깁니다. 다음 단계의 큐가
+    가득 차면 put이 기다리므로 느린 단계의 압력이 상류로 전달됩니다.
+    """
+
+    def __init__(self, name: str, handler: Callable[[Any], Awaitable[None]],
+                 concurrency: int = 1, queue_size: int = 64, batch: int = 1):
+        """
+        Args:
+            name: 단계 이름
+            handler: 항목 하나(batch > 1이면 항목 목록)를 처리하는 코루틴 함수
+            concurrency: 작업자 수
+            queue_size: 입력 큐 크기
+            batch: 한 번에 꺼내 handler에 넘길 최대 항목 수 (큐에 쌓인 만큼만 모음)
+        """
+        self.name = name
+        self.handler = handler
+        self.concurrency = concurrency
+        self.batch = batch
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.received = 0
+        self.processed = 0
+        self.errors = 0
+        self.max_depth = 0
+        self.busy_s = 0.0
+        self.blocked_s = 0.0  # 하류 큐가 가득 차 기다린 시간
+        self.first_started: Optional[float] = None
+        self.last_finished: Optional[float] = None
+
+    async def _take(self) -> List[Any]:
+        items = [await self.queue.get()]
+        while len(items) < self.batch and not self.queue.empty():
+            items.append(self.queue.get_nowait())
+        return items
+
+    async def _work(self, on_error: Callable[['Stage', BaseException], None]):
+        _current_stage.set(self)
+        while True:
+            items = await self._take()
+            started = time.perf_counter()
+            if self.first_started is None:
+                self.first_started = started
+            try:
+                await self.handler(items if self.batch > 1 else items[0])
+                self.processed += len(items)
+            except Exception as e:
+                self.errors += len(items)
+                on_error(self, e)
+            finally:
+                self.last_finished = time.perf_counter()
+                self.busy_s += self.last_finished - started
+                for _ in items:
+                    self.queue.task_done()
+
+    def stats(self) -> Dict[str, Any]:
+        elapsed = (self.last_finished - self.first_started) if self.first_started and self.last_finished else 0.0
+        return {
+            'concurrency': self.concurrency,
+            'queue_size': self.queue.maxsize,
+            'received': self.received,
+            'processed': self.processed,
+            'errors': self.errors,
+            'queue_depth': self.queue.qsize(),
+            'max_queue_depth': self.max_depth,
+            'busy_s': round(self.busy_s, 3),
+            'blocked_s': round(self.blocked_s, 3),
+            'throughput_per_s': round(self.processed / elapsed, 2) if elapsed > 0 else None,
+        }
+
+
+class Pipeline:
+    """
+    크기가 제한된 asyncio.Queue로 연결한 단계별 생산자/소비자 파이프라인
+
+    항목은 앞 단계에서 뒤 단계로만 흐른다고 가정합니다. run()은 시작 항목을 넣은 뒤 단계 순서대로
+    큐가 비고 처리가 끝나기를 기다리며, 어느 단계에서든 예외가 발생하면 나머지 작업을 취소하고
+    그 예외를 다시 발생시킵니다.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, Stage] = {}
+        self._error: Optional[BaseException] = None
+        self._failed = asyncio.Event()
+
+    def stage(self, name: str, handler: Callable[[Any], Awaitable[None]], **options) -> Stage:
+        """단계 추가 (options는 Stage 인자)"""
+        stage = Stage(name, handler, **options)
+        self.stages[name] = stage
+        return stage
+
+    async def put(self, name: str, item: Any):
+        """name 단계의 큐에 항목 추가. 큐가 가득 차면 빈자리가 날 때까지 기다림"""
+        stage = self.stages[name]
+        if stage.queue.full():
+            caller = _current_stage.get()
+            started = time.perf_counter()
+            await stage.queue.put(item)
+            if caller is not None:
+                caller.blocked_s += time.perf_counter() - started
+        else:
+            stage.queue.put_nowait(item)
+        stage.received += 1
+        stage.max_depth = max(stage.max_depth, stage.queue.qsize())
+
+    def _on_error(self, stage: Stage, error: BaseException):
+        logger.error(f"파이프라인 단계 {stage.name} 오류: {error}")
+        if self._error is None:
+            self._error = error
+            self._failed.set()
+
+    async def _until_done(self, awaitable: Awaitable):
+        """awaitable이 끝나거나 어느 단계에서 예외가 발생할 때까지 대기"""
+        task = asyncio.ensure_future(awaitable)
+        failed = asyncio.ensure_future(self._failed.wait())
+        await asyncio.wait({task, failed}, return_when=asyncio.FIRST_COMPLETED)
+        failed.cancel()
+        if self._error is not None:
+            task.cancel()
+            raise self._error
+        task.result()
+
+    async def run(self, seeds: Dict[str, Iterable[Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        시작 항목을 넣고 모든 단계의 처리가 끝날 때까지 실행합니다.
+
+        Args:
+            seeds: {단계 이름: 시작 항목 목록}
+
+        Returns:
+            단계별 통계 (stats())
+        """
+        workers = [
+            asyncio.create_task(stage._work(self._on_error))
+            for stage in self.stages.values()
+            for _ in range(stage.concurrency)
+        ]
+        try:
+            for name, items in seeds.items():
+                for item in items:
+                    await self._until_done(self.put(name, item))
+            for stage in self.stages.values():
+                await self._until_done(stage.queue.join())
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        return self.stats()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """단계별 수신/처리 항목 수, 큐 깊이, 처리량, 하류 대기 시간"""
+        return {name: stage.stats() for name, stage in self.stages.items()}
@@ -0,0 +1,327 @@
+import json
+import os
+import re
+import sqlite3
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Union
+
+from price_utils import PYEONG_M2, area_band, parse_area, parse_korean_price
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS crawls (
+    crawl_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    crawled_at INTEGER NOT NULL,
+    center_lat REAL,
+    center_lon REAL,
+    bounds TEXT,
+    source TEXT
+);
+
+CREATE TABLE IF NOT EXISTS complex_snapshots (
+    complex_no TEXT NOT NULL,
+    crawled_at INTEGER NOT NULL,
+    crawl_id INTEGER NOT NULL,
+    complex_name TEXT,
+    latitude REAL,
+    longitude REAL,
+    real_estate_type TEXT,
+    completion_year_month TEXT,
+    household_count INTEGER,
+    min_deal_price INTEGER,
+    max_deal_price INTEGER,
+    median_deal_price INTEGER,
+    min_deal_unit_price INTEGER,
+    max_deal_unit_price INTEGER,
+    median_deal_unit_price INTEGER,
+    deal_count INTEGER,
+    lease_count INTEGER,
+    rent_count INTEGER,
+    PRIMARY KEY (complex_no, crawled_at)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS article_snapshots (
+    article_no TEXT NOT NULL,
+    crawled_at INTEGER NOT NULL,
+    crawl_id INTEGER NOT NULL,
+    complex_no TEXT NOT NULL,
+    trade_type TEXT,
+    price INTEGER,
+    rent_price INTEGER,
+    exclusive_area REAL,
+    supply_area REAL,
+    area_band TEXT,
+    floor_info TEXT,
+    building_name TEXT,
+    confirmed_ymd TEXT,
+    PRIMARY KEY (article_no, crawled_at)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_complex_snapshots_time ON complex_snapshots (crawled_at);
+CREATE INDEX IF NOT EXISTS idx_articles_complex_time ON article_snapshots (complex_no, trade_type, crawled_at);
+CREATE INDEX IF NOT EXISTS idx_articles_complex_band_time ON article_snapshots (complex_no, area_band, trade_type, crawled_at);
+CREATE INDEX IF NOT EXISTS idx_articles_band_time ON article_snapshots (area_band, trade_type, crawled_at);
+"""
+
+# 집계 단위별 SQLite 날짜 표현식 (crawled_at은 unix time)
+BUCKET_EXPRESSIONS = {
+    'day': "strftime('%Y-%m-%d', crawled_at, 'unixepoch', 'localtime')",
+    'week': "strftime('%Y-W%W', crawled_at, 'unixepoch', 'localtime')",
+    'month': "strftime('%Y-%m', crawled_at, 'unixepoch', 'localtime')",
+    'quarter': "strftime('%Y', crawled_at, 'unixepoch', 'localtime') || '-Q' || "
+               "((CAST(strftime('%m', crawled_at, 'unixepoch', 'localtime') AS INTEGER) + 2) / 3)",
+    'crawl': "crawled_at",
+}
+
+TimeValue = Union[int, float, datetime, None]
+
+
+def _to_unix(value: TimeValue) -> Optional[int]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    return int(value)
+
+
+def _to_int(value) -> Optional[int]:
+    try:
+        return int(value) if value is not None and value != '' else None
+    except (TypeError, ValueError):
+        return None
+
+
+class PriceHistoryStore:
+    """
+    크롤링 결과를 누적 저장하는 SQLite 가격 이력 저장소
+
+    크롤링마다 단지(마커) 정보와 매물 정보를 (단지번호/매물번호, 수집시각) 키로 저장하고,
+    단지별/면적 구간별 호가 추이를 인덱스를 통해 조회합니다.
+    """
+
+    def __init__(self, db_path: str = "naver_real_estate_history.db"):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def ingest(self, data: Dict, crawled_at: TimeValue = None, source: Optional[str] = None) -> int:
+        """
+        crawl_area 결과 하나를 저장합니다.
+
+        Args:
+            data: crawl_area 결과
+            crawled_at: 수집 시각 (기본값: 현재 시각)
+            source: 원본 파일명 등 출처 정보
+
+        Returns:
+            crawl_id
+        """
+        crawled_at = _to_unix(crawled_at) or int(time.time())
+        area_info = data.get('area_info', {})
+
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO crawls (crawled_at, center_lat, center_lon, bounds, source) VALUES (?, ?, ?, ?, ?)",
+                (crawled_at, area_info.get('center_lat'), area_info.get('center_lon'),
+                 json.dumps(area_info.get('bounds')), source)
+            )
+            crawl_id = cursor.lastrowid
+
+            details = data.get('complex_details', {})
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO complex_snapshots VALUES "
+                "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self._complex_row(complex_data, details.get(complex_data.get('markerId')), crawled_at, crawl_id)
+                 for complex_data in data.get('complexes', []) if complex_data.get('markerId'))
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO article_snapshots VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                self._article_rows(data.get('articles', {}), crawled_at, crawl_id)
+            )
+        return crawl_id
+
+    @staticmethod
+    def _complex_row(complex_data: Dict, detail: Optional[Dict], crawled_at: int, crawl_id: int) -> tuple:
+        household_count = complex_data.get('totalHouseholdCount')
+        if household_count is None and detail:
+            household_count = detail.get('totalHouseholdCount')
+        return (
+            str(complex_data['markerId']),
+            crawled_at,
+            crawl_id,
+            complex_data.get('complexName'),
+            complex_data.get('latitude'),
+            complex_data.get('longitude'),
+            complex_data.get('realEstateTypeCode'),
+            complex_data.get('completionYearMonth'),
+            _to_int(household_count),
+            _to_int(complex_data.get('minDealPrice')),
+            _to_int(complex_data.get('maxDealPrice')),
+            _to_int(complex_data.get('medianDealPrice')),
+            _to_int(complex_data.get('minDealUnitPrice')),
+            _to_int(complex_data.get('maxDealUnitPrice')),
+            _to_int(complex_data.get('medianDealUnitPrice')),
+            _to_int(complex_data.get('dealCount')),
+            _to_int(complex_data.get('leaseCount')),
+            _to_int(complex_data.get('rentCount')),
+        )
+
+    @staticmethod
+    def _article_rows(articles_by_complex: Dict[str, List[Dict]], crawled_at: int, crawl_id: int) -> Iterable[tuple]:
+        for complex_no, articles in articles_by_complex.items():
+            for article in articles:
+                article_no = article.get('articleNo')
+                if not article_no:
+                    continue
+                exclusive_area = parse_area(article.get('area2'))
+                yield (
+                    str(article_no),
+                    crawled_at,
+                    crawl_id,
+                    str(complex_no),
+                    article.get('tradeTypeCode'),
+                    parse_korean_price(article.get('dealOrWarrantPrc')),
+                    parse_korean_price(article.get('rentPrc')),
+                    exclusive_area,
+                    parse_area(article.get('area1')),
+                    area_band(exclusive_area),
+                    article.get('floorInfo'),
+                    article.get('buildingName'),
+                    article.get('articleConfirmYmd'),
+                )
+
+    def ingest_file(self, filename: str) -> int:
+        """save_to_json으로 저장한 파일을 저장합니다. 파일명의 timestamp를 수집 시각으로 사용합니다."""
+        with open(filename, encoding='utf-8') as f:
+            data = json.load(f)
+        match = re.search(r'_(\d{10})\.json$', filename)
+        crawled_at = int(match.group(1)) if match else int(os.path.getmtime(filename))
+        return self.ingest(data, crawled_at=crawled_at, source=os.path.basename(filename))
+
+    def price_history(self,
+                      complex_no: Optional[str] = None,
+                      area_band: Optional[str] = None,
+                      area_min: Optional[float] = None,
+                      area_max: Optional[float] = None,
+                      trade_type: str = "A1",
+                      since: TimeValue = None,
+                      until: TimeValue = None,
+                      bucket: str = "day") -> List[Dict]:
+        """
+        매물 호가 추이를 기간 단위로 집계합니다.
+
+        Args:
+            complex_no: 단지 번호 (None이면 전체)
+            area_band: 면적 구간 (예: '60~85㎡')
+            area_min: 최소 전용면적 (㎡)
+            area_max: 최대 전용면적 (㎡, 미포함)
+            trade_type: 거래 타입 (A1:매매, B1:전세, B2:월세)
+            since: 시작 시각 (unix time 또는 datetime)
+            until: 종료 시각 (미포함)
+            bucket: 집계 단위 (day, week, month, quarter, crawl)
+
+        Returns:
+            [{'period', 'count', 'min_price', 'avg_price', 'max_price', 'avg_price_per_pyeong'}, ...]
+        """
+        if bucket not in BUCKET_EXPRESSIONS:
+            raise ValueError(f"지원하지 않는 집계 단위: {bucket}")
+
+        conditions = ["trade_type = ?", "price IS NOT NULL"]
+        params: List = [trade_type]
+        if complex_no is not None:
+            conditions.append("complex_no = ?")
+            params.append(str(complex_no))
+        if area_band is not None:
+            conditions.append("area_band = ?")
+            params.append(area_band)
+        if area_min is not None:
+            conditions.append("exclusive_area >= ?")
+            params.append(area_min)
+        if area_max is not None:
+            conditions.append("exclusive_area < ?")
+            params.append(area_max)
+        if since is not None:
+            conditions.append("crawled_at >= ?")
+            params.append(_to_unix(since))
+        if until is not None:
+            conditions.append("crawled_at < ?")
+            params.append(_to_unix(until))
+
+        query = f"""
+            SELECT {BUCKET_EXPRESSIONS[bucket]} AS period,
+                   COUNT(*) AS count,
+                   MIN(price) AS min_price,
+                   AVG(price) AS avg_price,
+                   MAX(price) AS max_price,
+                   AVG(price * {PYEONG_M2} / exclusive_area) AS avg_price_per_pyeong
+            FROM article_snapshots
+            WHERE {' AND '.join(conditions)}
+            GROUP BY period
+            ORDER BY period
+        """
+        return [dict(row) for row in self.conn.execute(query, params)]
+
+    def complex_history(self,
+                        complex_no: str,
+                        since: TimeValue = None,
+                        until: TimeValue = None) -> List[Dict]:
+        """단지 마커 정보(매매가 범위, 평당가, 매물 수)의 수집 시각별 이력"""
+        conditions = ["complex_no = ?"]
+        params: List = [str(complex_no)]
+        if since is not None:
+            conditions.append("crawled_at >= ?")
+            params.append(_to_unix(since))
+        if until is not None:
+            conditions.append("crawled_at < ?")
+            params.append(_to_unix(until))
+        query = f"""
+            SELECT crawled_at, complex_name, min_deal_price, max_deal_price, median_deal_price,
+                   median_deal_unit_price, deal_count, lease_count, rent_count
+            FROM complex_snapshots
+            WHERE {' AND '.join(conditions)}
+            ORDER BY crawled_at
+        """
+        return [dict(row) for row in self.conn.execute(query, params)]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="가격 이력 저장소")
+    parser.add_argument('--db', default="naver_real_estate_history.db", help="SQLite 파일 경로")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    ingest_parser = subparsers.add_parser('ingest', help="save_to_json 결과 파일 저장")
+    ingest_parser.add_argument('files', nargs='+')
+
+    query_parser = subparsers.add_parser('query', help="호가 추이 조회")
+    query_parser.add_argument('--complex-no')
+    query_parser.add_argument('--area-band')
+    query_parser.add_argument('--trade-type', default="A1")
+    query_parser.add_argument('--bucket', default="day", choices=list(BUCKET_EXPRESSIONS))
+
+    args = parser.parse_args()
+    with PriceHistoryStore(args.db) as store:
+        if args.command == 'ingest':
+            for filename in args.files:
+                crawl_id = store.ingest_file(filename)
+                print(f"{filename} 저장 완료 (crawl_id={crawl_id})")
+        else:
+            started = time.perf_counter()
+            rows = store.price_history(complex_no=args.complex_no, area_band=args.area_band,
+                                       trade_type=args.trade_type, bucket=args.bucket)
+            for row in rows:
+                print(row)
+            print(f"{len(rows)}개 구간, {(time.perf_counter() - started) * 1000:.1f}ms")
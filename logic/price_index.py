@@ -0,0 +1,427 @@
+"""
+지역별 평당 호가 지수
+
+크롤링 결과가 들어올 때마다 매물별 평당 호가를 (법정동, 면적 구간, 거래 타입, 날짜)별 병합 가능한 요약에
+더하고, 영향을 받은 키의 최근 1/7/30/90일 지수(건수, 평균, 중앙값, 사분위)를 날짜별 요약을 병합해 다시
+저장합니다. 날짜별 요약에는 매물마다 가장 최근 관측값 하나만 들어가며(더 최근 관측이 오면 이전 날짜 요약에서
+빼고 새 날짜 요약에 더함) 자주 수집된 매물이 더 무겁게 들어가지 않습니다. 대시보드는 미리 계산된 지수 한 행을
+읽으므로 이력 전체를 다시 집계하지 않습니다.
+
+    python price_index.py ingest naver_real_estate_data_*.json
+    python price_index.py show 4113510300 --window 30
+"""
+import json
+import math
+import os
+import re
+import sqlite3
+import time
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from price_utils import PYEONG_M2, area_band, parse_area, parse_korean_price
+
+# 호가 지수 저장소 기본 위치 (API 서버와 CLI가 함께 사용, PRICE_INDEX_DB 환경 변수로 변경)
+DEFAULT_DB = os.environ.get("PRICE_INDEX_DB", "naver_price_index.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS price_index_observations (
+    article_no TEXT NOT NULL,
+    day TEXT NOT NULL,
+    district TEXT NOT NULL,
+    area_band TEXT NOT NULL,
+    trade_type TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (article_no, day)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_price_index_observations_key
+    ON price_index_observations (district, trade_type, area_band, day);
+
+CREATE TABLE IF NOT EXISTS price_index_latest (
+    article_no TEXT PRIMARY KEY,
+    day TEXT NOT NULL,
+    district TEXT NOT NULL,
+    area_band TEXT NOT NULL,
+    trade_type TEXT NOT NULL,
+    value REAL NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS price_index_daily (
+    district TEXT NOT NULL,
+    area_band TEXT NOT NULL,
+    trade_type TEXT NOT NULL,
+    day TEXT NOT NULL,
+    sketch TEXT NOT NULL,
+    PRIMARY KEY (district, area_band, trade_type, day)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS price_index_rolling (
+    district TEXT NOT NULL,
+    area_band TEXT NOT NULL,
+    trade_type TEXT NOT NULL,
+    window_days INTEGER NOT NULL,
+    as_of TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    mean REAL,
+    median REAL,
+    p25 REAL,
+    p75 REAL,
+    PRIMARY KEY (district, area_band, trade_type, window_days)
+) WITHOUT ROWID;
+"""
+
+# 미리 계산하는 기간 (일)
+WINDOWS = (1, 7, 30, 90)
+
+# 지수에 포함하는 거래 타입 (월세는 보증금만으로 평당가를 비교할 수 없어 제외)
+INDEX_TRADE_TYPES = ('A1', 'B1')
+
+# 면적 구간 전체를 합친 지수의 구간 이름
+ALL_BANDS = '*'
+
+
+class LogSketch:
+    """
+    값을 상대 오차 alpha 이내의 로그 구간에 세어 분위수를 추정하는 요약
+
+    구간 번호가 같은 요약끼리는 구간별 건수를 더하기만 하면 병합되고, 넣었던 값은 remove로 뺄 수 있습니다.
+    평균은 합계와 건수로 정확히 계산합니다. 값을 뺀 뒤의 min/max는 실제 범위를 감싸는 경계입니다.
+    """
+
+    def __init__(self, alpha: float = 0.01):
+        self.alpha = alpha
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def add(self, value: float, weight: int = 1):
+        if value <= 0 or math.isnan(value):
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[key] = self.buckets.get(key, 0) + weight
+        self.count += weight
+        self.total += value * weight
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def remove(self, value: float, weight: int = 1):
+        """add로 넣었던 값을 뺌"""
+        if value <= 0 or math.isnan(value):
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        remaining = self.buckets.get(key, 0) - weight
+        if remaining > 0:
+            self.buckets[key] = remaining
+        else:
+            self.buckets.pop(key, None)
+        self.count -= weight
+        self.total -= value * weight
+        if self.count <= 0:
+            self.buckets.clear()
+            self.count = 0
+            self.total = 0.0
+            self.min = self.max = None
+
+    def merge(self, other: 'LogSketch') -> 'LogSketch':
+        if other.alpha != self.alpha:
+            raise ValueError("alpha가 다른 요약은 병합할 수 없습니다")
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                value = 2 * self.gamma ** key / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def to_json(self) -> str:
+        return json.dumps({
+            'alpha': self.alpha, 'count': self.count, 'total': self.total, 'min': self.min, 'max': self.max,
+            'buckets': {str(key): count for key, count in self.buckets.items()},
+        }, separators=(',', ':'))
+
+    @classmethod
+    def from_json(cls, text: str) -> 'LogSketch':
+        data = json.loads(text)
+        sketch = cls(data['alpha'])
+        sketch.buckets = {int(key): count for key, count in data['buckets'].items()}
+        sketch.count = data['count']
+        sketch.total = data['total']
+        sketch.min = data['min']
+        sketch.max = data['max']
+        return sketch
+
+
+def _day(timestamp: float) -> str:
+    return time.strftime('%Y-%m-%d', time.localtime(timestamp))
+
+
+def _shift(day: str, days: int) -> str:
+    return (date.fromisoformat(day) + timedelta(days=days)).isoformat()
+
+
+def price_observations(data: Dict) -> Iterable[Tuple[str, str, str, str, float]]:
+    """
+    crawl_area 결과에서 (매물 번호, 법정동, 면적 구간, 거래 타입, 평당가) 목록
+
+    법정동은 단지 상세의 cortarNo, 없으면 크롤링 영역의 cortar_no입니다.
+    의심 매물 표시(anomalyFlags)가 있는 매물은 제외합니다.
+    """
+    default_district = (data.get('area_info') or {}).get('cortar_no')
+    details = data.get('complex_details', {})
+    for complex_no, articles in data.get('articles', {}).items():
+        district = (details.get(complex_no) or {}).get('cortarNo') or default_district
+        if not district:
+            continue
+        for article in articles:
+            trade_type = article.get('tradeTypeCode')
+            if trade_type not in INDEX_TRADE_TYPES or not article.get('articleNo'):
+                continue
+            if article.get('anomalyFlags'):
+                continue
+            price = parse_korean_price(article.get('dealOrWarrantPrc'))
+            exclusive_area = parse_area(article.get('area2'))
+            band = area_band(exclusive_area)
+            if not price or not exclusive_area or not band:
+                continue
+            yield str(article['articleNo']), str(district), band, trade_type, price * PYEONG_M2 / exclusive_area
+
+
+class PriceIndex:
+    """
+    법정동 × 면적 구간 × 거래 타입별 평당 호가 지수 저장소 (SQLite)
+
+    - price_index_observations: (매물 번호, 날짜)별 관측값. 같은 날 다시 들어온 매물은 덮어씀 (임의 기간 조회용)
+    - price_index_latest: 매물별 가장 최근 관측 (날짜별 요약에서 이전 값을 뺄 때 사용)
+    - price_index_daily: 키 × 날짜별 LogSketch. 매물마다 가장 최근 관측 날짜의 요약에만 들어 있음
+    - price_index_rolling: 키별 기간 지수. ingest 때 바뀐 키만 가장 최근 수집일(as_of)까지의 날짜별 요약을 병합해 갱신
+
+    예전 결과를 나중에 넣으면 관측값만 저장하고, 그 매물에 더 최근 관측이 없을 때만 요약에 더합니다.
+    as_of는 뒤로 가지 않습니다.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB, alpha: float = 0.01):
+        self.db_path = db_path
+        self.alpha = alpha
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def ingest(self, data: Dict, crawled_at: Optional[float] = None) -> int:
+        """
+        crawl_area 결과 하나를 지수에 반영합니다.
+
+        Returns:
+            새로 반영한 매물 수 (같은 날 이미 반영한 매물은 값만 갱신하고 세지 않음)
+        """
+        day = _day(crawled_at or time.time())
+        observations = {article_no: (district, band, trade_type, value)
+                        for article_no, district, band, trade_type, value in price_observations(data)}
+        if not observations:
+            return 0
+
+        with self.conn:
+            article_nos = list(observations)
+            seen = self._select_in("SELECT article_no FROM price_index_observations WHERE day = ? AND article_no IN",
+                                   [day], article_nos)
+            latest = {row['article_no']: row for row in self._select_in(
+                "SELECT * FROM price_index_latest WHERE article_no IN", [], article_nos)}
+            self.conn.executemany(
+                "INSERT INTO price_index_observations (article_no, day, district, area_band, trade_type, value) "
+                "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (article_no, day) DO UPDATE SET "
+                "district = excluded.district, area_band = excluded.area_band, "
+                "trade_type = excluded.trade_type, value = excluded.value",
+                ((article_no, day, *observation) for article_no, observation in observations.items())
+            )
+
+            # 매물마다 가장 최근 관측만 날짜별 요약에 남도록 이전 값을 빼고 새 값을 더함
+            sketches: Dict[Tuple[str, str, str, str], LogSketch] = {}
+            updated = []
+            for article_no, (district, band, trade_type, value) in observations.items():
+                previous = latest.get(article_no)
+                if previous is not None:
+                    if previous['day'] > day:
+                        continue
+                    for previous_band in (previous['area_band'], ALL_BANDS):
+                        self._daily(sketches, previous['district'], previous_band, previous['trade_type'],
+                                    previous['day']).remove(previous['value'])
+                for key_band in (band, ALL_BANDS):
+                    self._daily(sketches, district, key_band, trade_type, day).add(value)
+                updated.append((article_no, day, district, band, trade_type, value))
+            self.conn.executemany("INSERT OR REPLACE INTO price_index_latest VALUES (?, ?, ?, ?, ?, ?)", updated)
+
+            changed: Dict[Tuple[str, str, str], str] = {}
+            for (district, band, trade_type, sketch_day), sketch in sketches.items():
+                if sketch.count:
+                    self.conn.execute("INSERT OR REPLACE INTO price_index_daily VALUES (?, ?, ?, ?, ?)",
+                                      (district, band, trade_type, sketch_day, sketch.to_json()))
+                else:
+                    self.conn.execute(
+                        "DELETE FROM price_index_daily WHERE district = ? AND area_band = ? AND trade_type = ? "
+                        "AND day = ?", (district, band, trade_type, sketch_day)
+                    )
+                key = (district, band, trade_type)
+                changed[key] = max(changed.get(key, sketch_day), sketch_day)
+
+            for (district, band, trade_type), changed_day in changed.items():
+                as_of = self._as_of(district, band, trade_type)
+                self._refresh_rolling(district, band, trade_type, max(as_of, changed_day) if as_of else changed_day)
+        return len(observations) - len(seen)
+
+    def _select_in(self, sql: str, params: List, values: List[str]) -> List[sqlite3.Row]:
+        """sql 뒤에 IN (values...)을 붙여 500개씩 나눠 조회"""
+        rows = []
+        for start in range(0, len(values), 500):
+            chunk = values[start:start + 500]
+            rows.extend(self.conn.execute(f"{sql} ({','.join('?' * len(chunk))})", [*params, *chunk]))
+        return rows
+
+    def _daily(self, sketches: Dict, district: str, band: str, trade_type: str, day: str) -> LogSketch:
+        """ingest 중인 날짜별 요약 (처음 쓸 때 저장된 요약을 읽어옴)"""
+        key = (district, band, trade_type, day)
+        if key not in sketches:
+            row = self.conn.execute(
+                "SELECT sketch FROM price_index_daily WHERE district = ? AND area_band = ? AND trade_type = ? "
+                "AND day = ?", key
+            ).fetchone()
+            sketches[key] = LogSketch.from_json(row['sketch']) if row else LogSketch(self.alpha)
+        return sketches[key]
+
+    def _as_of(self, district: str, band: str, trade_type: str) -> Optional[str]:
+        row = self.conn.execute(
+            "SELECT MAX(as_of) FROM price_index_rolling WHERE district = ? AND area_band = ? AND trade_type = ?",
+            (district, band, trade_type)
+        ).fetchone()
+        return row[0]
+
+    def _refresh_rolling(self, district: str, band: str, trade_type: str, as_of: str):
+        """as_of까지 최근 WINDOWS일의 날짜별 요약을 짧은 기간부터 차례로 병합해 기간 지수를 저장"""
+        rows = self.conn.execute(
+            "SELECT day, sketch FROM price_index_daily WHERE district = ? AND area_band = ? AND trade_type = ? "
+            "AND day BETWEEN ? AND ? ORDER BY day DESC",
+            (district, band, trade_type, _shift(as_of, 1 - max(WINDOWS)), as_of)
+        ).fetchall()
+        sketch = LogSketch(self.alpha)
+        position = 0
+        for window in sorted(WINDOWS):
+            since = _shift(as_of, 1 - window)
+            while position < len(rows) and rows[position]['day'] >= since:
+                sketch.merge(LogSketch.from_json(rows[position]['sketch']))
+                position += 1
+            self.conn.execute(
+                "INSERT OR REPLACE INTO price_index_rolling VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (district, band, trade_type, window, as_of, sketch.count, sketch.mean,
+                 sketch.quantile(0.5), sketch.quantile(0.25), sketch.quantile(0.75))
+            )
+
+    def window_sketch(self, district: str, band: str, trade_type: str, since: str, until: str) -> LogSketch:
+        """
+        since~until(포함, 'YYYY-MM-DD')에 관측된 매물별 최근 평당가를 담은 요약 (매물마다 한 번)
+
+        과거 기간도 그때의 관측으로 답해야 하므로 날짜별 요약이 아니라 관측값에서 계산합니다.
+        """
+        band_filter = "" if band == ALL_BANDS else "AND area_band = ? "
+        params = (district, trade_type) + (() if band == ALL_BANDS else (band,)) + (since, until)
+        sketch = LogSketch(self.alpha)
+        for (value,) in self.conn.execute(
+            "SELECT value FROM ("
+            "SELECT value, ROW_NUMBER() OVER (PARTITION BY article_no ORDER BY day DESC) AS latest "
+            "FROM price_index_observations WHERE district = ? AND trade_type = ? " + band_filter +
+            "AND day BETWEEN ? AND ?) WHERE latest = 1", params
+        ):
+            sketch.add(value)
+        return sketch
+
+    def rolling(self, district: str, window: int = 30, trade_type: str = "A1") -> List[Dict]:
+        """
+        미리 계산한 기간 지수 (면적 구간별 + 전체 '*')
+
+        as_of는 해당 키의 가장 최근 수집일입니다. 그 뒤로 크롤링이 없었다면 기간이 그날 기준입니다.
+        """
+        if window not in WINDOWS:
+            raise ValueError(f"지원하지 않는 기간: {window} (가능: {', '.join(map(str, WINDOWS))})")
+        rows = self.conn.execute(
+            "SELECT area_band, as_of, count, mean, median, p25, p75 FROM price_index_rolling "
+            "WHERE district = ? AND trade_type = ? AND window_days = ? ORDER BY area_band",
+            (str(district), trade_type, window)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def query(self, district: str, since: str, until: str, area_band: str = ALL_BANDS,
+              trade_type: str = "A1") -> Dict:
+        """임의 기간 지수 (관측값에서 그 자리에서 계산, 매물마다 기간 안의 최근 값 하나)"""
+        sketch = self.window_sketch(str(district), area_band, trade_type, since, until)
+        return {
+            'district': str(district), 'area_band': area_band, 'trade_type': trade_type,
+            'since': since, 'until': until, 'count': sketch.count, 'mean': sketch.mean,
+            'median': sketch.quantile(0.5), 'p25': sketch.quantile(0.25), 'p75': sketch.quantile(0.75),
+        }
+
+    def districts(self) -> List[str]:
+        return [row[0] for row in self.conn.execute("SELECT DISTINCT district FROM price_index_rolling")]
+
+    def ingest_file(self, filename: str) -> int:
+        """save_to_json으로 저장한 파일을 반영합니다. 파일명의 timestamp를 수집 시각으로 사용합니다."""
+        with open(filename, encoding='utf-8') as f:
+            data = json.load(f)
+        match = re.search(r'_(\d{10})\.json$', filename)
+        crawled_at = int(match.group(1)) if match else int(os.path.getmtime(filename))
+        return self.ingest(data, crawled_at)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="지역별 평당 호가 지수")
+    parser.add_argument('--db', default=DEFAULT_DB, help="SQLite 파일 경로 (기본 PRICE_INDEX_DB 환경 변수)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    ingest_parser = subparsers.add_parser('ingest', help="save_to_json 결과 파일 반영")
+    ingest_parser.add_argument('files', nargs='+')
+
+    show_parser = subparsers.add_parser('show', help="기간 지수 조회")
+    show_parser.add_argument('district', help="법정동 코드")
+    show_parser.add_argument('--window', type=int, default=30, choices=WINDOWS)
+    show_parser.add_argument('--trade-type', default="A1", choices=INDEX_TRADE_TYPES)
+
+    args = parser.parse_args()
+    with PriceIndex(args.db) as index:
+        if args.command == 'ingest':
+            for filename in args.files:
+                print(f"{filename}: 매물 {index.ingest_file(filename)}개 반영")
+        else:
+            for row in index.rolling(args.district, args.window, args.trade_type):
+                print(f"{row['area_band']:<10} {row['count']:>6}건  평균 {row['mean']:>8.0f}  "
+                      f"중앙값 {row['median']:>8.0f}  ({row['p25']:.0f}~{row['p75']:.0f}) 만원/평  기준일 {row['as_of']}")
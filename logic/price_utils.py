@@ -0,0 +1,87 @@
+import math
+import re
+from typing import Optional, Union
+
+# 1평 = 3.305785㎡
+PYEONG_M2 = 3.305785
+
+# 전용면적 구간 (㎡, 상한 미포함)
+AREA_BANDS = (
+    (60.0, '~60㎡'),
+    (85.0, '60~85㎡'),
+    (135.0, '85~135㎡'),
+    (float('inf'), '135㎡~'),
+)
+
+_UNIT_PATTERN = re.compile(r'(\d+(?:\.\d+)?)(천|백|십)?')
+_UNIT_VALUES = {'천': 1000, '백': 100, '십': 10, None: 1}
+
+# 가격 표기에서 지우는 문자 (쉼표, 공백, '만원'/'만'/'원')
+PRICE_NOISE_PATTERN = re.compile(r'[, 만원]')
+
+# 억 + 숫자 하나로만 이루어진 표기 ('13억2000', '5.5억', '5000'). 값이 float(억) * 10000 + float(나머지)와 같아
+# aggregation.parse_price_series가 문자열 연산으로 한 번에 처리하는 형태입니다.
+SIMPLE_PRICE_PATTERN = re.compile(r'^(?:(?P<eok>[0-9]+(?:\.[0-9]+)?)억)?(?P<rest>[0-9]+(?:\.[0-9]+)?)?$')
+
+
+def parse_manwon(text: str) -> float:
+    """'5천', '2000', '2백' 같은 만원 단위 문자열을 숫자로 변환"""
+    total = 0.0
+    for number, unit in _UNIT_PATTERN.findall(text):
+        total += float(number) * _UNIT_VALUES[unit or None]
+    return total
+
+
+def parse_korean_price(value: Union[str, int, float, None]) -> Optional[int]:
+    """
+    네이버 부동산 가격 표기를 만원 단위 정수로 변환합니다.
+
+    예: '13억2000' -> 132000, '8억 5,000' -> 85000, '8억5천만원' -> 85000,
+        '5.5억' -> 55000, '55만' -> 55, '2백' -> 200, 40000 -> 40000
+
+    Args:
+        value: 가격 문자열 또는 숫자 (숫자는 이미 만원 단위로 간주)
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+
+    text = PRICE_NOISE_PATTERN.sub('', value)
+    if not text:
+        return None
+
+    if '억' in text:
+        eok, _, rest = text.partition('억')
+        try:
+            total = float(eok) * 10000 if eok else 0.0
+        except ValueError:
+            return None
+        total += parse_manwon(rest)
+    else:
+        if not _UNIT_PATTERN.search(text):
+            return None
+        total = parse_manwon(text)
+    if not math.isfinite(total):  # 'inf억', 'nan억'
+        return None
+    return int(round(total))
+
+
+def parse_area(value: Union[str, int, float, None]) -> Optional[float]:
+    """'84.97', '84㎡' 같은 면적 표기를 ㎡ 단위 실수로 변환"""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = re.search(r'\d+(?:\.\d+)?', value)
+    return float(match.group()) if match else None
+
+
+def area_band(exclusive_area: Optional[float]) -> Optional[str]:
+    """전용면적(㎡)이 속한 면적 구간 이름"""
+    if exclusive_area is None:
+        return None
+    for upper, label in AREA_BANDS:
+        if exclusive_area < upper:
+            return label
+    return None
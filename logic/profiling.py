@@ -0,0 +1,258 @@
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Dict, List, Optional
+
+# tracemalloc 스냅샷을 비교할 주요 크롤링 단계
+SNAPSHOT_PHASES = (
+    'browser_launch',
+    'cookie_harvest',
+    'crawl_area',
+    'save_to_json',
+    'save_to_excel',
+)
+
+# 할당 상위 목록에서 제외할 프로파일러 자신의 파일
+_PROFILER_FILES = {tracemalloc.__file__, __file__}
+
+
+class CrawlProfiler:
+    """
+    크롤링 실행의 CPU/메모리 프로파일러
+
+    CPU는 샘플링(기본, flamegraph용 folded stack 출력) 또는 cProfile(결정적, .pstats 출력)
+    방식으로 수집합니다. Tracer에 연결하면 span 단위로 tracemalloc 메모리 증감을 집계하고,
+    SNAPSHOT_PHASES 단계는 시작/종료 스냅샷을 비교해 할당 위치 상위 N개를 기록합니다.
+    """
+
+    def __init__(self,
+                 mode: str = "sampling",
+                 interval: float = 0.005,
+                 snapshot_phases=SNAPSHOT_PHASES,
+                 top_n: int = 20):
+        """
+        Args:
+            mode: CPU 프로파일 방식 (sampling:샘플링, cprofile:결정적)
+            interval: 샘플링 간격 (초)
+            snapshot_phases: tracemalloc 스냅샷을 비교할 span 이름
+            top_n: 요약에 포함할 상위 항목 수
+        """
+        if mode not in ('sampling', 'cprofile'):
+            raise ValueError(f"지원하지 않는 프로파일 방식: {mode}")
+        self.mode = mode
+        self.interval = interval
+        self.snapshot_phases = set(snapshot_phases)
+        self.top_n = top_n
+
+        self.stacks: Counter = Counter()
+        self.sample_count = 0
+        self.phase_memory: Dict[str, Dict[str, int]] = {}
+        self.phase_allocations: Dict[str, List[str]] = {}
+
+        self._profile: Optional[cProfile.Profile] = None
+        self._sampler: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._paused = False
+        self._target_thread_id = None
+        self._span_memory: Dict[int, int] = {}
+        self._span_snapshots: Dict[int, tracemalloc.Snapshot] = {}
+        self._started_tracemalloc = False
+        self._start_time = None
+        self._duration = 0.0
+
+    def attach(self, tracer):
+        """Tracer에 연결하여 span 경계마다 메모리를 측정합니다."""
+        tracer.listeners.append(self)
+
+    def detach(self, tracer):
+        """Tracer 연결 해제"""
+        if self in tracer.listeners:
+            tracer.listeners.remove(self)
+
+    def start(self):
+        """프로파일링 시작 (호출한 스레드가 측정 대상)"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self._start_time = time.perf_counter()
+
+        if self.mode == 'cprofile':
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            self._target_thread_id = threading.get_ident()
+            self._stop_event.clear()
+            self._sampler = threading.Thread(target=self._sample_loop, name="crawl-profiler", daemon=True)
+            self._sampler.start()
+
+    def stop(self):
+        """프로파일링 종료"""
+        if self._profile and self._start_time is not None:
+            self._profile.disable()
+        if self._sampler:
+            self._stop_event.set()
+            self._sampler.join()
+            self._sampler = None
+        if self._start_time is not None:
+            self._duration = time.perf_counter() - self._start_time
+            self._start_time = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def _sample_loop(self):
+        """대상 스레드의 콜스택을 주기적으로 수집"""
+        while not self._stop_event.wait(self.interval):
+            if self._paused:
+                continue
+            frame = sys._current_frames().get(self._target_thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            stack.reverse()
+            self.stacks[';'.join(stack)] += 1
+            self.sample_count += 1
+
+    def _take_snapshot(self) -> tracemalloc.Snapshot:
+        """스냅샷 생성 (스냅샷 처리 시간은 CPU 프로파일에서 제외)"""
+        self._pause()
+        try:
+            return tracemalloc.take_snapshot()
+        finally:
+            self._resume()
+
+    def _pause(self):
+        self._paused = True
+        if self._profile and self._start_time is not None:
+            self._profile.disable()
+
+    def _resume(self):
+        self._paused = False
+        if self._profile and self._start_time is not None:
+            self._profile.enable()
+
+    def on_span_start(self, span):
+        if not tracemalloc.is_tracing():
+            return
+        self._span_memory[id(span)] = tracemalloc.get_traced_memory()[0]
+        if span.name in self.snapshot_phases:
+            self._span_snapshots[id(span)] = self._take_snapshot()
+
+    def on_span_end(self, span):
+        start_memory = self._span_memory.pop(id(span), None)
+        start_snapshot = self._span_snapshots.pop(id(span), None)
+        if start_memory is None or not tracemalloc.is_tracing():
+            return
+
+        current, peak = tracemalloc.get_traced_memory()
+        entry = self.phase_memory.setdefault(span.name, {'count': 0, 'alloc_delta_bytes': 0, 'peak_bytes': 0})
+        entry['count'] += 1
+        entry['alloc_delta_bytes'] += current - start_memory
+        entry['peak_bytes'] = max(entry['peak_bytes'], peak)
+
+        if start_snapshot is not None:
+            end_snapshot = self._take_snapshot()
+            self._pause()
+            try:
+                stats = [
+                    stat for stat in end_snapshot.compare_to(start_snapshot, 'lineno')
+                    if stat.traceback[0].filename not in _PROFILER_FILES
+                ]
+                self.phase_allocations[span.name] = [str(stat) for stat in stats[:self.top_n]]
+            finally:
+                self._resume()
+
+    def top_functions(self) -> List[Dict]:
+        """CPU 사용 상위 함수 목록"""
+        if self.mode == 'cprofile':
+            if not self._profile:
+                return []
+            stats = pstats.Stats(self._profile)
+            rows = []
+            for (filename, lineno, name), (_, calls, self_time, total_time, _) in stats.stats.items():
+                rows.append({
+                    'function': f"{name} ({os.path.basename(filename)}:{lineno})",
+                    'calls': calls,
+                    'self_s': round(self_time, 6),
+                    'total_s': round(total_time, 6)
+                })
+            rows.sort(key=lambda row: row['total_s'], reverse=True)
+            return rows[:self.top_n]
+
+        self_samples: Counter = Counter()
+        total_samples: Counter = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(';')
+            self_samples[frames[-1]] += count
+            for frame in set(frames):
+                total_samples[frame] += count
+        return [
+            {'function': frame, 'self_samples': count, 'total_samples': total_samples[frame]}
+            for frame, count in self_samples.most_common(self.top_n)
+        ]
+
+    def report(self) -> Dict:
+        """프로파일 결과 요약 (JSON 직렬화 가능)"""
+        return {
+            'mode': self.mode,
+            'duration_s': round(self._duration, 3),
+            'samples': self.sample_count,
+            'top_functions': self.top_functions(),
+            'phases': self.phase_memory,
+            'phase_allocations': self.phase_allocations
+        }
+
+    def summary(self) -> str:
+        """사람이 읽기 쉬운 상위 N개 요약"""
+        report = self.report()
+        lines = [f"=== 프로파일 요약 ({report['mode']}, {report['duration_s']}초) ==="]
+        lines.append("CPU 상위 함수:")
+        for row in report['top_functions']:
+            if self.mode == 'cprofile':
+                lines.append(f"  {row['total_s']:>10.4f}s  {row['self_s']:>10.4f}s  {row['calls']:>8}  {row['function']}")
+            else:
+                lines.append(f"  {row['total_samples']:>8}  {row['self_samples']:>8}  {row['function']}")
+        lines.append("단계별 메모리 증감:")
+        for name, entry in report['phases'].items():
+            lines.append(f"  {name}: {entry['count']}회, {entry['alloc_delta_bytes'] / 1024:,.1f} KiB, "
+                         f"peak {entry['peak_bytes'] / 1024:,.1f} KiB")
+        for name, allocations in report['phase_allocations'].items():
+            lines.append(f"[{name}] 할당 상위:")
+            lines.extend(f"  {allocation}" for allocation in allocations)
+        return '\n'.join(lines)
+
+    def save(self, prefix: str) -> List[str]:
+        """
+        프로파일 결과를 파일로 저장합니다.
+
+        sampling 방식은 {prefix}.folded (flamegraph.pl, speedscope 호환),
+        cprofile 방식은 {prefix}.pstats (snakeviz, flameprof 호환)를 만들고,
+        공통으로 {prefix}_summary.txt 요약을 저장합니다.
+        """
+        directory = os.path.dirname(prefix)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        files = []
+        if self.mode == 'cprofile' and self._profile:
+            self._profile.dump_stats(f"{prefix}.pstats")
+            files.append(f"{prefix}.pstats")
+        else:
+            with open(f"{prefix}.folded", 'w', encoding='utf-8') as f:
+                for stack, count in self.stacks.items():
+                    f.write(f"{stack} {count}\n")
+            files.append(f"{prefix}.folded")
+
+        with open(f"{prefix}_summary.txt", 'w', encoding='utf-8') as f:
+            f.write(self.summary())
+        files.append(f"{prefix}_summary.txt")
+        return files
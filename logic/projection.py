@@ -0,0 +1,121 @@
+from typing import Dict, Iterable, List, Optional
+
+# 지도 마커 표시에 필요한 단지 필드
+MAP_COMPLEX_FIELDS = [
+    'markerId', 'markerType', 'latitude', 'longitude', 'complexName', 'realEstateTypeCode',
+    'minDealPrice', 'maxDealPrice', 'medianDealPrice', 'medianDealUnitPrice', 'totalHouseholdCount',
+]
+
+# 뷰별 섹션 필드 (None: 원본 그대로, []: 섹션 비움)
+VIEWS: Dict[str, Optional[Dict[str, Optional[List[str]]]]] = {
+    'map': {
+        'complexes': MAP_COMPLEX_FIELDS,
+        'complex_details': [],
+        'articles': [],
+        'development_plans': [],
+    },
+    'summary': {
+        'complexes': MAP_COMPLEX_FIELDS + [
+            'realEstateTypeName', 'completionYearMonth', 'totalDongCount', 'minArea', 'maxArea',
+            'minLeasePrice', 'maxLeasePrice', 'dealCount', 'leaseCount', 'rentCount', 'totalArticleCount',
+        ],
+        'complex_details': [
+            'complexNo', 'complexName', 'address', 'roadAddress', 'cortarNo', 'totalHouseholdCount',
+            'totalDongCount', 'useApproveYmd', 'highFloor', 'lowFloor', 'constructionCompanyName',
+        ],
+        'articles': [
+            'articleNo', 'tradeTypeCode', 'tradeTypeName', 'dealOrWarrantPrc', 'rentPrc', 'area1', 'area2',
+            'areaName', 'floorInfo', 'direction', 'buildingName', 'articleConfirmYmd', 'duplicateArticleNos',
+            'anomalyFlags',
+        ],
+        'development_plans': None,
+    },
+    'full': None,
+}
+
+
+# 뷰별 최소 수집 단계 (naver_real_estate_crawler.CRAWL_DEPTHS)
+VIEW_DEPTHS = {'map': 'markers', 'summary': 'full', 'full': 'full'}
+
+# 수집 단계별로 새로 채워지는 섹션
+DEPTH_SECTIONS = [
+    ('markers', 'complexes'),
+    ('details', 'complex_details'),
+    ('articles', 'articles'),
+]
+
+
+def required_depth(view: str = "full", fields: Optional[List[str]] = None) -> str:
+    """
+    뷰 또는 필드 목록을 채우는 데 필요한 가장 낮은 수집 단계를 반환합니다.
+
+    fields가 있으면 summary 뷰의 섹션별 필드로 판단하며, 알 수 없는 필드가 있으면 full입니다.
+    """
+    if view not in VIEWS:
+        raise ValueError(f"지원하지 않는 뷰: {view}")
+    if not fields:
+        return VIEW_DEPTHS[view]
+    remaining = set(fields)
+    for depth, section in DEPTH_SECTIONS:
+        remaining -= set(VIEWS['summary'][section])
+        if not remaining:
+            return depth
+    return 'full'
+
+
+def project_record(record: Dict, fields: Iterable[str]) -> Dict:
+    """레코드에서 지정한 키만 남깁니다."""
+    return {key: record[key] for key in fields if key in record}
+
+
+def _project_section(section, fields: Optional[List[str]]):
+    """섹션의 레코드를 지정한 필드로 줄입니다. fields가 빈 목록이면 섹션을 비웁니다."""
+    if fields is None:
+        return section
+    if isinstance(section, list):
+        return [project_record(record, fields) for record in section] if fields else []
+    if isinstance(section, dict):
+        projected = {}
+        for key, value in section.items():
+            if isinstance(value, list):
+                projected[key] = _project_section(value, fields)
+            elif fields and isinstance(value, dict):
+                projected[key] = project_record(value, fields)
+        return projected
+    return section
+
+
+def project_result(data: Dict, view: str = "full", fields: Optional[List[str]] = None) -> Dict:
+    """
+    crawl_area 결과를 뷰 또는 필드 목록에 맞게 줄입니다.
+
+    섹션 키(complexes, complex_details, articles, development_plans)는 유지하고
+    각 레코드만 필요한 키로 줄이므로 응답 구조는 full 뷰와 같습니다.
+
+    Args:
+        data: crawl_area 결과
+        view: summary, map, full 중 하나
+        fields: 지정하면 뷰 대신 모든 레코드에 이 키 목록을 적용
+    """
+    if view not in VIEWS:
+        raise ValueError(f"지원하지 않는 뷰: {view}")
+    if fields:
+        section_fields = {section: list(fields) for section in
+                          ('complexes', 'complex_details', 'articles', 'development_plans')}
+    else:
+        section_fields = VIEWS[view]
+    if section_fields is None:
+        return data
+
+    projected = dict(data)
+    for section, keys in section_fields.items():
+        if section in projected:
+            projected[section] = _project_section(projected[section], keys)
+    return projected
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """쿼리 문자열 'a,b,c'를 필드 목록으로 변환"""
+    if not fields:
+        return None
+    return [field.strip() for field in fields.split(',') if field.strip()]
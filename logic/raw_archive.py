@@ -0,0 +1,375 @@
+"""
+업스트림 원본 응답 보관소
+
+크롤러가 받은 응답 본문을 내용 해시(sha256)로 한 번만 압축 저장하고, (엔드포인트, 파라미터, 수집 시각)에서
+본문으로 가는 인덱스를 SQLite에 기록합니다. 같은 단지 상세나 개발계획 응답은 여러 번 크롤링해도 한 번만 저장됩니다.
+
+    crawler.archive = RawArchive("raw_archive")     # 크롤링하면서 원본 응답 저장
+    crawler.offline = True                          # 보관소에서만 읽어 다시 처리 (업스트림 요청 없음)
+
+    python raw_archive.py stats raw_archive
+    python raw_archive.py replay raw_archive --lat 37.3642443 --lon 127.1084674 --radius 0.003 --out result.json
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional
+
+try:
+    # zstandard가 설치되어 있으면 zstd, 없으면 zlib으로 압축
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY,
+    codec TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL,
+    first_seen REAL NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS responses (
+    response_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    endpoint TEXT NOT NULL,
+    params TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    digest TEXT NOT NULL REFERENCES blobs (digest)
+);
+
+CREATE INDEX IF NOT EXISTS idx_responses_request_time ON responses (endpoint, params, fetched_at);
+CREATE INDEX IF NOT EXISTS idx_responses_time ON responses (fetched_at);
+"""
+
+# 압축 방식별 파일 확장자
+CODEC_EXTENSIONS = {'zstd': '.zst', 'zlib': '.zz'}
+DEFAULT_CODEC = 'zstd' if zstandard else 'zlib'
+
+
+def canonical_params(params: Optional[Dict]) -> str:
+    """파라미터를 키 순서와 관계없이 같은 문자열로 변환 (인덱스 조회 키)"""
+    return json.dumps({key: str(value) for key, value in (params or {}).items()},
+                      sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+
+
+def _compressor(codec: str):
+    if codec == 'zstd':
+        return zstandard.ZstdCompressor(level=10).compressobj()
+    return zlib.compressobj(6)
+
+
+def _decompressor(codec: str):
+    if codec == 'zstd':
+        if zstandard is None:
+            raise ImportError("zstd로 압축된 본문을 읽으려면 zstandard 패키지가 필요합니다 (pip install zstandard)")
+        return zstandard.ZstdDecompressor().decompressobj()
+    return zlib.decompressobj()
+
+
+class BlobWriter:
+    """
+    응답 본문을 조각 단위로 받아 해시를 계산하면서 임시 파일에 압축 기록합니다.
+
+    commit()에서 같은 해시의 본문이 이미 있으면 임시 파일을 버리고 인덱스만 추가합니다.
+    """
+
+    def __init__(self, archive: 'RawArchive'):
+        self.archive = archive
+        self.codec = archive.codec
+        self.hash = hashlib.sha256()
+        self.size = 0
+        self._compressor = _compressor(self.codec)
+        fd, self._tmp_path = tempfile.mkstemp(dir=archive.tmp_dir, suffix='.part')
+        self._file = os.fdopen(fd, 'wb')
+
+    def write(self, chunk: bytes):
+        self.hash.update(chunk)
+        self.size += len(chunk)
+        self._file.write(self._compressor.compress(chunk))
+
+    def discard(self):
+        if not self._file.closed:
+            self._file.close()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+    def commit(self, endpoint: str, params: Optional[Dict], fetched_at: Optional[float] = None) -> str:
+        """본문 저장을 마치고 인덱스에 기록한 뒤 해시를 반환"""
+        self._file.write(self._compressor.flush())
+        self._file.close()
+        digest = self.hash.hexdigest()
+        try:
+            self.archive._store(digest, self.codec, self.size, self._tmp_path)
+        finally:
+            self.discard()
+        self.archive._index(endpoint, params, digest, fetched_at or time.time())
+        return digest
+
+
+class AsyncBlobWriter:
+    """
+    BlobWriter를 보관소의 기록 스레드에서 실행하는 래퍼 (이벤트 루프에서 사용)
+
+    write는 직전 조각의 기록이 끝나기를 기다린 뒤 다음 조각을 넘기므로 기록 대기 중인 조각은 하나뿐이고,
+    압축과 파일 기록은 다음 조각 수신과 겹쳐 진행됩니다.
+    """
+
+    def __init__(self, archive: 'RawArchive', writer: BlobWriter):
+        self.archive = archive
+        self._writer = writer
+        self._pending: Optional[asyncio.Future] = None
+
+    async def _drain(self):
+        if self._pending is not None:
+            pending, self._pending = self._pending, None
+            await pending
+
+    async def write(self, chunk: bytes):
+        await self._drain()
+        self._pending = self.archive.submit(self._writer.write, chunk)
+
+    async def commit(self, endpoint: str, params: Optional[Dict], fetched_at: Optional[float] = None) -> str:
+        await self._drain()
+        return await self.archive.submit(self._writer.commit, endpoint, params, fetched_at)
+
+    def discard(self):
+        """임시 파일 삭제를 기록 스레드에 넘김 (기다리지 않으므로 취소 처리 중에도 호출 가능)"""
+        self.archive._executor.submit(self._writer.discard)
+
+
+class RawArchive:
+    """
+    내용 주소 방식의 압축 원본 응답 보관소
+
+    본문은 root/blobs/<해시 앞 2자리>/<해시>.zst(.zz)에, 인덱스는 root/index.db에 저장합니다.
+    """
+
+    def __init__(self, root: str, codec: str = DEFAULT_CODEC):
+        """
+        Args:
+            root: 보관소 디렉터리 (없으면 생성)
+            codec: 새 본문의 압축 방식 (zstd, zlib). zstd는 zstandard 패키지가 필요합니다.
+        """
+        if codec not in CODEC_EXTENSIONS:
+            raise ValueError(f"지원하지 않는 압축 방식: {codec}")
+        if codec == 'zstd' and zstandard is None:
+            raise ImportError("zstd 압축에는 zstandard 패키지가 필요합니다 (pip install zstandard)")
+        self.root = root
+        self.codec = codec
+        self.blob_dir = os.path.join(root, 'blobs')
+        self.tmp_dir = os.path.join(root, 'tmp')
+        os.makedirs(self.blob_dir, exist_ok=True)
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(root, 'index.db'), timeout=30, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        # 크롤러의 압축/본문 기록/인덱스 기록은 이벤트 루프를 막지 않도록 전용 스레드 하나에서 순서대로 실행
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="raw_archive")
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _blob_path(self, digest: str, codec: str) -> str:
+        return os.path.join(self.blob_dir, digest[:2], digest + CODEC_EXTENSIONS[codec])
+
+    def _store(self, digest: str, codec: str, size: int, tmp_path: str):
+        if self.conn.execute("SELECT 1 FROM blobs WHERE digest = ?", (digest,)).fetchone():
+            return
+        path = self._blob_path(digest, codec)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        stored_size = os.path.getsize(tmp_path)
+        os.replace(tmp_path, path)
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO blobs (digest, codec, size, stored_size, first_seen) VALUES (?, ?, ?, ?, ?)",
+                (digest, codec, size, stored_size, time.time())
+            )
+
+    def _index(self, endpoint: str, params: Optional[Dict], digest: str, fetched_at: float):
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO responses (endpoint, params, fetched_at, digest) VALUES (?, ?, ?, ?)",
+                (endpoint, canonical_params(params), fetched_at, digest)
+            )
+
+    def writer(self) -> BlobWriter:
+        """스트리밍 응답을 기록할 BlobWriter"""
+        return BlobWriter(self)
+
+    def submit(self, func, *args) -> asyncio.Future:
+        """func를 기록 스레드에서 실행하고 이벤트 루프에서 기다릴 수 있는 Future를 반환"""
+        return asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def async_writer(self) -> AsyncBlobWriter:
+        """이벤트 루프에서 스트리밍 응답을 기록할 AsyncBlobWriter"""
+        return AsyncBlobWriter(self, await self.submit(BlobWriter, self))
+
+    async def put_async(self, endpoint: str, params: Optional[Dict], body: bytes,
+                        fetched_at: Optional[float] = None) -> str:
+        """put을 기록 스레드에서 실행"""
+        return await self.submit(self.put, endpoint, params, body, fetched_at)
+
+    def put(self, endpoint: str, params: Optional[Dict], body: bytes, fetched_at: Optional[float] = None) -> str:
+        """응답 본문 전체를 저장하고 해시를 반환"""
+        writer = self.writer()
+        try:
+            writer.write(body)
+        except BaseException:
+            writer.discard()
+            raise
+        return writer.commit(endpoint, params, fetched_at)
+
+    def lookup(self, endpoint: str, params: Optional[Dict], as_of: Optional[float] = None) -> Optional[str]:
+        """
+        요청에 해당하는 가장 최근 응답의 해시 (as_of를 지정하면 그 시각 이전 응답 중 가장 최근)
+        """
+        row = self.conn.execute(
+            "SELECT digest FROM responses WHERE endpoint = ? AND params = ? AND fetched_at <= ? "
+            "ORDER BY fetched_at DESC LIMIT 1",
+            (endpoint, canonical_params(params), as_of if as_of is not None else float('inf'))
+        ).fetchone()
+        return row['digest'] if row else None
+
+    def iter_chunks(self, digest: str, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """저장된 본문을 압축을 풀면서 조각 단위로 읽음"""
+        row = self.conn.execute("SELECT codec FROM blobs WHERE digest = ?", (digest,)).fetchone()
+        if row is None:
+            raise KeyError(digest)
+        decompressor = _decompressor(row['codec'])
+        with open(self._blob_path(digest, row['codec']), 'rb') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                data = decompressor.decompress(chunk)
+                if data:
+                    yield data
+        if hasattr(decompressor, 'flush'):
+            data = decompressor.flush()
+            if data:
+                yield data
+
+    def get(self, digest: str) -> bytes:
+        """저장된 본문 전체"""
+        return b''.join(self.iter_chunks(digest))
+
+    def responses(self, endpoint_prefix: str = '', since: Optional[float] = None,
+                  until: Optional[float] = None) -> List[Dict]:
+        """엔드포인트 접두사와 수집 시각으로 인덱스 조회"""
+        rows = self.conn.execute(
+            "SELECT endpoint, params, fetched_at, digest FROM responses "
+            "WHERE endpoint LIKE ? || '%' AND fetched_at >= ? AND fetched_at <= ? ORDER BY fetched_at",
+            (endpoint_prefix, since or 0, until if until is not None else float('inf'))
+        ).fetchall()
+        return [{**dict(row), 'params': json.loads(row['params'])} for row in rows]
+
+    def stats(self) -> Dict:
+        """응답 수, 고유 본문 수, 원본/저장 크기"""
+        responses, raw_bytes = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(b.size), 0) FROM responses r JOIN blobs b USING (digest)"
+        ).fetchone()
+        blobs, unique_bytes, stored_bytes = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(stored_size), 0) FROM blobs"
+        ).fetchone()
+        return {
+            'responses': responses,
+            'blobs': blobs,
+            'raw_bytes': raw_bytes,
+            'unique_bytes': unique_bytes,
+            'stored_bytes': stored_bytes,
+            'ratio': round(raw_bytes / stored_bytes, 2) if stored_bytes else None,
+        }
+
+
+async def replay(root: str, center_lat: float, center_lon: float, radius: float,
+                 as_of: Optional[float] = None, **options) -> Dict:
+    """보관소의 응답만으로 crawl_area를 다시 실행"""
+    from naver_real_estate_crawler import NaverRealEstateCrawler
+
+    crawler = NaverRealEstateCrawler()
+    crawler.archive = RawArchive(root)
+    crawler.offline = True
+    crawler.offline_as_of = as_of
+    try:
+        return await crawler.crawl_area(center_lat, center_lon, radius, **options)
+    finally:
+        crawler.archive.close()
+
+
+if __name__ == "__main__":
+    from naver_real_estate_crawler import configure_logging
+
+    parser = argparse.ArgumentParser(description="업스트림 원본 응답 보관소")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    stats_parser = subparsers.add_parser('stats', help="보관소 크기와 중복 제거 효과")
+    stats_parser.add_argument('root')
+
+    list_parser = subparsers.add_parser('list', help="저장된 응답 목록")
+    list_parser.add_argument('root')
+    list_parser.add_argument('--endpoint', default='', help="엔드포인트 접두사")
+
+    cat_parser = subparsers.add_parser('cat', help="본문 출력")
+    cat_parser.add_argument('root')
+    cat_parser.add_argument('digest')
+
+    replay_parser = subparsers.add_parser('replay', help="보관된 응답으로 지역 크롤링 재처리")
+    replay_parser.add_argument('root')
+    replay_parser.add_argument('--lat', type=float, required=True)
+    replay_parser.add_argument('--lon', type=float, required=True)
+    replay_parser.add_argument('--radius', type=float, default=0.01)
+    replay_parser.add_argument('--as-of', type=float, help="이 unix time 이전에 수집한 응답만 사용")
+    replay_parser.add_argument('--depth', default='full')
+    replay_parser.add_argument('--trade-types', default='A1', help="쉼표로 구분한 거래 타입")
+    replay_parser.add_argument('--out', help="결과 JSON 파일 (생략하면 요약만 출력)")
+    args = parser.parse_args()
+
+    if args.command == 'replay':
+        configure_logging()
+        started = time.perf_counter()
+        result = asyncio.run(replay(args.root, args.lat, args.lon, args.radius, args.as_of,
+                                    depth=args.depth, trade_types=args.trade_types.split(',')))
+        print(f"재처리 완료 ({time.perf_counter() - started:.2f}초): 단지 {len(result['complexes'])}개, "
+              f"매물 {sum(len(a) for a in result['articles'].values())}개")
+        if args.out:
+            with open(args.out, 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False, indent=2)
+    else:
+        with RawArchive(args.root) as archive:
+            if args.command == 'stats':
+                print(json.dumps(archive.stats(), ensure_ascii=False, indent=2))
+            elif args.command == 'list':
+                for entry in archive.responses(args.endpoint):
+                    print(f"{entry['fetched_at']:.0f}  {entry['digest'][:12]}  {entry['endpoint']}  "
+                          f"{json.dumps(entry['params'], ensure_ascii=False)}")
+            elif args.command == 'cat':
+                digest = args.digest
+                if len(digest) < 64:
+                    matches = archive.conn.execute(
+                        "SELECT digest FROM blobs WHERE digest LIKE ? || '%'", (digest,)
+                    ).fetchall()
+                    if len(matches) != 1:
+                        raise SystemExit(f"해시 접두사 {digest}에 해당하는 본문이 {len(matches)}개입니다")
+                    digest = matches[0]['digest']
+                sys.stdout.buffer.write(archive.get(digest))
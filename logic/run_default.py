@@ -1,8 +1,9 @@
+import argparse
 import asyncio
-from naver_real_estate_crawler import NaverRealEstateCrawler
+from naver_real_estate_crawler import NaverRealEstateCrawler, configure_logging
 import time
 
-async def run_with_defaults():
+async def run_with_defaults(profile: bool = False):
     """기본값으로 크롤러 실행"""
     print("=== 네이버 부동산 크롤러 (기본값 실행) ===")
     
@@ -14,6 +15,15 @@ async def run_with_defaults():
     print(f"크롤링 시작: 중심좌표 ({center_lat}, {center_lon}), 반경 {radius}")
     
     crawler = NaverRealEstateCrawler()
+    timestamp = int(time.time())
+    
+    # --profile 지정 시 CPU/메모리 프로파일링
+    profiler = None
+    if profile:
+        from profiling import CrawlProfiler
+        profiler = CrawlProfiler()
+        profiler.attach(crawler.tracer)
+        profiler.start()
     
     try:
         # 브라우저 및 세션 초기화
@@ -24,7 +34,6 @@ async def run_with_defaults():
         data = await crawler.crawl_area(center_lat, center_lon, radius)
         
         # 결과 저장
-        timestamp = int(time.time())
         json_filename = f'naver_real_estate_data_{timestamp}.json'
         
         crawler.save_to_json(data, json_filename)
@@ -67,6 +76,16 @@ async def run_with_defaults():
         traceback.print_exc()
     finally:
         await crawler.close()
+        if profiler:
+            profiler.stop()
+            files = profiler.save(f'naver_real_estate_profile_{timestamp}')
+            print(profiler.summary())
+            print(f"프로파일 저장: {', '.join(files)}")
 
 if __name__ == "__main__":
-    asyncio.run(run_with_defaults())
+    parser = argparse.ArgumentParser(description="네이버 부동산 크롤러 (기본값 실행)")
+    parser.add_argument('--profile', action='store_true', help="CPU/메모리 프로파일을 수집합니다")
+    args = parser.parse_args()
+    
+    configure_logging()
+    asyncio.run(run_with_defaults(profile=args.profile))
@@ -0,0 +1,346 @@
+import asyncio
+import hashlib
+import heapq
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+
+from naver_real_estate_crawler import NaverRealEstateCrawler, configure_logging
+
+logger = logging.getLogger(__name__)
+
+MIN_INTERVAL = 10 * 60            # 최소 갱신 간격 (초)
+MAX_INTERVAL = 7 * 24 * 60 * 60   # 최대 갱신 간격 (초)
+DEFAULT_INTERVAL = 6 * 60 * 60    # 처음 등록된 대상의 갱신 간격 (초)
+CHECKS_PER_CHANGE = 2.0           # 변경 한 번당 확인 횟수 목표
+RATE_SMOOTHING = 0.3              # 변경률 지수이동평균 가중치
+SESSION_MAX_AGE = 30 * 60         # 브라우저 세션(쿠키) 재발급 주기 (초)
+REGISTRY_POLL_INTERVAL = 60       # 실행 중 레지스트리 파일에서 새 대상을 확인하는 간격 (초)
+
+# 대상 종류별 초기 요청 수 추정치 (실행 후에는 실제 요청 수로 갱신)
+INITIAL_COST = {
+    'region': 4 + 5 * 2,  # 마커 + 개발계획 3종 + 단지 5개의 상세/매물
+    'complex': 1,         # 거래 타입별 매물 요청
+}
+
+
+@dataclass
+class CrawlTarget:
+    """주기적으로 갱신할 지역 또는 단지"""
+
+    target_id: str
+    kind: str                     # region, complex
+    params: Dict                  # region: center_lat/center_lon/radius, complex: complex_no/trade_types
+    weight: float = 1.0           # 같은 시각에 만기된 대상 사이의 우선순위 (클수록 먼저)
+    interval: float = DEFAULT_INTERVAL
+    change_rate: float = 0.0      # 추정 변경률 (회/초)
+    cost: float = 0.0             # 최근 실행의 요청 수
+    next_due: float = 0.0
+    last_run: Optional[float] = None
+    fingerprint: Optional[str] = None
+    runs: int = 0
+    changes: int = 0
+
+    def estimated_cost(self) -> float:
+        return self.cost or INITIAL_COST[self.kind]
+
+    def record_run(self, fingerprint: str, cost: float, now: float):
+        """
+        실행 결과를 반영해 변경률과 다음 갱신 간격을 다시 계산합니다.
+
+        변경 여부를 직전 실행 이후 경과 시간으로 나눈 값을 변경률 표본으로 보고 지수이동평균을 구한 뒤,
+        변경 한 번당 CHECKS_PER_CHANGE번 확인하도록 간격을 정합니다.
+        """
+        changed = self.fingerprint is not None and fingerprint != self.fingerprint
+        if self.last_run is not None:
+            elapsed = max(now - self.last_run, 1.0)
+            sample = (1.0 if changed else 0.0) / elapsed
+            self.change_rate = RATE_SMOOTHING * sample + (1 - RATE_SMOOTHING) * self.change_rate
+
+        if self.change_rate > 0:
+            self.interval = 1.0 / (self.change_rate * CHECKS_PER_CHANGE)
+        elif self.last_run is not None:
+            self.interval *= 1.5
+        self.interval = min(max(self.interval, MIN_INTERVAL), MAX_INTERVAL)
+
+        self.fingerprint = fingerprint
+        self.cost = cost
+        self.last_run = now
+        self.next_due = now + self.interval
+        self.runs += 1
+        self.changes += int(changed)
+
+
+class RequestBudget:
+    """시간당 요청 수를 제한하는 토큰 버킷"""
+
+    def __init__(self, requests_per_hour: float, burst: Optional[float] = None):
+        self.rate = requests_per_hour / 3600.0
+        self.capacity = burst or max(requests_per_hour / 12.0, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, cost: float):
+        """cost만큼 토큰이 찰 때까지 기다린 뒤 차감합니다. 용량보다 큰 비용은 용량까지만 기다립니다."""
+        cost = min(cost, self.capacity)
+        self._refill()
+        while self.tokens < cost:
+            await asyncio.sleep((cost - self.tokens) / self.rate)
+            self._refill()
+        self.tokens -= cost
+
+    def refund(self, amount: float):
+        """추정보다 적게 사용한 토큰을 돌려줍니다."""
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class CrawlScheduler:
+    """
+    변경 빈도에 맞춰 지역/단지를 반복 크롤링하는 스케줄러
+
+    대상은 다음 만기 시각 순서의 우선순위 큐에서 꺼내며, 모든 요청은 전역 요청 예산(토큰 버킷)
+    안에서 실행됩니다. 자주 바뀌는 대상은 짧은 간격으로, 바뀌지 않는 대상은 점점 긴 간격으로 갱신합니다.
+    """
+
+    def __init__(self,
+                 registry_path: str = "crawl_registry.json",
+                 requests_per_hour: float = 600,
+                 history_db: Optional[str] = None):
+        """
+        Args:
+            registry_path: 대상 목록과 학습된 간격을 저장하는 JSON 파일
+            requests_per_hour: 전역 요청 예산 (시간당 요청 수)
+            history_db: 지정하면 수집 결과를 가격 이력 저장소에 누적
+        """
+        self.registry_path = registry_path
+        self.budget = RequestBudget(requests_per_hour)
+        self.history_db = history_db
+        self.targets: Dict[str, CrawlTarget] = {}
+        self.crawler: Optional[NaverRealEstateCrawler] = None
+        self.session_started = 0.0
+        self.load()
+
+    def _read_registry(self) -> Dict[str, CrawlTarget]:
+        if not os.path.exists(self.registry_path):
+            return {}
+        with open(self.registry_path, encoding='utf-8') as f:
+            registry = json.load(f)
+        return {entry['target_id']: CrawlTarget(**entry) for entry in registry.get('targets', [])}
+
+    def load(self):
+        """레지스트리 파일에서 대상 목록을 읽습니다."""
+        self.targets = self._read_registry()
+
+    def merge_registry(self) -> List[CrawlTarget]:
+        """
+        실행 중에 다른 프로세스(add-region/add-complex)가 레지스트리 파일에 등록한 대상을 반영합니다.
+
+        새 대상은 그대로 추가하고, 다시 등록된 대상은 학습된 간격을 유지한 채 params와 weight만 바꿉니다.
+
+        Returns:
+            새로 예약해야 하는 대상 목록
+        """
+        changed = []
+        for target_id, stored in self._read_registry().items():
+            target = self.targets.get(target_id)
+            if target is None:
+                self.targets[target_id] = stored
+                changed.append(stored)
+            elif (stored.params, stored.weight) != (target.params, target.weight):
+                target.params, target.weight = stored.params, stored.weight
+                changed.append(target)
+        return changed
+
+    def save(self):
+        """
+        레지스트리 파일을 원자적으로 저장합니다.
+
+        파일에만 있는 대상(저장 사이에 다른 프로세스가 등록한 대상)은 지우지 않고 함께 씁니다.
+        """
+        targets = {**self._read_registry(), **self.targets}
+        temp_path = f"{self.registry_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'targets': [asdict(target) for target in targets.values()]},
+                      f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.registry_path)
+
+    def add_region(self, name: str, center_lat: float, center_lon: float, radius: float = 0.01, weight: float = 1.0):
+        """지역 대상 등록"""
+        target_id = f"region:{name}"
+        self.targets[target_id] = CrawlTarget(
+            target_id, 'region', {'center_lat': center_lat, 'center_lon': center_lon, 'radius': radius},
+            weight=weight
+        )
+
+    def add_complex(self, complex_no: str, trade_types: Optional[List[str]] = None, weight: float = 1.0):
+        """단지 대상 등록"""
+        target_id = f"complex:{complex_no}"
+        trade_types = trade_types or ["A1"]
+        self.targets[target_id] = CrawlTarget(
+            target_id, 'complex', {'complex_no': str(complex_no), 'trade_types': trade_types},
+            weight=weight, cost=float(len(trade_types))
+        )
+
+    async def _ensure_crawler(self):
+        """브라우저 세션을 준비하고 SESSION_MAX_AGE가 지나면 재발급합니다."""
+        if self.crawler and time.time() - self.session_started < SESSION_MAX_AGE:
+            return
+        if self.crawler:
+            await self.crawler.close()
+        self.crawler = NaverRealEstateCrawler()
+        await self.crawler.init_browser(headless=True)
+        await self.crawler.init_session()
+        self.session_started = time.time()
+
+    async def _reset_crawler(self):
+        """오류 후 세션을 버려 다음 실행에서 _ensure_crawler가 새 브라우저 세션을 만들게 합니다."""
+        crawler, self.crawler = self.crawler, None
+        self.session_started = 0.0
+        if crawler:
+            try:
+                await crawler.close()
+            except Exception as e:
+                logger.warning(f"크롤러 종료 중 오류: {e}")
+
+    @staticmethod
+    def _fingerprint(records: List) -> str:
+        digest = hashlib.sha1(json.dumps(records, ensure_ascii=False, sort_keys=True).encode('utf-8'))
+        return digest.hexdigest()
+
+    async def run_target(self, target: CrawlTarget) -> Tuple[Dict, str]:
+        """대상 하나를 크롤링하고 (결과, 변경 지문)을 반환합니다."""
+        if target.kind == 'region':
+            data = await self.crawler.crawl_area(**target.params)
+            fingerprint = self._fingerprint(sorted(
+                (c.get('markerId'), c.get('dealCount'), c.get('leaseCount'), c.get('rentCount'),
+                 c.get('minDealPrice'), c.get('maxDealPrice'))
+                for c in data['complexes']
+            ))
+        else:
+            complex_no = target.params['complex_no']
+            articles = []
+            for trade_type in target.params['trade_types']:
+                articles.extend(await self.crawler.get_complex_articles(complex_no, trade_type))
+            data = {'complexes': [], 'complex_details': {}, 'articles': {complex_no: articles}}
+            fingerprint = self._fingerprint(sorted(
+                (a.get('articleNo'), a.get('dealOrWarrantPrc'), a.get('rentPrc')) for a in articles
+            ))
+        return data, fingerprint
+
+    def _request_count(self) -> int:
+        return sum(self.crawler.request_counts.values())
+
+    def _schedule(self, queue: List, targets: List[CrawlTarget]):
+        for target in targets:
+            heapq.heappush(queue, (target.next_due, -target.weight, target.target_id))
+
+    async def run_forever(self, max_runs: Optional[int] = None):
+        """
+        만기된 대상을 예산 안에서 계속 실행합니다.
+
+        기다리는 동안 REGISTRY_POLL_INTERVAL마다 레지스트리 파일을 다시 읽어 CLI로 추가된 대상을 예약합니다.
+
+        Args:
+            max_runs: 지정하면 이 횟수만큼 실행한 뒤 종료
+        """
+        queue = []
+        self._schedule(queue, list(self.targets.values()))
+        runs = 0
+
+        try:
+            while max_runs is None or runs < max_runs:
+                if not queue:
+                    await asyncio.sleep(REGISTRY_POLL_INTERVAL)
+                    self._schedule(queue, self.merge_registry())
+                    continue
+                due, _, target_id = heapq.heappop(queue)
+                target = self.targets.get(target_id)
+                if target is None or target.next_due != due:
+                    continue  # 삭제되었거나 다시 예약된 항목
+
+                wait = due - time.time()
+                if wait > 0:
+                    # 기다리는 사이 등록된 대상이 더 먼저 만기될 수 있으므로 나눠 기다리며 다시 확인
+                    await asyncio.sleep(min(wait, REGISTRY_POLL_INTERVAL))
+                    self._schedule(queue, self.merge_registry())
+                    heapq.heappush(queue, (due, -target.weight, target_id))
+                    continue
+
+                estimated = target.estimated_cost()
+                await self.budget.acquire(estimated)
+
+                requests_before = None
+                try:
+                    await self._ensure_crawler()
+                    requests_before = self._request_count()
+                    data, fingerprint = await self.run_target(target)
+                except Exception as e:
+                    # 실제로 보낸 요청만 예산에서 차감하고, 다음 실행은 새 세션으로 시작
+                    cost = self._request_count() - requests_before if requests_before is not None else 0
+                    self.budget.refund(max(estimated - cost, 0))
+                    logger.error(f"{target_id} 크롤링 중 오류 (요청 {cost}회): {e}")
+                    target.next_due = time.time() + MIN_INTERVAL
+                    await self._reset_crawler()
+                else:
+                    cost = self._request_count() - requests_before
+                    self.budget.refund(max(estimated - cost, 0))
+                    target.record_run(fingerprint, cost, time.time())
+                    logger.info(f"{target_id} 갱신 완료 (요청 {cost}회, 다음 간격 {target.interval / 60:.0f}분)")
+                    if self.history_db:
+                        self.crawler.save_to_history(data, self.history_db)
+
+                if self.crawler:
+                    self.crawler.tracer.reset()
+                self._schedule(queue, [target, *self.merge_registry()])
+                self.save()
+                runs += 1
+        finally:
+            if self.crawler:
+                await self.crawler.close()
+                self.crawler = None
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="네이버 부동산 반복 크롤링 스케줄러")
+    parser.add_argument('--registry', default="crawl_registry.json", help="대상 레지스트리 파일")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    region_parser = subparsers.add_parser('add-region', help="지역 대상 등록")
+    region_parser.add_argument('name')
+    region_parser.add_argument('center_lat', type=float)
+    region_parser.add_argument('center_lon', type=float)
+    region_parser.add_argument('--radius', type=float, default=0.01)
+    region_parser.add_argument('--weight', type=float, default=1.0)
+
+    complex_parser = subparsers.add_parser('add-complex', help="단지 대상 등록")
+    complex_parser.add_argument('complex_no')
+    complex_parser.add_argument('--trade-types', default="A1", help="쉼표로 구분 (예: A1,B1,B2)")
+    complex_parser.add_argument('--weight', type=float, default=1.0)
+
+    run_parser = subparsers.add_parser('run', help="스케줄러 실행")
+    run_parser.add_argument('--budget', type=float, default=600, help="시간당 요청 수")
+    run_parser.add_argument('--history-db', help="수집 결과를 누적할 SQLite 파일")
+
+    args = parser.parse_args()
+    configure_logging()
+    if args.command == 'run':
+        scheduler = CrawlScheduler(args.registry, args.budget, args.history_db)
+        asyncio.run(scheduler.run_forever())
+    else:
+        scheduler = CrawlScheduler(args.registry)
+        if args.command == 'add-region':
+            scheduler.add_region(args.name, args.center_lat, args.center_lon, args.radius, args.weight)
+        else:
+            scheduler.add_complex(args.complex_no, args.trade_types.split(','), args.weight)
+        scheduler.save()
+        print(f"{len(scheduler.targets)}개 대상 등록됨")
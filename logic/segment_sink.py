@@ -0,0 +1,303 @@
+import csv
+import json
+import os
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+MANIFEST_FORMAT = 'naver-segments/1'
+MANIFEST_FILE = 'manifest.json'
+DEFAULT_SEGMENT_BYTES = 64 * 1024 * 1024  # 세그먼트 파일 하나의 최대 크기
+
+# 섹션 이름과 키 사용 여부 (키가 있는 섹션은 {키: 값} 형태로 복원)
+SECTIONS = {
+    'complexes': False,
+    'complex_details': True,
+    'articles': True,
+    'development_plans.road': False,
+    'development_plans.rail': False,
+    'development_plans.jigu': False,
+}
+
+
+class MemorySink:
+    """crawl_area 결과를 기존과 같은 dict로 모으는 싱크"""
+
+    def __init__(self):
+        self.area_info: Dict = {}
+        self.result = {
+            'area_info': self.area_info,
+            'complexes': [],
+            'complex_details': {},
+            'articles': {},
+            'development_plans': {
+                'road': [],
+                'rail': [],
+                'jigu': []
+            }
+        }
+
+    def write(self, section: str, record: Any, key: Optional[str] = None):
+        if section == 'complex_details':
+            self.result['complex_details'][key] = record
+        elif SECTIONS[section]:
+            self.result[section].setdefault(key, []).append(record)
+        elif section.startswith('development_plans.'):
+            self.result['development_plans'][section.split('.', 1)[1]].append(record)
+        else:
+            self.result[section].append(record)
+
+    def write_many(self, section: str, records: List, key: Optional[str] = None):
+        for record in records:
+            self.write(section, record, key)
+
+    def close(self) -> Dict:
+        self.result['area_info'] = self.area_info
+        return self.result
+
+
+class SegmentSink:
+    """
+    크롤링 레코드를 도착하는 대로 섹션별 NDJSON 세그먼트 파일에 기록하는 싱크
+
+    세그먼트는 max_segment_bytes를 넘으면 다음 파일로 넘어가고, close()는 파일 목록과
+    레코드 수만 담은 매니페스트를 반환하므로 메모리 사용량은 영역 크기와 무관합니다.
+    키가 있는 섹션은 한 줄에 [키, 레코드]를 기록합니다.
+    """
+
+    def __init__(self, directory: str, max_segment_bytes: int = DEFAULT_SEGMENT_BYTES):
+        """
+        Args:
+            directory: 세그먼트와 매니페스트를 저장할 디렉토리 (없으면 생성)
+            max_segment_bytes: 세그먼트 파일 하나의 최대 크기
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = os.path.abspath(directory)
+        self.max_segment_bytes = max_segment_bytes
+        self.area_info: Dict = {}
+        self.sections = {section: {'keyed': keyed, 'records': 0, 'segments': []}
+                         for section, keyed in SECTIONS.items()}
+        self._files: Dict[str, Any] = {}
+        self._sizes: Dict[str, int] = {}
+
+    def _open_segment(self, section: str):
+        if section in self._files:
+            self._files[section].close()
+        name = f"{section}-{len(self.sections[section]['segments']):05d}.ndjson"
+        self.sections[section]['segments'].append(name)
+        self._files[section] = open(os.path.join(self.directory, name), 'w', encoding='utf-8')
+        self._sizes[section] = 0
+
+    def write(self, section: str, record: Any, key: Optional[str] = None):
+        info = self.sections[section]
+        line = json.dumps([key, record] if info['keyed'] else record, ensure_ascii=False) + '\n'
+        if section not in self._files or self._sizes[section] + len(line) > self.max_segment_bytes:
+            self._open_segment(section)
+        self._files[section].write(line)
+        self._sizes[section] += len(line)
+        info['records'] += 1
+
+    def write_many(self, section: str, records: List, key: Optional[str] = None):
+        for record in records:
+            self.write(section, record, key)
+
+    def close(self) -> Dict:
+        """세그먼트를 닫고 매니페스트를 저장한 뒤 반환"""
+        for f in self._files.values():
+            f.close()
+        self._files.clear()
+        manifest = {
+            'format': MANIFEST_FORMAT,
+            'directory': self.directory,
+            'area_info': self.area_info,
+            'sections': self.sections,
+        }
+        with open(os.path.join(self.directory, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        return manifest
+
+
+def is_manifest(data: Dict) -> bool:
+    """crawl_area(sink=SegmentSink(...))가 반환한 매니페스트인지 여부"""
+    return isinstance(data, dict) and data.get('format') == MANIFEST_FORMAT
+
+
+def load_manifest(directory: str) -> Dict:
+    with open(os.path.join(directory, MANIFEST_FILE), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def iter_section(manifest: Dict, section: str) -> Iterator:
+    """섹션의 레코드를 세그먼트 순서대로 읽습니다. 키가 있는 섹션은 (키, 레코드)를 반환합니다."""
+    info = manifest['sections'][section]
+    for name in info['segments']:
+        with open(os.path.join(manifest['directory'], name), encoding='utf-8') as f:
+            for line in f:
+                value = json.loads(line)
+                yield tuple(value) if info['keyed'] else value
+
+
+def iter_grouped(manifest: Dict, section: str) -> Iterator[Tuple[str, List]]:
+    """키가 있는 섹션을 연속된 같은 키끼리 묶어 (키, 레코드 목록)으로 읽습니다."""
+    current_key, group = None, []
+    for key, record in iter_section(manifest, section):
+        if group and key != current_key:
+            yield current_key, group
+            group = []
+        current_key = key
+        group.append(record)
+    if group:
+        yield current_key, group
+
+
+def iter_articles(manifest: Dict) -> Iterator[Dict]:
+    """매물 레코드에 complex_no를 붙여 하나씩 읽습니다."""
+    for complex_no, article in iter_section(manifest, 'articles'):
+        yield {**article, 'complex_no': complex_no}
+
+
+def load_result(manifest: Dict) -> Dict:
+    """세그먼트 전체를 기존 crawl_area 결과 dict로 읽습니다. (작은 영역 전용)"""
+    sink = MemorySink()
+    sink.area_info = manifest['area_info']
+    for section, keyed in SECTIONS.items():
+        for value in iter_section(manifest, section):
+            if keyed:
+                sink.write(section, value[1], value[0])
+            else:
+                sink.write(section, value)
+    return sink.close()
+
+
+def _scalar(value):
+    """표 형식 파일에 쓸 수 있도록 목록/객체 값은 JSON 문자열로 변환"""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def _columns(records: Iterator[Dict]) -> List[str]:
+    """레코드에 등장하는 키를 처음 등장한 순서대로 모읍니다. (1차 패스)"""
+    columns = {}
+    for record in records:
+        for key in record:
+            columns.setdefault(key, None)
+    return list(columns)
+
+
+def write_json(manifest: Dict, filename: str):
+    """세그먼트를 기존 save_to_json과 같은 구조의 JSON 파일로 스트리밍 저장"""
+    def dumps(value):
+        return json.dumps(value, ensure_ascii=False)
+
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write('{\n"area_info": ' + dumps(manifest['area_info']))
+
+        f.write(',\n"complexes": [')
+        for i, record in enumerate(iter_section(manifest, 'complexes')):
+            f.write((',\n' if i else '\n') + dumps(record))
+        f.write('\n]')
+
+        f.write(',\n"complex_details": {')
+        for i, (key, record) in enumerate(iter_section(manifest, 'complex_details')):
+            f.write((',\n' if i else '\n') + dumps(str(key)) + ': ' + dumps(record))
+        f.write('\n}')
+
+        f.write(',\n"articles": {')
+        for i, (key, articles) in enumerate(iter_grouped(manifest, 'articles')):
+            f.write((',\n' if i else '\n') + dumps(str(key)) + ': [')
+            for j, article in enumerate(articles):
+                f.write((',\n' if j else '\n') + dumps(article))
+            f.write('\n]')
+        f.write('\n}')
+
+        f.write(',\n"development_plans": {')
+        for i, plan_type in enumerate(['road', 'rail', 'jigu']):
+            f.write((',\n' if i else '\n') + dumps(plan_type) + ': [')
+            for j, plan in enumerate(iter_section(manifest, f'development_plans.{plan_type}')):
+                f.write((',\n' if j else '\n') + dumps(plan))
+            f.write('\n]')
+        f.write('\n}\n}\n')
+
+
+def write_csv(manifest: Dict, filename: str):
+    """매물 세그먼트를 CSV로 저장 (컬럼 수집과 기록, 두 번 읽음)"""
+    columns = _columns(iter_articles(manifest))
+    with open(filename, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        for article in iter_articles(manifest):
+            writer.writerow({key: _scalar(value) for key, value in article.items()})
+
+
+def write_excel(manifest: Dict, filename: str):
+    """세그먼트를 save_to_excel과 같은 시트 구성으로 저장 (openpyxl write-only 모드)"""
+    from openpyxl import Workbook
+
+    def iter_records(section):
+        if section == 'articles':
+            return iter_articles(manifest)
+        return iter_section(manifest, section)
+
+    sheets = [('complexes', '단지정보'), ('articles', '매물정보')] + [
+        (f'development_plans.{plan_type}', f'{plan_type}_개발계획') for plan_type in ['road', 'rail', 'jigu']
+    ]
+
+    workbook = Workbook(write_only=True)
+    for section, sheet_name in sheets:
+        if not manifest['sections'][section]['records']:
+            continue
+        columns = _columns(iter_records(section))
+        sheet = workbook.create_sheet(sheet_name)
+        sheet.append(columns)
+        for record in iter_records(section):
+            sheet.append([_scalar(record.get(column)) for column in columns])
+    if not workbook.worksheets:
+        workbook.create_sheet('단지정보')
+    workbook.save(filename)
+
+
+def write_parquet(manifest: Dict, filename: str, batch_size: int = 10000):
+    """매물 세그먼트를 Parquet로 저장 (pyarrow 필요). 1차 패스에서 컬럼 타입을 정한 뒤 배치 단위로 기록합니다."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    kinds: Dict[str, set] = {}
+    for article in iter_articles(manifest):
+        for key, value in article.items():
+            kind = kinds.setdefault(key, set())
+            if value is not None:
+                kind.add(bool if isinstance(value, bool) else int if isinstance(value, int)
+                         else float if isinstance(value, float) else str)
+
+    def arrow_type(kind):
+        if kind == {bool}:
+            return pa.bool_()
+        if kind == {int}:
+            return pa.int64()
+        if kind and kind <= {int, float}:
+            return pa.float64()
+        return pa.string()
+
+    schema = pa.schema([(column, arrow_type(kind)) for column, kind in kinds.items()])
+    converters = {
+        field.name: (lambda v: None if v is None else str(_scalar(v))) if field.type == pa.string()
+        else (lambda v: None if v is None else float(v)) if field.type == pa.float64()
+        else (lambda v: v)
+        for field in schema
+    }
+
+    with pq.ParquetWriter(filename, schema) as writer:
+        batch: List[Dict] = []
+        for article in iter_articles(manifest):
+            batch.append(article)
+            if len(batch) >= batch_size:
+                writer.write_table(_parquet_table(batch, schema, converters))
+                batch = []
+        if batch or not manifest['sections']['articles']['records']:
+            writer.write_table(_parquet_table(batch, schema, converters))
+
+
+def _parquet_table(batch: List[Dict], schema, converters):
+    import pyarrow as pa
+
+    columns = {name: [converters[name](record.get(name)) for record in batch] for name in schema.names}
+    return pa.Table.from_pydict(columns, schema=schema)
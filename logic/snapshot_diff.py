@@ -0,0 +1,198 @@
+"""
+두 크롤링 결과 사이의 변경 사항 (스트리밍 diff)
+
+save_to_json 파일 또는 세그먼트 디렉토리 두 개를 읽어 단지는 markerId, 매물은 articleNo로 맞춰보고
+추가/삭제/가격 변경 레코드를 차례로 돌려줍니다. 이전 결과가 메모리 한도보다 크면 양쪽을 키 해시로
+디스크 파티션에 나눠 쓴 뒤 파티션마다 해시 조인하므로(grace hash join) 메모리에는 이전 결과의
+파티션 하나만 올라갑니다.
+
+    python snapshot_diff.py naver_real_estate_data_1750840128.json naver_real_estate_data_1750840236.json
+    python snapshot_diff.py old_segments/ new_segments/ --out diff.jsonl --memory-mb 32
+"""
+import json
+import math
+import os
+import tempfile
+import zlib
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+import segment_sink
+from json_stream import iter_json_file_items
+from price_utils import parse_korean_price
+
+# 비교하는 가격 필드 (단지 마커 / 매물)
+COMPLEX_PRICE_FIELDS = (
+    'minDealPrice', 'maxDealPrice', 'medianDealPrice',
+    'minDealUnitPrice', 'maxDealUnitPrice', 'medianDealUnitPrice',
+    'minLeasePrice', 'maxLeasePrice', 'minRentPrice', 'maxRentPrice',
+)
+ARTICLE_PRICE_FIELDS = ('dealOrWarrantPrc', 'rentPrc')
+
+CHANGES = ('added', 'removed', 'changed')
+KINDS = ('complex', 'article')
+
+# 이전 결과를 메모리에 올릴 때의 기본 한도 (파일 크기 기준)
+DEFAULT_MEMORY_BYTES = 64 << 20
+
+# (종류, 키, 단지 번호, 레코드)
+Entry = Tuple[str, str, Optional[str], Dict]
+
+
+def iter_snapshot(path: str) -> Iterator[Entry]:
+    """save_to_json 파일 또는 세그먼트 디렉토리의 단지/매물을 하나씩 읽습니다."""
+    if os.path.isdir(path):
+        manifest = segment_sink.load_manifest(path)
+        for record in segment_sink.iter_section(manifest, 'complexes'):
+            if record.get('markerId') is not None:
+                yield 'complex', str(record['markerId']), str(record['markerId']), record
+        for complex_no, record in segment_sink.iter_section(manifest, 'articles'):
+            if record.get('articleNo') is not None:
+                yield 'article', str(record['articleNo']), str(complex_no), record
+        return
+
+    for item_path, record in iter_json_file_items(path, 'complexes.item', 'articles.*.item'):
+        if item_path[0] == 'complexes':
+            if record.get('markerId') is not None:
+                yield 'complex', str(record['markerId']), str(record['markerId']), record
+        elif record.get('articleNo') is not None:
+            yield 'article', str(record['articleNo']), item_path[1], record
+
+
+def snapshot_size(path: str) -> int:
+    """파일 크기 (세그먼트 디렉토리는 세그먼트 파일 크기 합)"""
+    if not os.path.isdir(path):
+        return os.path.getsize(path)
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+
+def _price(kind: str, value: Any) -> Optional[float]:
+    if kind == 'article':
+        return parse_korean_price(value)
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def price_deltas(kind: str, old: Dict, new: Dict) -> Dict[str, Dict]:
+    """가격 필드별 {'old', 'new', 'delta'} (값이 같은 필드는 제외, 매물 가격은 만원 단위로 해석)"""
+    fields = {}
+    for field in (COMPLEX_PRICE_FIELDS if kind == 'complex' else ARTICLE_PRICE_FIELDS):
+        old_value, new_value = old.get(field), new.get(field)
+        old_price, new_price = _price(kind, old_value), _price(kind, new_value)
+        if old_price == new_price and (old_price is not None or old_value == new_value):
+            continue
+        fields[field] = {
+            'old': old_value,
+            'new': new_value,
+            'delta': new_price - old_price if old_price is not None and new_price is not None else None,
+        }
+    return fields
+
+
+def _event(change: str, kind: str, key: str, complex_no: Optional[str], **extra) -> Dict:
+    return {'change': change, 'kind': kind, 'key': key, 'complex_no': complex_no, **extra}
+
+
+def _join(old_entries: Iterable[Entry], new_entries: Iterable[Entry]) -> Iterator[Dict]:
+    """이전 쪽으로 해시 테이블을 만들고 새 쪽을 흘려보내며 비교 (이전 레코드는 JSON 문자열로 보관)"""
+    table: Dict[Tuple[str, str], str] = {}
+    for kind, key, complex_no, record in old_entries:
+        table[kind, key] = json.dumps([complex_no, record], ensure_ascii=False, separators=(',', ':'))
+
+    for kind, key, complex_no, record in new_entries:
+        old = table.pop((kind, key), None)
+        if old is None:
+            yield _event('added', kind, key, complex_no, record=record)
+            continue
+        old_complex_no, old_record = json.loads(old)
+        fields = price_deltas(kind, old_record, record)
+        if fields:
+            yield _event('changed', kind, key, complex_no, fields=fields)
+
+    for (kind, key), old in table.items():
+        old_complex_no, old_record = json.loads(old)
+        yield _event('removed', kind, key, old_complex_no, record=old_record)
+
+
+class _PartitionFiles:
+    """항목을 키 해시로 나눠 JSON Lines 파일 여러 개에 기록"""
+
+    def __init__(self, directory: str, prefix: str, count: int):
+        self.paths = [os.path.join(directory, f"{prefix}_{i:04d}.jsonl") for i in range(count)]
+        self._files = [open(path, 'w', encoding='utf-8') for path in self.paths]
+
+    def write_all(self, entries: Iterable[Entry]):
+        count = len(self._files)
+        try:
+            for entry in entries:
+                partition = zlib.crc32(f"{entry[0]}:{entry[1]}".encode('utf-8')) % count
+                self._files[partition].write(json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n')
+        finally:
+            for f in self._files:
+                f.close()
+
+
+def _read_partition(path: str) -> Iterator[Entry]:
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            yield tuple(json.loads(line))
+
+
+def diff_snapshots(old_path: str, new_path: str, partitions: Optional[int] = None,
+                   memory_bytes: int = DEFAULT_MEMORY_BYTES, work_dir: Optional[str] = None) -> Iterator[Dict]:
+    """
+    두 크롤링 결과의 변경 사항을 하나씩 돌려줍니다.
+
+    이벤트는 {'change': 'added'|'removed'|'changed', 'kind': 'complex'|'article', 'key', 'complex_no', ...}이며
+    added/removed는 'record', changed는 가격 필드별 'fields'({'old', 'new', 'delta'})를 가집니다.
+    파티션을 나누면 이벤트는 파티션 순서로 나옵니다.
+
+    Args:
+        old_path: 이전 결과 (save_to_json 파일 또는 세그먼트 디렉토리)
+        new_path: 새 결과
+        partitions: 파티션 수 (생략하면 이전 결과 크기 / memory_bytes)
+        memory_bytes: 파티션 하나의 목표 크기
+        work_dir: 파티션 파일을 만들 위치 (생략하면 시스템 임시 디렉토리)
+    """
+    if partitions is None:
+        partitions = max(1, math.ceil(snapshot_size(old_path) / memory_bytes))
+    if partitions == 1:
+        yield from _join(iter_snapshot(old_path), iter_snapshot(new_path))
+        return
+
+    with tempfile.TemporaryDirectory(prefix="snapshot_diff_", dir=work_dir) as directory:
+        old_files = _PartitionFiles(directory, 'old', partitions)
+        old_files.write_all(iter_snapshot(old_path))
+        new_files = _PartitionFiles(directory, 'new', partitions)
+        new_files.write_all(iter_snapshot(new_path))
+        for old_partition, new_partition in zip(old_files.paths, new_files.paths):
+            yield from _join(_read_partition(old_partition), _read_partition(new_partition))
+            os.remove(old_partition)
+            os.remove(new_partition)
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="두 크롤링 결과 사이의 추가/삭제/가격 변경")
+    parser.add_argument('old', help="이전 결과 (save_to_json 파일 또는 세그먼트 디렉토리)")
+    parser.add_argument('new', help="새 결과")
+    parser.add_argument('--out', help="변경 사항을 JSON Lines로 저장할 파일 (생략하면 표준 출력)")
+    parser.add_argument('--kind', choices=KINDS, help="단지 또는 매물만")
+    parser.add_argument('--change', choices=CHANGES, help="추가/삭제/변경 중 하나만")
+    parser.add_argument('--partitions', type=int, help="파티션 수 (생략하면 크기로 결정)")
+    parser.add_argument('--memory-mb', type=int, default=DEFAULT_MEMORY_BYTES >> 20, help="파티션 하나의 목표 크기")
+    args = parser.parse_args()
+
+    out = open(args.out, 'w', encoding='utf-8') if args.out else sys.stdout
+    summary = {kind: dict.fromkeys(CHANGES, 0) for kind in KINDS}
+    try:
+        for event in diff_snapshots(args.old, args.new, args.partitions, args.memory_mb << 20):
+            if (args.kind and event['kind'] != args.kind) or (args.change and event['change'] != args.change):
+                continue
+            summary[event['kind']][event['change']] += 1
+            out.write(json.dumps(event, ensure_ascii=False) + '\n')
+    finally:
+        if args.out:
+            out.close()
+    for kind, counts in summary.items():
+        print(f"{kind}: " + ", ".join(f"{change} {count}" for change, count in counts.items()), file=sys.stderr)
@@ -0,0 +1,366 @@
+"""
+대규모 합성 데이터 생성기
+
+업스트림 응답과 같은 구조(단지 마커, 단지 상세, 매물, 개발계획)와 한글 가격 표기를 가진 데이터를 시드로
+재현 가능하게 만듭니다. 단지 i의 데이터는 시드와 i로만 정해지므로 규모를 바꿔도 앞쪽 단지는 같습니다.
+여러 중개사가 올린 중복 매물과 가격/면적 오기 매물도 일정 비율로 섞습니다.
+
+    python synthetic_data.py --records 100000 --out synthetic_segments/     # 세그먼트 디렉토리
+    python synthetic_data.py --records 10000 --json synthetic.json          # save_to_json과 같은 파일
+    python synthetic_data.py --records 1000000 --bench                      # 내보내기/집계/중복 제거/직렬화 측정
+"""
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import segment_sink
+from price_utils import PYEONG_M2
+
+# (법정동 코드, 이름, 위도, 경도) - 단지는 이 중심들 주변에 흩어짐
+DISTRICTS = [
+    ('4113510300', '경기도 성남시 분당구 정자동', 37.3642443, 127.1084674),
+    ('4113510200', '경기도 성남시 분당구 수내동', 37.3782, 127.1152),
+    ('4113510500', '경기도 성남시 분당구 서현동', 37.3850, 127.1235),
+    ('1168010300', '서울시 강남구 개포동', 37.4817, 127.0557),
+    ('1168010600', '서울시 강남구 대치동', 37.4994, 127.0628),
+    ('1165010800', '서울시 서초구 반포동', 37.5045, 127.0047),
+    ('1144012400', '서울시 마포구 공덕동', 37.5443, 126.9519),
+    ('4128110500', '경기도 고양시 일산동구 장항동', 37.6560, 126.7735),
+]
+NAME_PREFIXES = ['래미안', '자이', '힐스테이트', '푸르지오', '아이파크', 'e편한세상', '롯데캐슬', '더샵',
+                 '한솔', '느티마을', '까치마을', '정든마을', '시범', '파크뷰']
+NAME_SUFFIXES = ['1단지', '2단지', '3단지', '주공', '한일', '현대', '삼성', '', '(주상복합)']
+CONSTRUCTION_COMPANIES = ['삼성물산', '현대건설', 'GS건설', '대우건설', '포스코건설', 'DL이앤씨', '롯데건설']
+DIRECTIONS = ['남향', '남동향', '남서향', '동향', '서향', '북향']
+TAGS = ['융자금승계', '즉시입주', '역세권', '올수리', '로얄층', '급매', '베란다확장', '초품아']
+# (전용면적, 공급면적)
+UNIT_TYPES = [(39.6, 56.2), (49.9, 69.4), (59.9, 84.1), (74.9, 101.3), (84.9, 112.4), (101.9, 132.8), (134.9, 168.5)]
+TRADE_TYPE_NAMES = {'A1': '매매', 'B1': '전세', 'B2': '월세'}
+PLAN_TYPES = ['road', 'rail', 'jigu']
+
+# 단지당 평균 매물 수 (0 ~ 2배 사이 균등)
+AVG_ARTICLES_PER_COMPLEX = 40
+
+# 같은 세대를 다른 중개사가 다시 올린 매물 비율
+DUPLICATE_RATE = 0.15
+
+# 가격/면적을 잘못 입력한 매물 비율
+ANOMALY_RATE = 0.005
+
+# 개발계획 하나당 단지 수
+COMPLEXES_PER_PLAN = 50
+
+
+def format_price(manwon: int, rng: random.Random) -> str:
+    """만원 단위 가격을 네이버 부동산 표기 중 하나로 변환 ('13억 2,000', '13억2000', '5.5억', '8,500')"""
+    eok, rest = divmod(int(manwon), 10000)
+    if not eok:
+        return f"{rest:,}"
+    if not rest:
+        return f"{eok}억"
+    style = rng.random()
+    if style < 0.7:
+        return f"{eok}억 {rest:,}"
+    if style < 0.9:
+        return f"{eok}억{rest}"
+    return f"{eok}.{rest // 1000}억" if rest % 1000 == 0 else f"{eok}억 {rest:,}"
+
+
+def _complex(index: int, seed: int) -> Tuple[Dict, Dict, List[Dict]]:
+    """단지 하나의 (마커, 상세, 매물 목록)"""
+    rng = random.Random(f"{seed}:{index}")
+    complex_no = str(100000 + index)
+    cortar_no, address, lat, lon = DISTRICTS[index % len(DISTRICTS)]
+    latitude = round(lat + rng.gauss(0, 0.01), 6)
+    longitude = round(lon + rng.gauss(0, 0.01), 6)
+    name = f"{rng.choice(NAME_PREFIXES)}{rng.choice(NAME_SUFFIXES)}"
+    completion_year = rng.randrange(1988, 2025)
+    households = rng.randrange(100, 4000)
+    units = sorted(rng.sample(UNIT_TYPES, rng.randrange(1, 4)))
+    # 평당 매매가 (만원): 지역 기준가 x 단지 편차, 오래된 단지일수록 조금 낮게
+    base_per_pyeong = (2500 + (index % len(DISTRICTS)) * 700) * rng.uniform(0.7, 1.4)
+    base_per_pyeong *= 1 - max(0, 2010 - completion_year) * 0.005
+    lease_rate = rng.uniform(0.45, 0.7)
+
+    articles = []
+    confirmed_base = 20250101
+    for i in range(rng.randrange(0, 2 * AVG_ARTICLES_PER_COMPLEX + 1)):
+        if articles and rng.random() < DUPLICATE_RATE:
+            # 같은 세대를 다른 중개사가 올린 매물 (번호, 중개사, 확인일만 다름)
+            article = {**rng.choice(articles), 'articleNo': f"{complex_no}{i:05d}",
+                       'realtorName': f"중개사{rng.randrange(1000)}",
+                       'articleConfirmYmd': str(confirmed_base + rng.randrange(0, 28))}
+            articles.append(article)
+            continue
+        trade_type = rng.choices(['A1', 'B1', 'B2'], weights=[5, 3, 2])[0]
+        exclusive_area, supply_area = rng.choice(units)
+        per_pyeong = base_per_pyeong * rng.uniform(0.9, 1.1)
+        price = per_pyeong * exclusive_area / PYEONG_M2
+        rent = 0
+        if trade_type == 'B1':
+            price *= lease_rate
+        elif trade_type == 'B2':
+            price *= lease_rate * rng.uniform(0.1, 0.4)
+            rent = rng.randrange(50, 400, 5)
+        if rng.random() < ANOMALY_RATE:
+            # 미끼 가격 또는 전용면적 오기 (84.9 -> 8.49)
+            if rng.random() < 0.5:
+                price *= 0.3
+            else:
+                exclusive_area = round(exclusive_area / 10, 2)
+        high_floor = rng.randrange(10, 36)
+        price = max(1000, int(round(price, -2)))
+        articles.append({
+            'articleNo': f"{complex_no}{i:05d}",
+            'articleName': name,
+            'realEstateTypeCode': 'APT',
+            'realEstateTypeName': '아파트',
+            'tradeTypeCode': trade_type,
+            'tradeTypeName': TRADE_TYPE_NAMES[trade_type],
+            'dealOrWarrantPrc': format_price(price, rng),
+            'rentPrc': str(rent) if rent else None,
+            'area1': f"{supply_area:.0f}",
+            'area2': f"{exclusive_area:.2f}".rstrip('0').rstrip('.'),
+            'areaName': f"{supply_area:.0f}",
+            'direction': rng.choice(DIRECTIONS),
+            'floorInfo': f"{rng.randrange(1, high_floor + 1)}/{high_floor}",
+            'buildingName': f"{rng.randrange(101, 101 + max(1, households // 150))}동",
+            'articleConfirmYmd': str(confirmed_base + rng.randrange(0, 28)),
+            'tagList': rng.sample(TAGS, rng.randrange(0, 4)),
+            'realtorName': f"중개사{rng.randrange(1000)}",
+            'latitude': str(latitude),
+            'longitude': str(longitude),
+        })
+
+    deal_prices = [int(round(base_per_pyeong * area / PYEONG_M2, -2)) for area, _ in units]
+    lease_prices = [int(round(price * lease_rate, -2)) for price in deal_prices]
+    counts = {trade_type: sum(1 for a in articles if a['tradeTypeCode'] == trade_type) for trade_type in TRADE_TYPE_NAMES}
+    marker = {
+        'markerId': complex_no,
+        'markerType': 'COMPLEX',
+        'latitude': latitude,
+        'longitude': longitude,
+        'complexName': name,
+        'realEstateTypeCode': 'APT',
+        'realEstateTypeName': '아파트',
+        'completionYearMonth': f"{completion_year}{rng.randrange(1, 13):02d}",
+        'totalDongCount': max(1, households // 150),
+        'totalHouseholdCount': households,
+        'floorAreaRatio': rng.randrange(120, 350),
+        'minDealUnitPrice': int(base_per_pyeong * 0.95),
+        'maxDealUnitPrice': int(base_per_pyeong * 1.05),
+        'medianDealUnitPrice': int(base_per_pyeong),
+        'minArea': f"{units[0][1]:.2f}",
+        'maxArea': f"{units[-1][1]:.2f}",
+        'minDealPrice': min(deal_prices),
+        'maxDealPrice': max(deal_prices),
+        'medianDealPrice': deal_prices[len(deal_prices) // 2],
+        'minLeasePrice': min(lease_prices),
+        'maxLeasePrice': max(lease_prices),
+        'representativeArea': round(units[len(units) // 2][0]),
+        'dealCount': counts['A1'],
+        'leaseCount': counts['B1'],
+        'rentCount': counts['B2'],
+        'totalArticleCount': len(articles),
+        'isPresales': False,
+        'photoCount': rng.randrange(0, 30),
+    }
+    detail = {
+        'complexNo': complex_no,
+        'complexName': name,
+        'cortarNo': cortar_no,
+        'address': f"{address} {rng.randrange(1, 300)}",
+        'roadAddress': f"{address.rsplit(' ', 1)[0]} {rng.choice(NAME_PREFIXES)}로 {rng.randrange(1, 200)}",
+        'totalHouseholdCount': households,
+        'totalDongCount': marker['totalDongCount'],
+        'useApproveYmd': f"{marker['completionYearMonth']}{rng.randrange(1, 29):02d}",
+        'highFloor': max(int(a['floorInfo'].split('/')[1]) for a in articles) if articles else rng.randrange(10, 36),
+        'lowFloor': rng.randrange(1, 10),
+        'constructionCompanyName': rng.choice(CONSTRUCTION_COMPANIES),
+        'latitude': latitude,
+        'longitude': longitude,
+    }
+    return marker, detail, articles
+
+
+def _plan(plan_type: str, index: int, seed: int) -> Dict:
+    rng = random.Random(f"{seed}:{plan_type}:{index}")
+    _, address, lat, lon = DISTRICTS[index % len(DISTRICTS)]
+    points = [[round(lon + rng.gauss(0, 0.02), 6), round(lat + rng.gauss(0, 0.02), 6)] for _ in range(rng.randrange(2, 8))]
+    names = {'road': '도로 확장', 'rail': '도시철도 연장', 'jigu': '지구단위계획'}
+    return {
+        'id': f"{plan_type}-{index}",
+        'name': f"{address.rsplit(' ', 1)[-1]} {names[plan_type]} {index}",
+        'status': rng.choice(['계획', '공사중', '완료']),
+        'startYear': rng.randrange(2015, 2030),
+        'coordinates': points,
+    }
+
+
+def iter_synthetic(records: int, seed: int = 0) -> Iterator[Tuple[str, Any, Optional[str]]]:
+    """
+    레코드 수가 records 이상이 될 때까지 (섹션, 레코드, 키)를 돌려줍니다. (단지 단위로 끊으므로 조금 넘을 수 있음)
+
+    섹션과 키는 segment_sink 싱크의 write 인자와 같습니다. 매물은 단지별 목록 하나로 돌려줍니다.
+    """
+    emitted = 0
+    index = 0
+    while emitted < records:
+        marker, detail, articles = _complex(index, seed)
+        yield 'complexes', marker, None
+        yield 'complex_details', detail, marker['markerId']
+        emitted += 2
+        if articles:
+            yield 'articles', articles, marker['markerId']
+            emitted += len(articles)
+        if index % COMPLEXES_PER_PLAN == 0:
+            for plan_type in PLAN_TYPES:
+                yield f'development_plans.{plan_type}', _plan(plan_type, index // COMPLEXES_PER_PLAN, seed), None
+                emitted += 1
+        index += 1
+
+
+def write_synthetic(sink, records: int, seed: int = 0) -> Dict:
+    """합성 데이터를 싱크에 기록하고 sink.close() 결과를 반환 (SegmentSink면 메모리 사용량이 규모와 무관)"""
+    lat, lon = DISTRICTS[0][2], DISTRICTS[0][3]
+    sink.area_info = {
+        'center_lat': lat,
+        'center_lon': lon,
+        'cortar_no': DISTRICTS[0][0],
+        'trade_types': list(TRADE_TYPE_NAMES),
+        'synthetic': {'records': records, 'seed': seed},
+        'bounds': {'left_lon': lon - 0.5, 'right_lon': lon + 0.5, 'top_lat': lat + 0.5, 'bottom_lat': lat - 0.5},
+    }
+    for section, value, key in iter_synthetic(records, seed):
+        if section == 'articles':
+            sink.write_many(section, value, key=key)
+        else:
+            sink.write(section, value, key=key)
+    return sink.close()
+
+
+def generate(records: int, seed: int = 0) -> Dict:
+    """합성 데이터를 crawl_area 결과와 같은 dict로 반환 (작은 규모 전용)"""
+    return write_synthetic(segment_sink.MemorySink(), records, seed)
+
+
+def _timed(results: List[Dict], name: str, records: int, fn: Callable[[], Any]) -> Any:
+    started = time.perf_counter()
+    try:
+        value = fn()
+    except ImportError as e:
+        results.append({'step': name, 'skipped': f"필요한 패키지 없음: {e}"})
+        return None
+    elapsed = time.perf_counter() - started
+    results.append({'step': name, 'seconds': round(elapsed, 3),
+                    'records_per_s': round(records / elapsed) if elapsed > 0 else None})
+    return value
+
+
+def bench(records: int, seed: int = 0, memory_limit: int = 1_000_000, excel_limit: int = 100_000,
+          work_dir: Optional[str] = None) -> List[Dict]:
+    """
+    합성 데이터로 내보내기, 집계, 중복 제거, 의심 매물 표시, API 직렬화 경로의 처리 시간을 잽니다.
+
+    세그먼트 내보내기는 규모와 관계없이 실행하고, 결과 전체를 메모리에 올리는 경로는 records가
+    memory_limit 이하일 때만 실행합니다. Excel은 시트 행 수 제한 때문에 excel_limit 이하에서만 실행합니다.
+    """
+    results: List[Dict] = []
+    directory = tempfile.mkdtemp(prefix="synthetic_bench_", dir=work_dir)
+    try:
+        manifest = _timed(results, 'generate_segments', records,
+                          lambda: write_synthetic(segment_sink.SegmentSink(os.path.join(directory, 'segments')),
+                                                  records, seed))
+        total = sum(info['records'] for info in manifest['sections'].values())
+        article_count = manifest['sections']['articles']['records']
+
+        _timed(results, 'segments_to_json', total,
+               lambda: segment_sink.write_json(manifest, os.path.join(directory, 'data.json')))
+        _timed(results, 'segments_to_csv', article_count,
+               lambda: segment_sink.write_csv(manifest, os.path.join(directory, 'data.csv')))
+        _timed(results, 'segments_to_parquet', article_count,
+               lambda: segment_sink.write_parquet(manifest, os.path.join(directory, 'data.parquet')))
+        if records <= excel_limit:
+            _timed(results, 'segments_to_excel', total,
+                   lambda: segment_sink.write_excel(manifest, os.path.join(directory, 'data.xlsx')))
+
+        if records <= memory_limit:
+            data = _timed(results, 'load_result', total, lambda: segment_sink.load_result(manifest))
+            _timed(results, 'dedupe_articles', article_count, lambda: _dedupe(data))
+            _timed(results, 'compute_stats', article_count, lambda: _compute_stats(data))
+            _timed(results, 'annotate_anomalies', article_count, lambda: _annotate(data))
+            _timed(results, 'serialize_summary', total, lambda: _serialize(data, 'summary'))
+            _timed(results, 'serialize_full', total, lambda: _serialize(data, 'full'))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return results
+
+
+def _dedupe(data: Dict):
+    from dedup import dedupe_articles
+    return dedupe_articles(data['articles'])
+
+
+def _compute_stats(data: Dict):
+    from aggregation import compute_stats
+    return compute_stats(data)
+
+
+def _annotate(data: Dict):
+    from anomaly import annotate_anomalies
+    return annotate_anomalies(data)
+
+
+def _serialize(data: Dict, view: str) -> int:
+    """API 응답과 같은 방식(CrawlResponse 검증 후 JSON)으로 직렬화한 바이트 수"""
+    from projection import project_result
+    try:
+        from pydantic import BaseModel
+    except ImportError:
+        BaseModel = None
+    projected = project_result(data, view)
+    if BaseModel is None:
+        return len(json.dumps(projected, ensure_ascii=False))
+
+    class Response(BaseModel):
+        success: bool
+        data: Optional[Dict[str, Any]] = None
+
+    return len(Response(success=True, data=projected).model_dump_json())
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="업스트림 응답 구조의 대규모 합성 데이터 생성")
+    parser.add_argument('--records', type=int, default=1000, help="레코드 수 (단지 + 상세 + 매물 + 개발계획, 10^3 ~ 10^7)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', help="세그먼트 디렉토리로 저장")
+    parser.add_argument('--json', help="save_to_json과 같은 구조의 JSON 파일로 저장")
+    parser.add_argument('--bench', action='store_true', help="내보내기/집계/중복 제거/직렬화 처리 시간 측정")
+    parser.add_argument('--memory-limit', type=int, default=1_000_000, help="--bench에서 메모리 경로를 실행할 최대 레코드 수")
+    args = parser.parse_args()
+
+    if args.bench:
+        for row in bench(args.records, args.seed, args.memory_limit):
+            if 'skipped' in row:
+                print(f"{row['step']:<20} 건너뜀 ({row['skipped']})")
+            else:
+                print(f"{row['step']:<20} {row['seconds']:>9.3f}s  {row['records_per_s'] or 0:>10,}/s")
+        sys.exit(0)
+
+    if not (args.out or args.json):
+        parser.error("--out, --json, --bench 중 하나가 필요합니다")
+    directory = args.out or tempfile.mkdtemp(prefix="synthetic_")
+    manifest = write_synthetic(segment_sink.SegmentSink(directory), args.records, args.seed)
+    if args.json:
+        segment_sink.write_json(manifest, args.json)
+        if not args.out:
+            shutil.rmtree(directory, ignore_errors=True)
+    counts = {section: info['records'] for section, info in manifest['sections'].items()}
+    print(json.dumps(counts, ensure_ascii=False))
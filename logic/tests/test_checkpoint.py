@@ -0,0 +1,57 @@
+import os
+import time
+
+from checkpoint import CrawlCheckpoint
+
+
+def test_payloads_are_read_back_from_file(tmp_path):
+    path = str(tmp_path / "checkpoint.jsonl")
+    with CrawlCheckpoint(path) as checkpoint:
+        checkpoint.add_frontier(['detail:1', 'detail:2', 'detail:3'])
+        checkpoint.complete('detail:1', {'complexNo': '1', 'name': '정자동'})
+        checkpoint.complete('detail:2')
+        # 메모리에는 결과 대신 줄 위치만 보관
+        assert all(ref is None or isinstance(ref, tuple) for ref in checkpoint.completed.values())
+        assert checkpoint.payload('detail:1') == {'complexNo': '1', 'name': '정자동'}
+
+    with CrawlCheckpoint(path) as checkpoint:
+        assert checkpoint.is_done('detail:1') and checkpoint.is_done('detail:2')
+        assert checkpoint.payload('detail:1') == {'complexNo': '1', 'name': '정자동'}
+        assert checkpoint.payload('detail:2') is None
+        assert checkpoint.pending() == ['detail:3']
+        checkpoint.complete('detail:3', [1, 2, 3])
+        assert checkpoint.payload('detail:3') == [1, 2, 3]
+
+
+def test_truncated_last_line_is_dropped(tmp_path):
+    path = str(tmp_path / "checkpoint.jsonl")
+    with CrawlCheckpoint(path) as checkpoint:
+        checkpoint.complete('detail:1', {'a': 1})
+    size = os.path.getsize(path)
+    with open(path, 'ab') as f:
+        f.write(b'{"type":"done","unit":"detail:2","pay')
+
+    with CrawlCheckpoint(path) as checkpoint:
+        assert os.path.getsize(path) == size
+        assert not checkpoint.is_done('detail:2')
+        checkpoint.complete('detail:2', {'b': 2})
+        assert checkpoint.payload('detail:1') == {'a': 1}
+        assert checkpoint.payload('detail:2') == {'b': 2}
+
+
+def test_fsync_is_batched_off_the_caller(tmp_path, monkeypatch):
+    calls = []
+    real_fsync = os.fsync
+
+    def counting_fsync(fd):
+        calls.append(fd)
+        time.sleep(0.001)  # 동기화가 느린 디스크
+        real_fsync(fd)
+
+    monkeypatch.setattr(os, 'fsync', counting_fsync)
+    with CrawlCheckpoint(str(tmp_path / "checkpoint.jsonl")) as checkpoint:
+        for i in range(500):
+            checkpoint.complete(f"detail:{i}", {'i': i})
+        checkpoint.flush()
+        assert checkpoint._synced == checkpoint._written == 500
+    assert 1 <= len(calls) < 500
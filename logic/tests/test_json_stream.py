@@ -0,0 +1,101 @@
+import json
+import random
+
+import pytest
+
+from json_stream import JsonItemParser, iter_json_file_items
+
+PATTERNS = ('item', 'articleList.item', 'articles.*.item', 'meta.*')
+KEYS = ['articleList', 'articles', 'meta', 'item', 'a', 'b"c', '{[', '키', '']
+STRINGS = ['', 'x', '가격 8억', 'quote " in', 'back\\slash', 'brace } ] {', '\n\t', 'é ', '\\"', '😀']
+
+
+def _value(rng: random.Random, depth: int):
+    kind = rng.randrange(9 if depth < 4 else 5)
+    if kind == 0:
+        return rng.choice(STRINGS)
+    if kind == 1:
+        return rng.randrange(-10 ** 6, 10 ** 6)
+    if kind == 2:
+        return rng.choice([0.5, -1.25e-7, 3.0e20, 1e-300, 123456.789])
+    if kind == 3:
+        return rng.choice([True, False])
+    if kind == 4:
+        return None
+    if kind in (5, 6):
+        return [_value(rng, depth + 1) for _ in range(rng.randrange(5))]
+    keys = rng.sample(KEYS, rng.randrange(len(KEYS)))
+    return {key: _value(rng, depth + 1) for key in keys}
+
+
+def _document(rng: random.Random):
+    """패턴에 걸리는 값이 나오도록 최상위를 배열 또는 관심 키가 있는 객체로 만듦"""
+    if rng.random() < 0.5:
+        return [_value(rng, 1) for _ in range(rng.randrange(6))]
+    return {
+        'articleList': [_value(rng, 2) for _ in range(rng.randrange(4))],
+        'articles': {str(i): [_value(rng, 3) for _ in range(rng.randrange(3))] for i in range(rng.randrange(3))},
+        'meta': _value(rng, 1),
+        'skip': _value(rng, 1),
+    }
+
+
+def _expected(document, patterns=PATTERNS):
+    """json.loads 결과를 순회해 경로에 일치하는 값을 문서 순서대로 (일치한 값 안쪽은 보지 않음)"""
+    patterns = [tuple(pattern.split('.')) for pattern in patterns]
+    found = []
+
+    def walk(value, path):
+        for pattern in patterns:
+            if len(pattern) == len(path) and all(p in ('*', c) for p, c in zip(pattern, path)):
+                found.append((path, value))
+                return
+        if isinstance(value, dict):
+            children = value.items()
+        elif isinstance(value, list):
+            children = (('item', child) for child in value)
+        else:
+            return
+        for key, child in children:
+            walk(child, path + (key,))
+
+    walk(document, ())
+    return found
+
+
+def _feed_in_chunks(text: str, rng: random.Random):
+    parser = JsonItemParser(*PATTERNS)
+    items = []
+    pos = 0
+    while pos < len(text):
+        size = rng.choice([1, 2, 3, 7, 64])
+        items.extend(parser.feed(text[pos:pos + size]))
+        pos += size
+    items.extend(parser.feed('', final=True))
+    return items
+
+
+@pytest.mark.parametrize('seed', range(300))
+def test_matches_json_loads_on_fuzzed_documents(seed):
+    rng = random.Random(seed)
+    document = _document(rng)
+    text = json.dumps(document, ensure_ascii=rng.random() < 0.5, indent=rng.choice([None, 0, 2]))
+    assert json.loads(text) == document
+    assert _feed_in_chunks(text, rng) == _expected(json.loads(text))
+
+
+def test_file_reader_matches_json_loads(tmp_path):
+    rng = random.Random(32)
+    document = {'articles': {str(i): [_value(rng, 3) for _ in range(20)] for i in range(20)}}
+    path = tmp_path / "result.json"
+    path.write_text(json.dumps(document, ensure_ascii=False, indent=2), encoding='utf-8')
+    items = list(iter_json_file_items(str(path), 'articles.*.item', chunk_size=37))
+    assert items == _expected(document, ('articles.*.item',))
+
+
+@pytest.mark.parametrize('text', ['[1, 2', '{"item": }', '[1] 2', '{"a" 1}'])
+def test_malformed_documents_raise(text):
+    parser = JsonItemParser('item')
+    with pytest.raises(ValueError):
+        parser.feed(text)
+        parser.feed('', final=True)
@@ -0,0 +1,150 @@
+import random
+
+import pytest
+
+import synthetic_data
+from listing_search import SORT_COLUMNS, TRADE_TYPE_COUNT_COLUMNS, ListingIndex
+
+# 정렬 키 -> 저장된 행에서 값을 꺼내는 함수 (SQL 행 기준의 기대값 계산용)
+ARTICLE_SORT_VALUES = {
+    'price': lambda row: row['price'],
+    'rent_price': lambda row: row['rent_price'],
+    'area': lambda row: row['exclusive_area'],
+    'confirmed': lambda row: int(row['confirmed_ymd'].replace('.', '')) if row['confirmed_ymd'] else None,
+    'completion_year': lambda row: row['completion_year'],
+    'households': lambda row: row['household_count'],
+}
+COMPLEX_SORT_VALUES = {
+    'price': lambda row: row['min_deal_price'],
+    'unit_price': lambda row: row['median_deal_unit_price'],
+    'completion_year': lambda row: row['completion_year'],
+    'households': lambda row: row['household_count'],
+    'deal_count': lambda row: row['deal_count'],
+}
+
+
+@pytest.fixture
+def index(tmp_path):
+    with ListingIndex(str(tmp_path / "listings.db")) as index:
+        index.ingest(synthetic_data.generate(3000, seed=1), updated_at=1)
+        yield index
+
+
+def _in(value, low, high) -> bool:
+    return value is not None and (low is None or value >= low) and (high is None or value <= high)
+
+
+def _overlaps(low_value, high_value, low, high) -> bool:
+    """[low_value, high_value]가 [low, high]와 겹침 (검색과 같이 조건이 있는 쪽 값이 없으면 제외)"""
+    if low is not None and (high_value is None or high_value < low):
+        return False
+    if high is not None and (low_value is None or low_value > high):
+        return False
+    return True
+
+
+def _brute_force(rows, kind: str, params: dict):
+    """저장된 행 전체를 파이썬으로 걸러 정렬한 (전체 수, 번호 목록)"""
+    sort_value = (ARTICLE_SORT_VALUES if kind == 'articles' else COMPLEX_SORT_VALUES)[params['sort']]
+    bbox = params.get('bbox')
+    hits = []
+    for row in rows:
+        if sort_value(row) is None:
+            continue
+        if kind == 'articles':
+            if params.get('trade_type') and row['trade_type'] != params['trade_type']:
+                continue
+            if params.get('complex_no') and row['complex_no'] != params['complex_no']:
+                continue
+            if not _overlaps(row['price'], row['price'], params.get('price_min'), params.get('price_max')):
+                continue
+            if not _overlaps(row['exclusive_area'], row['exclusive_area'],
+                             params.get('area_min'), params.get('area_max')):
+                continue
+        else:
+            if params.get('trade_type') and not (row[TRADE_TYPE_COUNT_COLUMNS[params['trade_type']]] or 0) > 0:
+                continue
+            if not _overlaps(row['min_deal_price'], row['max_deal_price'],
+                             params.get('price_min'), params.get('price_max')):
+                continue
+            if not _overlaps(row['min_area'], row['max_area'], params.get('area_min'), params.get('area_max')):
+                continue
+        if not _overlaps(row['completion_year'], row['completion_year'], params.get('year_min'), params.get('year_max')):
+            continue
+        if not _overlaps(row['household_count'], row['household_count'],
+                         params.get('households_min'), params.get('households_max')):
+            continue
+        if bbox and not (_in(row['longitude'], bbox[0], bbox[1]) and _in(row['latitude'], bbox[3], bbox[2])):
+            continue
+        hits.append(row)
+    # 검색은 값이 같으면 row_id 순서(안정 정렬)이고 내림차순은 그 순서를 뒤집음
+    hits.sort(key=lambda row: (sort_value(row), row['row_id']), reverse=params.get('order') == 'desc')
+    number = 'article_no' if kind == 'articles' else 'complex_no'
+    offset, limit = params.get('offset', 0), params.get('limit', 50)
+    return len(hits), [row[number] for row in hits[offset:offset + limit]]
+
+
+def _random_params(rng: random.Random, kind: str, rows) -> dict:
+    """저장된 값에서 범위를 골라 결과가 비지 않는 조건이 자주 나오도록 함"""
+    def pick_range(values):
+        values = [value for value in values if value is not None]
+        if not values or rng.random() < 0.4:
+            return None, None
+        low, high = sorted(rng.sample(values, 2) if len(values) > 1 else values * 2)
+        return (low if rng.random() < 0.8 else None), (high if rng.random() < 0.8 else None)
+
+    params = {
+        'sort': rng.choice(list(SORT_COLUMNS[kind])),
+        'order': rng.choice(['asc', 'desc']),
+        'limit': rng.choice([1, 10, 50, 200]),
+        'offset': rng.choice([0, 0, 5, 40]),
+    }
+    if rng.random() < 0.5:
+        params['trade_type'] = rng.choice(list(TRADE_TYPE_COUNT_COLUMNS))
+    if kind == 'articles':
+        params['price_min'], params['price_max'] = pick_range([row['price'] for row in rows])
+        params['area_min'], params['area_max'] = pick_range([row['exclusive_area'] for row in rows])
+        if rng.random() < 0.2:
+            params['complex_no'] = rng.choice(rows)['complex_no']
+    else:
+        params['price_min'], params['price_max'] = pick_range([row['min_deal_price'] for row in rows])
+        params['area_min'], params['area_max'] = pick_range([row['max_area'] for row in rows])
+    params['year_min'], params['year_max'] = pick_range([row['completion_year'] for row in rows])
+    params['households_min'], params['households_max'] = pick_range([row['household_count'] for row in rows])
+    if rng.random() < 0.3:
+        lat = sorted(rng.sample([row['latitude'] for row in rows if row['latitude'] is not None], 2))
+        lon = sorted(rng.sample([row['longitude'] for row in rows if row['longitude'] is not None], 2))
+        params['bbox'] = (lon[0], lon[1], lat[1], lat[0])
+    return params
+
+
+def _check(index: ListingIndex, kind: str, rng: random.Random):
+    table = 'listing_articles' if kind == 'articles' else 'listing_complexes'
+    rows = index.conn.execute(f"SELECT * FROM {table} ORDER BY row_id").fetchall()
+    number = 'article_no' if kind == 'articles' else 'complex_no'
+    for _ in range(150):
+        params = _random_params(rng, kind, rows)
+        result = index.search(kind, **params)
+        expected_total, expected_numbers = _brute_force(rows, kind, params)
+        assert result['total'] == expected_total, params
+        assert [item[number] for item in result['items']] == expected_numbers, params
+
+
+@pytest.mark.parametrize('kind', ['articles', 'complexes'])
+def test_search_matches_brute_force(index, kind):
+    _check(index, kind, random.Random(45))
+
+
+@pytest.mark.parametrize('kind', ['articles', 'complexes'])
+def test_search_matches_brute_force_after_reingest(index, kind):
+    # 첫 검색으로 메모리 배열을 만든 뒤 다른 시드로 다시 넣어 삭제/추가 반영 경로를 검사
+    index.search(kind)
+    index.ingest(synthetic_data.generate(2000, seed=2), updated_at=2)
+    _check(index, kind, random.Random(46))
+
+
+def test_rejects_unknown_arguments(index):
+    for kwargs in ({'kind': 'plans'}, {'sort': 'name'}, {'order': 'up'}, {'trade_type': 'A9'}):
+        with pytest.raises(ValueError):
+            index.search(**kwargs)
+
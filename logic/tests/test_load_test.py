@@ -0,0 +1,30 @@
+import pytest
+
+from load_test import self_time_ms
+
+
+def _event(name, ts, dur, tid=1):
+    return {'name': name, 'ts': ts, 'dur': dur, 'tid': tid}
+
+
+def test_nested_spans_count_only_self_time():
+    events = [
+        _event('crawl_area', 0, 1000),
+        _event('http_get', 100, 300, tid=2),
+        _event('http_get', 200, 400, tid=3),  # 다른 태스크에서 겹쳐 실행
+        _event('parse', 250, 50, tid=3),
+        _event('project_result', 1200, 100),
+    ]
+    result = self_time_ms(events)
+    # crawl_area 안의 http_get 구간(100~600)만 빠짐
+    assert result['crawl_area'] == pytest.approx(0.5)
+    assert result['http_get'] == pytest.approx(0.65)
+    assert result['parse'] == pytest.approx(0.05)
+    assert result['project_result'] == pytest.approx(0.1)
+    # 자기 시간의 합은 span 길이의 합보다 작음 (중첩 구간을 한 번만 셈)
+    assert sum(result.values()) < sum(event['dur'] for event in events) / 1000
+
+
+def test_partially_overlapping_span_is_not_a_child():
+    result = self_time_ms([_event('a', 0, 100), _event('b', 50, 100)])
+    assert result == {'a': pytest.approx(0.1), 'b': pytest.approx(0.1)}
@@ -0,0 +1,88 @@
+import calendar
+import random
+
+import pytest
+
+from price_index import ALL_BANDS, PriceIndex, _shift
+from price_utils import PYEONG_M2
+
+
+def _ts(day: str) -> int:
+    return calendar.timegm(tuple(map(int, day.split('-'))) + (12, 0, 0))
+
+
+def _data(prices):
+    """articleNo -> 매매 호가(만원) 목록으로 단지 하나짜리 crawl_area 결과"""
+    return {
+        'area_info': {'cortar_no': '4113510300'},
+        'complex_details': {},
+        'articles': {'1': [
+            {'articleNo': article_no, 'tradeTypeCode': 'A1', 'dealOrWarrantPrc': f"{price:,}", 'area2': '84'}
+            for article_no, price in prices.items()
+        ]},
+    }
+
+
+@pytest.fixture
+def index(tmp_path):
+    with PriceIndex(str(tmp_path / "index.db")) as index:
+        yield index
+
+
+def _all_bands(index, window):
+    return next(row for row in index.rolling('4113510300', window) if row['area_band'] == ALL_BANDS)
+
+
+def test_backfill_keeps_as_of(index):
+    index.ingest(_data({'a': 100000, 'b': 110000}), _ts('2025-09-30'))
+    before = {window: _all_bands(index, window) for window in (7, 30, 90)}
+
+    # 40일 전 결과를 나중에 반영: 기준일과 7/30일 지수는 그대로, 90일 지수에는 포함
+    index.ingest(_data({'c': 50000}), _ts('2025-08-21'))
+    for window in (7, 30):
+        assert _all_bands(index, window) == before[window]
+    row = _all_bands(index, 90)
+    assert row['as_of'] == '2025-09-30'
+    assert row['count'] == 3
+
+
+def test_window_counts_each_listing_once(index):
+    for day, price in (('2025-09-01', 100000), ('2025-09-02', 100000), ('2025-09-03', 120000)):
+        index.ingest(_data({'a': price, 'b': 90000}), _ts(day))
+    # 같은 날 다시 수집돼도 한 번
+    index.ingest(_data({'a': 120000, 'b': 90000}), _ts('2025-09-03'))
+
+    row = _all_bands(index, 7)
+    assert row['as_of'] == '2025-09-03'
+    assert row['count'] == 2
+    # a는 최근 호가(12억)만 반영
+    assert row['mean'] == pytest.approx((120000 + 90000) / 2 * PYEONG_M2 / 84)
+    assert index.query('4113510300', '2025-09-01', '2025-09-03')['mean'] == pytest.approx(row['mean'])
+
+
+def test_listing_moving_band_is_retracted(index):
+    index.ingest(_data({'a': 100000, 'b': 90000}), _ts('2025-09-01'))
+    moved = _data({'a': 150000})
+    moved['articles']['1'][0]['area2'] = '120'
+    index.ingest(moved, _ts('2025-09-02'))
+
+    rows = {row['area_band']: row for row in index.rolling('4113510300', 7)}
+    # a는 새 면적 구간과 전체에서 한 번씩, 이전 구간에서는 빠짐
+    assert rows[ALL_BANDS]['count'] == 2
+    assert sum(row['count'] for band, row in rows.items() if band != ALL_BANDS) == 2
+    assert rows[ALL_BANDS]['mean'] == pytest.approx((150000 * PYEONG_M2 / 120 + 90000 * PYEONG_M2 / 84) / 2)
+
+
+def test_rolling_matches_observation_query(index):
+    # 날짜 순서를 섞어 넣어도 날짜별 요약 병합 결과가 관측값에서 바로 계산한 값과 같아야 함
+    rng = random.Random(46)
+    days = [f'2025-09-{day:02d}' for day in range(1, 29)]
+    for day in rng.sample(days, len(days)):
+        listings = rng.sample(range(40), 15)
+        index.ingest(_data({str(n): rng.randrange(50000, 150000) for n in listings}), _ts(day))
+    for window in (1, 7, 30):
+        row = _all_bands(index, window)
+        expected = index.query('4113510300', _shift(row['as_of'], 1 - window), row['as_of'])
+        assert row['count'] == expected['count']
+        assert row['mean'] == pytest.approx(expected['mean'])
+        assert row['median'] == pytest.approx(expected['median'])
@@ -0,0 +1,39 @@
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from aggregation import parse_price_series
+from price_utils import parse_korean_price
+
+EDGE_CASES = [
+    '1.5', '억', '12억-', '13억2000', '8억 5,000', '8억5천만원', '5.5억', '55만', '2백', '40000', '', ' ', 'abc',
+    '억5000', '1억2억', '3억abc', '-', '1,000', '1.5억5천', '0', '12억 3천 5백', '억억', '1억.5', '.5', ' 7억 ',
+    '5000만원', '1억-2000', '1e5', '١٢', '2.5', '0.5', '3억\t5000', '만원', '1억 원', '-3억', 'inf억', 'nan억', '1_000',
+    None, np.nan, 40000, 5.5, True,
+]
+
+
+def _expected(value):
+    result = None if value is np.nan else parse_korean_price(value)
+    return np.nan if result is None else float(result)
+
+
+def _assert_parity(values):
+    got = parse_price_series(pd.Series(values, dtype=object)).tolist()
+    for value, result in zip(values, got):
+        expected = _expected(value)
+        assert result == expected or (np.isnan(result) and np.isnan(expected)), (value, result, expected)
+
+
+@pytest.mark.parametrize('value', EDGE_CASES, ids=repr)
+def test_edge_cases_match_scalar_parser(value):
+    _assert_parity([value, '13억2000'])
+
+
+def test_fuzzed_strings_match_scalar_parser():
+    rng = random.Random(29)
+    alphabet = ['1', '2', '5', '0', '9', '.', ',', ' ', '억', '천', '백', '십', '만', '원', '-', 'a', '١']
+    values = [''.join(rng.choice(alphabet) for _ in range(rng.randrange(0, 9))) for _ in range(3000)]
+    _assert_parity(values)
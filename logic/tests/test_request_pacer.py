@@ -0,0 +1,29 @@
+import asyncio
+import time
+
+import pytest
+
+from naver_real_estate_crawler import RequestPacer
+
+
+def test_reservations_are_spaced_after_burst():
+    pacer = RequestPacer(requests_per_second=10, burst=2)
+    delays = [pacer.reserve() for _ in range(5)]
+    assert delays[:2] == pytest.approx([0.0, 0.0], abs=0.01)
+    assert delays[2:] == pytest.approx([0.1, 0.2, 0.3], abs=0.01)
+
+
+def test_concurrent_waiters_share_one_limit():
+    pacer = RequestPacer(requests_per_second=20)
+    starts = []
+
+    async def request():
+        await pacer.acquire()
+        starts.append(time.monotonic())
+
+    async def main():
+        await asyncio.gather(*(request() for _ in range(6)))
+
+    asyncio.run(main())
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert min(gaps) >= 0.04
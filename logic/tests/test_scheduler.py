@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+import scheduler
+from tracing import Tracer
+
+
+class FakeCrawler:
+    instances = []
+
+    def __init__(self):
+        self.tracer = Tracer()
+        self.request_counts = {}
+        self.closed = False
+        FakeCrawler.instances.append(self)
+
+    async def init_browser(self, headless=True):
+        pass
+
+    async def init_session(self):
+        pass
+
+    async def close(self):
+        self.closed = True
+
+    async def crawl_area(self, **params):
+        # 첫 세션은 요청 하나를 보낸 뒤 실패
+        self.request_counts['markers'] = self.request_counts.get('markers', 0) + 1
+        if len(FakeCrawler.instances) == 1:
+            raise RuntimeError("세션 만료")
+        return {'complexes': [{'markerId': '1'}]}
+
+    async def get_complex_articles(self, complex_no, trade_type):
+        self.request_counts['articles'] = self.request_counts.get('articles', 0) + 1
+        return [{'articleNo': '1', 'dealOrWarrantPrc': '5억'}]
+
+
+@pytest.fixture
+def crawl_scheduler(tmp_path, monkeypatch):
+    FakeCrawler.instances = []
+    monkeypatch.setattr(scheduler, 'NaverRealEstateCrawler', FakeCrawler)
+    crawl_scheduler = scheduler.CrawlScheduler(str(tmp_path / "registry.json"), requests_per_hour=3600)
+    crawl_scheduler.add_region('jeongja', 37.3642443, 127.1084674)
+    return crawl_scheduler
+
+
+def test_failed_run_charges_actual_requests_and_resets_session(crawl_scheduler):
+    target = crawl_scheduler.targets['region:jeongja']
+    estimated = target.estimated_cost()
+    capacity = crawl_scheduler.budget.capacity
+
+    asyncio.run(crawl_scheduler.run_forever(max_runs=1))
+
+    # 실패 전에 보낸 요청 1회만 차감 (토큰은 그사이 조금 더 찼을 수 있음)
+    assert capacity - 1 <= crawl_scheduler.budget.tokens <= capacity
+    assert estimated > 1
+    assert FakeCrawler.instances[0].closed
+    assert crawl_scheduler.crawler is None
+
+    target.next_due = 0
+    asyncio.run(crawl_scheduler.run_forever(max_runs=1))
+    assert len(FakeCrawler.instances) == 2
+    assert target.runs == 1
+
+
+def test_targets_registered_while_running_are_scheduled_and_kept(crawl_scheduler, monkeypatch):
+    monkeypatch.setattr(scheduler, 'REGISTRY_POLL_INTERVAL', 0.01)
+    crawl_scheduler.targets['region:jeongja'].next_due = scheduler.time.time() + 3600
+    crawl_scheduler.save()
+
+    async def run():
+        task = asyncio.create_task(crawl_scheduler.run_forever(max_runs=1))
+        await asyncio.sleep(0.05)
+        # 실행 중인 스케줄러와 별도로 CLI가 대상을 추가
+        cli = scheduler.CrawlScheduler(crawl_scheduler.registry_path)
+        cli.add_complex('2813', ['A1', 'B1'])
+        cli.save()
+        await asyncio.wait_for(task, 5)
+
+    asyncio.run(run())
+    target = crawl_scheduler.targets['complex:2813']
+    assert target.runs == 1
+    assert target.cost == 2
+    assert set(scheduler.CrawlScheduler(crawl_scheduler.registry_path).targets) == {'region:jeongja', 'complex:2813'}
+
+
+def test_save_keeps_targets_added_by_other_processes(crawl_scheduler):
+    crawl_scheduler.save()
+    cli = scheduler.CrawlScheduler(crawl_scheduler.registry_path)
+    cli.add_region('sunae', 37.3782, 127.1152)
+    cli.save()
+
+    crawl_scheduler.targets['region:jeongja'].weight = 3.0
+    crawl_scheduler.save()
+    stored = scheduler.CrawlScheduler(crawl_scheduler.registry_path).targets
+    assert set(stored) == {'region:jeongja', 'region:sunae'}
+    assert stored['region:jeongja'].weight == 3.0
@@ -0,0 +1,88 @@
+import copy
+import json
+import random
+
+import pytest
+
+import synthetic_data
+from price_utils import parse_korean_price
+from snapshot_diff import diff_snapshots
+
+
+def _event_key(event):
+    return event['kind'], event['key'], event['change']
+
+
+@pytest.fixture
+def snapshots(tmp_path):
+    """이전/새 결과 파일과 새 결과를 만들 때 적용한 변경의 기대값"""
+    rng = random.Random(47)
+    old = synthetic_data.generate(1500, seed=3)
+    new = copy.deepcopy(old)
+    expected = set()
+
+    # 단지 삭제, 가격 변경, 추가
+    for complex_data in rng.sample(new['complexes'], 5):
+        new['complexes'].remove(complex_data)
+        expected.add(('complex', complex_data['markerId'], 'removed'))
+    for complex_data in rng.sample(new['complexes'], 5):
+        complex_data['minDealPrice'] = (complex_data.get('minDealPrice') or 0) + 1000
+        expected.add(('complex', complex_data['markerId'], 'changed'))
+    for i in range(3):
+        new['complexes'].append({'markerId': f'9{i:05d}', 'complexName': f'신규{i}', 'minDealPrice': 50000})
+        expected.add(('complex', f'9{i:05d}', 'added'))
+
+    # 매물 삭제, 가격 변경 (표기만 다른 같은 가격은 변경 아님), 추가
+    articles = [(complex_no, article) for complex_no, group in new['articles'].items() for article in group]
+    for complex_no, article in rng.sample(articles, 30):
+        new['articles'][complex_no].remove(article)
+        expected.add(('article', article['articleNo'], 'removed'))
+    remaining = [(complex_no, article) for complex_no, group in new['articles'].items() for article in group]
+    for complex_no, article in rng.sample(remaining, 30):
+        if rng.random() < 0.5:
+            article['dealOrWarrantPrc'] = synthetic_data.format_price(123456, rng)
+            expected.add(('article', article['articleNo'], 'changed'))
+        else:
+            article['dealOrWarrantPrc'] = article['dealOrWarrantPrc'].replace(',', '')
+    for i in range(20):
+        complex_no = rng.choice(list(new['articles']))
+        new['articles'][complex_no].append({'articleNo': f'99{i:09d}', 'dealOrWarrantPrc': '5억'})
+        expected.add(('article', f'99{i:09d}', 'added'))
+
+    paths = []
+    for name, data in (('old', old), ('new', new)):
+        path = tmp_path / f"{name}.json"
+        path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding='utf-8')
+        paths.append(str(path))
+    return paths[0], paths[1], expected
+
+
+def test_detects_changes(snapshots):
+    old_path, new_path, expected = snapshots
+    events = list(diff_snapshots(old_path, new_path, partitions=1))
+    assert {_event_key(event) for event in events} == expected
+    assert len(events) == len(expected)
+
+
+@pytest.mark.parametrize('partitions', [2, 7, None])
+def test_partitioned_equals_unpartitioned(snapshots, tmp_path, partitions):
+    old_path, new_path, _ = snapshots
+    unpartitioned = sorted(diff_snapshots(old_path, new_path, partitions=1), key=_event_key)
+    work_dir = tmp_path / "work"
+    work_dir.mkdir()
+    # partitions=None이면 작은 메모리 한도로 크기에서 파티션 수를 정함
+    partitioned = sorted(diff_snapshots(old_path, new_path, partitions=partitions, memory_bytes=64 << 10,
+                                        work_dir=str(work_dir)), key=_event_key)
+    assert partitioned == unpartitioned
+    assert not any(work_dir.iterdir())
+
+
+def test_changed_event_fields(snapshots):
+    old_path, new_path, _ = snapshots
+    for event in diff_snapshots(old_path, new_path, partitions=3):
+        if event['change'] == 'changed' and event['kind'] == 'complex':
+            assert event['fields']['minDealPrice']['delta'] == 1000
+        elif event['change'] == 'changed':
+            field = event['fields']['dealOrWarrantPrc']
+            assert parse_korean_price(field['new']) == 123456
+            assert field['delta'] == 123456 - parse_korean_price(field['old'])
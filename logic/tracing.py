@@ -0,0 +1,121 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class Span:
+    """하나의 작업 구간(span) 기록"""
+
+    __slots__ = ('name', 'start_ns', 'end_ns', 'tid', 'attrs')
+
+    def __init__(self, name: str, tid: int, attrs: Dict[str, Any]):
+        self.name = name
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns: Optional[int] = None
+        self.tid = tid
+        self.attrs = attrs
+
+    def set(self, key: str, value: Any):
+        """span 속성 추가 (응답 크기, 상태 코드 등)"""
+        self.attrs[key] = value
+
+    @property
+    def duration_ms(self) -> float:
+        end_ns = self.end_ns if self.end_ns is not None else time.perf_counter_ns()
+        return (end_ns - self.start_ns) / 1_000_000
+
+
+class Tracer:
+    """
+    크롤링 단계별 소요 시간을 기록하는 경량 트레이서
+
+    완료된 span은 Chrome Trace Event 형식(chrome://tracing, Perfetto에서 열람 가능)으로
+    내보낼 수 있습니다. 동시에 실행되는 asyncio 태스크는 서로 다른 트랙(tid)으로 구분됩니다.
+    listeners에 on_span_start/on_span_end 메서드를 가진 객체(예: CrawlProfiler)를 등록하면
+    span 경계마다 호출됩니다.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.spans: List[Span] = []
+        self.listeners = []
+        self._origin_ns = time.perf_counter_ns()
+        self._epoch_us = time.time() * 1_000_000
+        self._track_ids: Dict[int, int] = {}
+
+    def _track_id(self) -> int:
+        """현재 asyncio 태스크(없으면 스레드)에 대응하는 트랙 번호"""
+        try:
+            owner = id(asyncio.current_task())
+        except RuntimeError:
+            owner = threading.get_ident()
+        if owner not in self._track_ids:
+            self._track_ids[owner] = len(self._track_ids) + 1
+        return self._track_ids[owner]
+
+    @contextmanager
+    def span(self, name: str, **attrs) -> Iterator[Span]:
+        """
+        with 블록 구간을 span으로 기록합니다.
+
+        Args:
+            name: span 이름 (예: browser_launch, http_get)
+            **attrs: span에 함께 기록할 속성
+        """
+        span = Span(name, self._track_id() if self.enabled else 0, attrs)
+        for listener in self.listeners:
+            listener.on_span_start(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set('error', repr(e))
+            raise
+        finally:
+            span.end_ns = time.perf_counter_ns()
+            if self.enabled:
+                self.spans.append(span)
+            for listener in self.listeners:
+                listener.on_span_end(span)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """span 이름별 호출 횟수와 총/최대 소요 시간(ms)"""
+        result: Dict[str, Dict[str, float]] = {}
+        for span in self.spans:
+            entry = result.setdefault(span.name, {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+            entry['count'] += 1
+            entry['total_ms'] += span.duration_ms
+            entry['max_ms'] = max(entry['max_ms'], span.duration_ms)
+        for entry in result.values():
+            entry['total_ms'] = round(entry['total_ms'], 3)
+            entry['max_ms'] = round(entry['max_ms'], 3)
+        return result
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Chrome Trace Event 형식의 dict로 변환"""
+        pid = os.getpid()
+        events = []
+        for span in self.spans:
+            events.append({
+                'name': span.name,
+                'cat': 'crawler',
+                'ph': 'X',
+                'ts': round(self._epoch_us + (span.start_ns - self._origin_ns) / 1000, 3),
+                'dur': round((span.end_ns - span.start_ns) / 1000, 3),
+                'pid': pid,
+                'tid': span.tid,
+                'args': span.attrs
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def export_chrome_trace(self, filename: str):
+        """트레이스를 Chrome Trace Event JSON 파일로 저장"""
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f, ensure_ascii=False, default=str)
+
+    def reset(self):
+        """기록된 span 초기화"""
+        self.spans.clear()
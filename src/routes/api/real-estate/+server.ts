@@ -1,4 +1,6 @@
 import { json } from '@sveltejs/kit';
+import http from 'node:http';
+import { Readable } from 'node:stream';
 
 interface CrawlRequest {
 	center_lat: number;
@@ -6,6 +8,11 @@ interface CrawlRequest {
 	radius?: number;
 	real_estate_type?: string;
 	price_type?: string;
+	dedupe?: boolean;
+	view?: 'summary' | 'map' | 'full';
+	fields?: string[];
+	debug?: boolean;
+	profile?: boolean;
 }
 
 interface RealEstateData {
@@ -37,34 +44,110 @@ interface CrawlResponse {
 
 const PYTHON_API_URL = 'http://localhost:8000';
 
-export const POST = async ({ request }: { request: Request }): Promise<Response> => {
-	try {
-		const body: CrawlRequest = await request.json();
-		
-		// Python FastAPI 서버로 요청 전송
-		const response = await fetch(`${PYTHON_API_URL}/api/crawl`, {
-			method: 'POST',
-			headers: {
-				'Content-Type': 'application/json',
+// 백엔드 연결을 요청마다 새로 맺지 않도록 keep-alive 연결을 재사용
+const backendAgent = new http.Agent({ keepAlive: true, maxSockets: 32 });
+
+// 백엔드 응답에서 브라우저로 그대로 전달할 헤더
+const PASS_THROUGH_HEADERS = ['content-type', 'content-encoding', 'content-length', 'vary', 'cache-control'];
+
+/**
+ * 백엔드로 요청을 보내고 응답 헤더가 도착하면 바로 반환합니다.
+ * fetch와 달리 압축을 풀지 않으므로 백엔드의 gzip/br 응답이 그대로 전달됩니다.
+ * freshSocket이면 keep-alive 풀을 거치지 않고 새 연결로 보냅니다.
+ */
+function requestBackend(
+	path: string,
+	body: string,
+	request: Request,
+	freshSocket = false
+): Promise<http.IncomingMessage> {
+	return new Promise((resolve, reject) => {
+		const backendRequest = http.request(
+			`${PYTHON_API_URL}${path}`,
+			{
+				method: 'POST',
+				agent: freshSocket ? false : backendAgent,
+				headers: {
+					'Content-Type': 'application/json',
+					'Content-Length': Buffer.byteLength(body),
+					'Accept-Encoding': request.headers.get('accept-encoding') ?? 'identity'
+				}
 			},
-			body: JSON.stringify(body)
+			(response) => {
+				response.on('close', () => request.signal.removeEventListener('abort', abort));
+				resolve(response);
+			}
+		);
+		// 브라우저가 연결을 끊으면 백엔드 요청도 중단
+		const abort = () => backendRequest.destroy();
+		request.signal.addEventListener('abort', abort);
+		backendRequest.on('error', (error) => {
+			request.signal.removeEventListener('abort', abort);
+			reject(error);
 		});
+		backendRequest.end(body);
+	});
+}
+
+function errorCode(error: unknown): string | undefined {
+	return (error as NodeJS.ErrnoException | undefined)?.code;
+}
+
+// Python 서버가 실행되지 않은 경우 (모의 데이터로 대신함)
+function isBackendDown(error: unknown): boolean {
+	return errorCode(error) === 'ECONNREFUSED';
+}
+
+// 서버는 떠 있지만 연결이 끊긴 경우 (keep-alive 연결이 서버 쪽에서 닫혔을 수 있어 새 연결로 한 번 재시도)
+function isConnectionDropped(error: unknown): boolean {
+	const code = errorCode(error);
+	return code === 'ECONNRESET' || code === 'EPIPE';
+}
+
+/**
+ * 끊긴 연결은 새 연결로 한 번만 재시도합니다.
+ */
+async function requestBackendWithRetry(path: string, body: string, request: Request): Promise<http.IncomingMessage> {
+	try {
+		return await requestBackend(path, body, request);
+	} catch (error) {
+		if (!isConnectionDropped(error) || request.signal.aborted) {
+			throw error;
+		}
+		console.warn('백엔드 연결이 끊겼습니다. 새 연결로 다시 시도합니다.');
+		return await requestBackend(path, body, request, true);
+	}
+}
+
+export const POST = async ({ request }: { request: Request }): Promise<Response> => {
+	// 요청 본문은 한 번만 읽어 백엔드 전달과 모의 데이터 생성에 함께 사용
+	const rawBody = await request.text();
 
-		if (!response.ok) {
-			throw new Error(`Python API 서버 오류: ${response.status}`);
+	try {
+		// Python FastAPI 서버 응답을 버퍼링하지 않고 그대로 스트리밍
+		const response = await requestBackendWithRetry('/api/crawl', rawBody, request);
+
+		const headers = new Headers();
+		for (const name of PASS_THROUGH_HEADERS) {
+			const value = response.headers[name];
+			if (value !== undefined) {
+				headers.set(name, Array.isArray(value) ? value.join(', ') : String(value));
+			}
 		}
 
-		const result = await response.json();
-		return json(result as CrawlResponse);
+		return new Response(Readable.toWeb(response) as ReadableStream<Uint8Array>, {
+			status: response.statusCode ?? 502,
+			headers
+		});
 		
 	} catch (error) {
 		console.error('API 오류:', error);
 		
 		// Python 서버가 실행되지 않은 경우 모의 데이터 반환
-		if (error instanceof Error && error.message.includes('fetch')) {
+		if (isBackendDown(error)) {
 			console.warn('Python 서버에 연결할 수 없습니다. 모의 데이터를 반환합니다.');
 			
-			const body: CrawlRequest = await request.json();
+			const body: CrawlRequest = JSON.parse(rawBody);
 			const mockData: RealEstateData = {
 				area_info: {
 					center_lat: body.center_lat,
@@ -139,9 +222,10 @@ export const POST = async ({ request }: { request: Request }): Promise<Response>
 			} as CrawlResponse);
 		}
 		
+		// 재시도 후에도 연결이 끊기는 등 백엔드 응답을 받지 못하면 게이트웨이 오류
 		return json({ 
 			success: false, 
 			error: error instanceof Error ? error.message : '알 수 없는 오류'
-		} as CrawlResponse);
+		} as CrawlResponse, { status: 502 });
 	}
 };